@@ -2,20 +2,44 @@ import tkinter as tk
 from tkinter import ttk
 import calendar
 from datetime import date
+from typing import List, Optional, Tuple
 
 from time_utils import get_now
 
 
+# Heatmap: no tasks, then four levels up to the month's busiest day.
+HEAT_COLORS = ("#333333", "#0e4429", "#006d32", "#26a641", "#39d353")
+
+# What the heatmap measures, by label of the "Color by" box.
+HEAT_METRICS = {
+    "Tasks": lambda c: c.open + c.done,
+    "Tracked time": lambda c: c.seconds,
+}
+
+WEEKS = 6  # the most weeks a month spans
+
+
+def _month_days(year: int, month: int) -> List[date]:
+    cal = calendar.Calendar(firstweekday=0)  # Monday start
+    return [d for week in cal.monthdatescalendar(year, month) for d in week]
+
+
 class CalendarPopup(tk.Toplevel):
     """
     Monthly calendar popup.
     Clicking a day calls WeekView.set_date().
+
+    The day grid is built once; changing month only reconfigures the
+    buttons. Days are colored by task count or tracked time, from one
+    get_day_counts query per month grid through the week view's counts
+    cache, with the months either side prefetched.
     """
 
     def __init__(self, master, week_view):
         super().__init__(master)
 
         self.week_view = week_view
+        self.counts = week_view.counts
 
         self.title("Calendar")
         self.resizable(False, False)
@@ -24,13 +48,29 @@ class CalendarPopup(tk.Toplevel):
         self.curr_date = week_view.get_selected_date()
         self.year = self.curr_date.year
         self.month = self.curr_date.month
+        self._dates: List[date] = []
+        self._shown: List[Optional[tuple]] = [None] * (WEEKS * 7)
 
+        self._build_styles()
         self._build_ui()
         self._render_month()
 
         self.transient(master)
         self.grab_set()
 
+    def _build_styles(self):
+        style = ttk.Style(self)
+        for level, color in enumerate(HEAT_COLORS):
+            name = f"Heat{level}.TButton"
+            style.configure(name, background=color, foreground="white")
+            style.map(name, background=[("active", "#444444")])
+        style.configure("Outside.TButton", background="#1e1e1e")
+        style.map(
+            "Outside.TButton",
+            background=[("disabled", "#1e1e1e")],
+            foreground=[("disabled", "#666666")],
+        )
+
     def _build_ui(self):
         header = ttk.Frame(self, style="Top.TFrame")
         header.pack(fill=tk.X, padx=8, pady=5)
@@ -51,60 +91,100 @@ class CalendarPopup(tk.Toplevel):
         self.btn_next.pack(side=tk.RIGHT)
 
         self.days_frame = ttk.Frame(self, style="Main.TFrame")
-        self.days_frame.pack(padx=8, pady=(0, 8))
-
-    def _render_month(self):
-        for w in self.days_frame.winfo_children():
-            w.destroy()
-
-        cal = calendar.Calendar(firstweekday=0)  # Monday start
-
-        month_name = calendar.month_name[self.month]
-        self.lbl_month.config(text=f"{month_name} {self.year}")
+        self.days_frame.pack(padx=8, pady=(0, 4))
 
         headers = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         for col, name in enumerate(headers):
             lbl = ttk.Label(self.days_frame, text=name)
             lbl.grid(row=0, column=col, padx=3, pady=3)
 
-        row = 1
-        for week in cal.monthdatescalendar(self.year, self.month):
-            for col, d in enumerate(week):
-                if d.month != self.month:
-                    lbl = ttk.Label(
-                        self.days_frame,
-                        text=str(d.day),
-                        foreground="#666666",
-                    )
-                    lbl.grid(row=row, column=col, padx=2, pady=2)
+        self.cells: List[ttk.Button] = []
+        for i in range(WEEKS * 7):
+            btn = ttk.Button(
+                self.days_frame, width=4, command=lambda idx=i: self._on_cell(idx)
+            )
+            btn.grid(row=1 + i // 7, column=i % 7, padx=2, pady=2)
+            self.cells.append(btn)
+
+        footer = ttk.Frame(self, style="Main.TFrame")
+        footer.pack(fill=tk.X, padx=8, pady=(0, 8))
+        ttk.Label(footer, text="Color by").pack(side=tk.LEFT)
+        self.cmb_metric = ttk.Combobox(
+            footer, values=list(HEAT_METRICS), state="readonly", width=12
+        )
+        self.cmb_metric.current(0)
+        self.cmb_metric.pack(side=tk.LEFT, padx=6)
+        self.cmb_metric.bind("<<ComboboxSelected>>", lambda e: self._paint())
+
+    def _render_month(self):
+        month_name = calendar.month_name[self.month]
+        self.lbl_month.config(text=f"{month_name} {self.year}")
+
+        self._dates = _month_days(self.year, self.month)
+        for i in range(7 * 4, WEEKS * 7, 7):
+            # Months span four to six weeks; hide the unused rows.
+            visible = i < len(self._dates)
+            for btn in self.cells[i:i + 7]:
+                if visible:
+                    btn.grid()
                 else:
-                    btn = ttk.Button(
-                        self.days_frame,
-                        text=str(d.day),
-                        width=4,
-                        command=lambda dd=d: self._on_day_click(dd),
-                    )
-                    if d == self.curr_date:
-                        btn.configure(style="Selected.TButton")
-                    btn.grid(row=row, column=col, padx=2, pady=2)
-            row += 1
+                    btn.grid_remove()
+        self._paint()
+
+        # This month first, then its neighbours for quick paging.
+        for year, month in (
+            (self.year, self.month),
+            _shift_month(self.year, self.month, -1),
+            _shift_month(self.year, self.month, 1),
+        ):
+            days = _month_days(year, month)
+            self.counts.load(
+                days[0], days[-1], lambda _, ym=(year, month): self._counts_arrived(ym)
+            )
+
+    def _counts_arrived(self, year_month):
+        if year_month == (self.year, self.month) and self.winfo_exists():
+            self._paint()
+
+    def _paint(self):
+        counts = self.counts.get(self._dates[0], self._dates[-1]) or {}
+        metric = HEAT_METRICS[self.cmb_metric.get()]
+        values = {
+            d: metric(c) for d, c in counts.items() if d.month == self.month
+        }
+        top = max(values.values(), default=0)
+
+        for i, d in enumerate(self._dates):
+            if d.month != self.month:
+                shown = (str(d.day), "Outside.TButton", "disabled")
+            elif d == self.curr_date:
+                shown = (str(d.day), "Selected.TButton", "normal")
+            else:
+                value = values.get(d, 0)
+                level = 1 + 3 * value // top if value > 0 else 0
+                shown = (str(d.day), f"Heat{level}.TButton", "normal")
+
+            if shown != self._shown[i]:
+                text, style, state = shown
+                self.cells[i].configure(text=text, style=style, state=state)
+                self._shown[i] = shown
+
+    def _on_cell(self, idx: int):
+        self._on_day_click(self._dates[idx])
 
     def _on_day_click(self, day: date):
         self.week_view.set_date(day)
         self.destroy()
 
     def _prev_month(self):
-        if self.month == 1:
-            self.month = 12
-            self.year -= 1
-        else:
-            self.month -= 1
+        self.year, self.month = _shift_month(self.year, self.month, -1)
         self._render_month()
 
     def _next_month(self):
-        if self.month == 12:
-            self.month = 1
-            self.year += 1
-        else:
-            self.month += 1
+        self.year, self.month = _shift_month(self.year, self.month, 1)
         self._render_month()
+
+
+def _shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
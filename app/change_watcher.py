@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from .db_worker import _report
+
+
+class ChangeWatcher:
+    """
+    Notices writes other connections make to the same file – a second
+    window, cli.py, server.py – and lets TaskView reload only what they
+    touched. A TickScheduler subscriber: once a second the DB worker runs
+    Database.poll_changes(), a single PRAGMA while nobody else writes.
+    """
+
+    def __init__(self, db, task_view):
+        self.db = db
+        self.task_view = task_view
+        self._polling = False
+
+    def is_active(self) -> bool:
+        return True
+
+    def tick(self, now: datetime):
+        if self._polling:
+            return  # the worker is busy; the next tick asks again
+        self._polling = True
+        self.db.query("poll_changes", callback=self._arrived, errback=self._failed)
+
+    def _arrived(self, changes):
+        self._polling = False
+        if changes is not None:
+            self.task_view.apply_changes(changes)
+
+    def _failed(self, exc: BaseException):
+        self._polling = False
+        _report(exc)
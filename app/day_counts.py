@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from models import DayCounts
+
+Counts = Dict[date, DayCounts]
+Range = Tuple[date, date]
+
+
+class DayCountsCache:
+    """
+    Per-day counts (Database.get_day_counts) fetched a range at a time –
+    a week for the week strip, a month grid for the calendar – and kept
+    until tasks change. Shared by every view that paints counts.
+
+    After invalidate() the cached ranges stay readable (views keep painting
+    the old numbers) and are fetched again the next time they are loaded.
+    """
+
+    def __init__(self, db, size: int = 48):
+        self.db = db
+        self.size = size
+        self._counts: "OrderedDict[Range, Counts]" = OrderedDict()
+        self._stale = set()
+        # range -> callbacks of the fetch in flight; a reply whose list is no
+        # longer the one waiting here was invalidated meanwhile and is dropped.
+        self._waiting: Dict[Range, list] = {}
+
+    def get(self, start: date, end: date) -> Optional[Counts]:
+        """Cached counts for start..end, possibly stale; None if never loaded."""
+        return self._counts.get((start, end))
+
+    def load(
+        self,
+        start: date,
+        end: date,
+        callback: Optional[Callable[[Counts], None]] = None,
+    ):
+        """Fetch start..end unless fresh in cache; callback(counts) once it arrives."""
+        key = (start, end)
+        if key in self._counts:
+            self._counts.move_to_end(key)
+            if key not in self._stale:
+                return
+        if key in self._waiting:
+            if callback is not None:
+                self._waiting[key].append(callback)
+            return
+
+        callbacks = self._waiting[key] = [callback] if callback is not None else []
+
+        def store(counts: Counts):
+            if self._waiting.get(key) is not callbacks:
+                return  # invalidated meanwhile; a newer fetch follows on demand
+            del self._waiting[key]
+            self._stale.discard(key)
+            self._counts[key] = counts
+            while len(self._counts) > self.size:
+                old, _ = self._counts.popitem(last=False)
+                self._stale.discard(old)
+            for cb in callbacks:
+                cb(counts)
+
+        self.db.read("get_day_counts", start, end, callback=store)
+
+    def invalidate(self, days: Optional[Iterable[date]] = None):
+        """
+        Tasks changed on `days` (any day if None): the ranges holding them
+        are stale and their fetches in flight are void.
+        """
+        if days is None:
+            self._stale = set(self._counts)
+            self._waiting.clear()
+            return
+        days = set(days)
+
+        def touched(key: Range) -> bool:
+            start, end = key
+            return any(start <= d <= end for d in days)
+
+        self._stale.update(filter(touched, self._counts))
+        for key in list(filter(touched, self._waiting)):
+            del self._waiting[key]
@@ -0,0 +1,248 @@
+import queue
+import sys
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+Callback = Optional[Callable[[Any], None]]
+Errback = Optional[Callable[[BaseException], None]]
+
+
+def _report(exc: BaseException):
+    traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+
+
+class _Worker:
+    """One thread, one connection, one job queue."""
+
+    BATCH = 64
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        results: "queue.Queue",
+        wait_for: Optional[threading.Event] = None,
+    ):
+        self.jobs: "queue.Queue" = queue.Queue()
+        self.ready = threading.Event()
+        self._results = results
+        self._open_error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(
+            target=self._run, args=(factory, wait_for), name=name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self.jobs.put(None)
+        self._thread.join()
+
+    def _run(self, factory, wait_for):
+        if wait_for is not None:
+            wait_for.wait()
+        try:
+            db = factory()
+        except Exception as exc:
+            # Fail every call instead of leaving the UI waiting forever.
+            _report(exc)
+            db = None
+            self._open_error = exc
+        self.ready.set()
+
+        stopping = False
+        while not stopping:
+            job = self.jobs.get()
+            if job is None:
+                break
+            batch = [job]
+            while len(batch) < self.BATCH:
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            for outcome in self._run_batch(db, batch):
+                self._results.put(outcome)
+        if db is not None:
+            db.close()
+
+    def _run_batch(self, db, batch):
+        """
+        Run queued jobs as one transaction (one commit for the lot); each
+        job is its own savepoint, so a failing job does not undo the rest.
+        """
+        if db is None:
+            return [(cb, None, self._open_error, eb) for _, cb, eb, _ in batch]
+
+        # A batch mixes reads (poll_changes, day lists) with writes; with
+        # a write in it, hold the write lock from the start so a commit by
+        # another window or cli.py cannot strand it on an old snapshot.
+        writes = any(w for *_, w in batch)
+        outcomes = []
+        try:
+            with db.transaction(immediate=writes):
+                for fn, callback, errback, _ in batch:
+                    try:
+                        with db.savepoint():
+                            result = fn(db)
+                        outcomes.append((callback, result, None, errback))
+                    except Exception as exc:
+                        outcomes.append((callback, None, exc, errback))
+        except Exception as exc:
+            # The commit itself failed: nothing in the batch was stored.
+            outcomes = [(cb, None, exc, eb) for _, cb, eb, _ in batch]
+        return outcomes
+
+
+class AsyncDatabase:
+    """
+    Database facade for the UI: a worker thread owns the connection and
+    serves calls from a queue, so the Tk main loop never waits on SQLite.
+
+    Results are handed back on the Tk thread: the UI polls the result
+    queue with after() while calls are outstanding. Jobs that pile up
+    while the worker is busy run together in one transaction, so a burst
+    of writes costs a single commit.
+
+    With a `reader` factory (a read-only Database), read() calls go to a
+    second worker instead, so long list queries run beside writes (this
+    needs WAL mode to actually overlap).
+    """
+
+    POLL_MS = 10
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        reader: Optional[Callable[[], Any]] = None,
+    ):
+        self.root = None
+        self._results: "queue.Queue" = queue.Queue()
+        self._pending = 0
+        self._poll_id: Optional[str] = None
+
+        self._writer = _Worker("db-worker", factory, self._results)
+        # The reader may only open once the writer has created/migrated the file.
+        self._reader = (
+            _Worker("db-reader", reader, self._results, wait_for=self._writer.ready)
+            if reader is not None
+            else None
+        )
+
+    def attach(self, root):
+        """Deliver results through this Tk widget's event loop."""
+        self.root = root
+        if self._pending and self._poll_id is None:
+            self._poll_id = root.after(self.POLL_MS, self._poll)
+
+    # ------------------------------------------------------------------
+    # UI side
+    # ------------------------------------------------------------------
+
+    def call(
+        self,
+        method: str,
+        *args,
+        callback: Callback = None,
+        errback: Errback = None,
+        **kwargs,
+    ):
+        """Queue db.<method>(*args, **kwargs); callback(result) on the UI thread."""
+        self.submit(
+            lambda db: getattr(db, method)(*args, **kwargs), callback, errback
+        )
+
+    def read(
+        self,
+        method: str,
+        *args,
+        callback: Callback = None,
+        errback: Errback = None,
+        **kwargs,
+    ):
+        """Like call(), but served by the read-only connection if there is one."""
+        self.submit(
+            lambda db: getattr(db, method)(*args, **kwargs),
+            callback,
+            errback,
+            worker=self._reader,
+            writes=False,
+        )
+
+    def query(
+        self,
+        method: str,
+        *args,
+        callback: Callback = None,
+        errback: Errback = None,
+        **kwargs,
+    ):
+        """
+        Like call() for a read that needs the main connection (its task
+        cache, its place in the change log); takes no write lock.
+        """
+        self.submit(
+            lambda db: getattr(db, method)(*args, **kwargs),
+            callback,
+            errback,
+            writes=False,
+        )
+
+    def submit_read(
+        self,
+        fn: Callable[[Any], Any],
+        callback: Callback = None,
+        errback: Errback = None,
+    ):
+        """submit() for read-only work: on the reader connection if there is one."""
+        self.submit(fn, callback, errback, worker=self._reader, writes=False)
+
+    def submit(
+        self,
+        fn: Callable[[Any], Any],
+        callback: Callback = None,
+        errback: Errback = None,
+        worker: Optional[_Worker] = None,
+        writes: bool = True,
+    ):
+        """
+        Queue fn(db), run on the worker; callback(result) on the UI thread.
+        `writes=False` marks work that only reads.
+        """
+        self._pending += 1
+        (worker or self._writer).jobs.put((fn, callback, errback, writes))
+        if self._poll_id is None and self.root is not None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def close(self):
+        """Finish queued work, close the connections and stop the workers."""
+        if self._poll_id is not None and self.root is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._reader is not None:
+            self._reader.stop()
+        self._writer.stop()
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                callback, result, exc, errback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            try:
+                if exc is not None:
+                    (errback or _report)(exc)
+                elif callback is not None:
+                    callback(result)
+            except Exception as cb_exc:
+                _report(cb_exc)
+
+        if self._pending > 0:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+
+from metrics import UI, QueryTrace
+
+# Shown first when present; other actions follow by name.
+_KEY_ACTIONS = ("load_tasks", "select_day", "mark_done", "drop_task")
+
+
+class DebugOverlay:
+    """
+    StatusBar debug line: p50/p95 of the UI action histograms and SQL
+    totals, refreshed once a second while it is visible. A TickScheduler
+    subscriber like ClockService.
+    """
+
+    def __init__(self, status_bar, trace: Optional[QueryTrace] = None):
+        self.status_bar = status_bar
+        self.trace = trace
+
+    def toggle(self, event=None):
+        self.status_bar.set_debug_visible(not self.status_bar.debug_visible)
+        if self.status_bar.debug_visible:
+            self.tick(datetime.now())
+
+    def is_active(self) -> bool:
+        return self.status_bar.debug_visible
+
+    def tick(self, now: datetime):
+        actions = UI.snapshot()
+        names = [n for n in _KEY_ACTIONS if n in actions]
+        names += [n for n in actions if n not in _KEY_ACTIONS]
+
+        parts = [
+            f"{n} {actions[n]['p50_ms']:g}/{actions[n]['p95_ms']:g}ms"
+            for n in names[:4]
+        ]
+        if self.trace is not None:
+            total = self.trace.total.snapshot()
+            parts.append(
+                f"SQL {total['count']} p95 {total['p95_ms']:g}ms max {total['max_ms']:g}ms"
+            )
+        self.status_bar.set_debug("  ·  ".join(parts) or "no samples yet")
@@ -0,0 +1,157 @@
+from typing import Callable, List, Optional, Sequence
+
+from database import Cursor, page_cursor
+from models import Task
+from .db_worker import _report
+from .tree_sync import TreeSync
+
+# fetch(callback, errback=..., after=..., before=..., limit=...); later
+# either callback(tasks) receives the page in list order or errback(exc).
+Fetch = Callable[..., None]
+
+
+class PagedList:
+    """
+    Lazily paged Treeview for one of the global lists.
+
+    Only a window of at most `window` rows exists in the widget. Scrolling
+    near the bottom fetches the next page (dropping rows from the top once
+    the window is full) and scrolling back near the top fetches the page
+    before it, so memory stays bounded however long the list is.
+    """
+
+    EDGE = 0.1  # fraction of the scroll range that triggers a page load
+
+    def __init__(
+        self,
+        tree,
+        fetch: Fetch,
+        to_values: Callable[[Task], Sequence[str]],
+        page_size: int = 100,
+        window: int = 400,
+        scrollbar=None,
+    ):
+        self.tree = tree
+        self.fetch = fetch
+        self.to_values = to_values
+        self.page_size = page_size
+        self.window = max(window, 2 * page_size)
+        self.scrollbar = scrollbar
+
+        self.rows = TreeSync(tree)
+        self.tasks: List[Task] = []
+        self._has_before = False
+        self._has_after = False
+        self._anchor: Optional[Cursor] = None  # row just above the window
+
+        self._loading = False
+        self._generation = 0  # bumped by refresh(); older replies are dropped
+
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    # ------------------------------------------------------------------
+    def refresh(self, then: Optional[Callable[[], None]] = None):
+        """
+        Reload the current window in place, keeping the scroll position;
+        then() once the rows are on screen.
+        """
+        self._generation += 1
+        limit = max(len(self.tasks), self.page_size)
+
+        def apply(tasks):
+            self._has_after = len(tasks) > limit
+            self._show(tasks[:limit])
+            if then is not None:
+                then()
+
+        self._request(apply, after=self._anchor, limit=limit + 1)
+
+    def reset(self):
+        """Back to the top of the list."""
+        self._anchor = None
+        self._has_before = False
+        self.tasks = []
+        self.refresh()
+
+    def task_at(self, iid: str) -> Optional[Task]:
+        task_id = self.rows.key(iid)
+        for task in self.tasks:
+            if task.id == task_id:
+                return task
+        return None
+
+    # ------------------------------------------------------------------
+    def _request(self, apply, **kwargs):
+        generation = self._generation
+        self._loading = True
+
+        def done(tasks):
+            if generation != self._generation:
+                return
+            self._loading = False
+            apply(tasks)
+
+        def failed(exc: BaseException):
+            # Scrolling to the edge again retries.
+            if generation == self._generation:
+                self._loading = False
+            _report(exc)
+
+        self.fetch(done, errback=failed, **kwargs)
+
+    def _show(self, tasks: List[Task]):
+        self.tasks = tasks
+        self.rows.sync((t.id, self.to_values(t)) for t in tasks)
+
+    def _on_scroll(self, first, last):
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        if float(last) >= 1.0 - self.EDGE and self._has_after:
+            self.tree.after_idle(self._load_next)
+        elif float(first) <= self.EDGE and self._has_before:
+            self.tree.after_idle(self._load_prev)
+
+    def _load_next(self):
+        if self._loading or not self._has_after or not self.tasks:
+            return
+
+        def apply(page):
+            self._has_after = len(page) > self.page_size
+            tasks = self.tasks + page[: self.page_size]
+
+            drop = max(0, len(tasks) - self.window)
+            if drop:
+                self._anchor = page_cursor(tasks[drop - 1])
+                self._has_before = True
+                tasks = tasks[drop:]
+            self._show(tasks)
+            if drop:
+                self.tree.yview_scroll(-drop, "units")
+
+        self._request(
+            apply, after=page_cursor(self.tasks[-1]), limit=self.page_size + 1
+        )
+
+    def _load_prev(self):
+        if self._loading or not self._has_before or not self.tasks:
+            return
+
+        def apply(fetched):
+            self._has_before = len(fetched) > self.page_size
+            page = fetched[-self.page_size:]
+            # The extra row fetched is exactly the one above the new window.
+            self._anchor = page_cursor(fetched[0]) if self._has_before else None
+            tasks = page + self.tasks
+
+            drop = max(0, len(tasks) - self.window)
+            if drop:
+                tasks = tasks[:-drop]
+                self._has_after = True
+            self._show(tasks)
+            self.tree.yview_scroll(len(page), "units")
+
+        self._request(
+            apply, before=page_cursor(self.tasks[0]), limit=self.page_size + 1
+        )
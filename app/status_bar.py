@@ -3,7 +3,8 @@ from tkinter import ttk
 
 class StatusBar(ttk.Frame):
     """
-    Bottom bar: status message + clock.
+    Bottom bar: status message + clock, and an optional debug line with
+    latency figures (F12).
     """
 
     def __init__(self, master):
@@ -25,8 +26,23 @@ class StatusBar(ttk.Frame):
         )
         self.lbl_clock.pack(side="right", padx=10, pady=5)
 
+        self.lbl_debug = ttk.Label(self, text="", anchor="w", style="Top.TLabel")
+        self.debug_visible = False
+
     def set_message(self, msg: str):
         self.lbl_status.config(text=msg)
 
     def set_clock(self, text: str):
         self.lbl_clock.config(text=text)
+
+    def set_debug_visible(self, visible: bool):
+        if visible == self.debug_visible:
+            return
+        self.debug_visible = visible
+        if visible:
+            self.lbl_debug.pack(side="left", fill="x", expand=True, padx=10, pady=5)
+        else:
+            self.lbl_debug.pack_forget()
+
+    def set_debug(self, text: str):
+        self.lbl_debug.config(text=text)
@@ -1,12 +1,45 @@
-import os
-import sys
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from datetime import datetime
+from tkinter import ttk
+from datetime import date, datetime, timedelta
 from typing import Optional
 
-from models import Task
+from metrics import UI
+from models import Changes, Task
+from recurrence import is_occurrence, split_occurrence_id
 from time_utils import format_duration, get_now, format_date_pretty
+from .paged_list import PagedList
+from .tree_drag import TreeDrag
+from .tree_sync import TreeSync
+
+
+def _this_week(today: date):
+    monday = today - timedelta(days=today.weekday())
+    return monday, monday + timedelta(days=6), "day"
+
+
+# Reports tab: range label -> (today -> (start, end, period shown)).
+REPORT_RANGES = {
+    "This week": _this_week,
+    "Last 30 days": lambda today: (today - timedelta(days=29), today, "week"),
+    "This month": lambda today: (
+        today.replace(day=1),
+        (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1),
+        "week",
+    ),
+    "This year": lambda today: (
+        date(today.year, 1, 1), date(today.year, 12, 31), "month"
+    ),
+}
+
+
+# New task panel: choice -> (freq, weekdays) for Database.add_recurrence.
+REPEAT_CHOICES = {
+    "Does not repeat": None,
+    "Every day": ("daily", 0),
+    "Every weekday": ("weekly", 0b0011111),
+    "Every week": ("weekly", 0),
+    "Every month": ("monthly", 0),
+}
 
 
 class TaskView(ttk.Frame):
@@ -19,10 +52,9 @@ class TaskView(ttk.Frame):
         self.week_view = week_view
 
         self.tasks_by_item = {}
+        self.running_tasks = {}  # task id -> Task with a running timer
         self.context_item: Optional[str] = None
 
-        self._drag_item: Optional[str] = None
-
         self._build_ui()
 
     # ----------------------------------------------------------------------
@@ -59,11 +91,26 @@ class TaskView(ttk.Frame):
         )
         self.txt_desc.pack(anchor="w", pady=3)
 
+        ttk.Label(left, text="Repeat:", style="Top.TLabel").pack(anchor="w")
+        self.repeat = ttk.Combobox(
+            left, values=list(REPEAT_CHOICES), state="readonly", width=22
+        )
+        self.repeat.current(0)
+        self.repeat.pack(anchor="w", pady=3)
+
         self.btn_add = ttk.Button(
             left, text="Add task", command=self.add_task, style="Accent.TButton"
         )
         self.btn_add.pack(anchor="w", pady=5)
 
+        ttk.Label(left, text="Search tasks and notes:", style="Top.TLabel").pack(
+            anchor="w", pady=(15, 0)
+        )
+        self.entry_search = ttk.Entry(left, width=25, style="Dark.TEntry")
+        self.entry_search.pack(anchor="w", pady=3)
+        self.entry_search.bind("<KeyRelease>", self._on_search_key)
+        self._search_after: Optional[str] = None
+
         # Right panel – main list + summary tabs
         right = ttk.Frame(container, style="Main.TFrame")
         right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -91,6 +138,7 @@ class TaskView(ttk.Frame):
         self.tree.column("duration", width=120, anchor="center")
 
         self.tree.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
+        self.rows = TreeSync(self.tree)
 
         scrollbar = ttk.Scrollbar(right, orient=tk.VERTICAL, command=self.tree.yview)
         scrollbar.place(relx=1.0, rely=0, relheight=1.0, anchor="ne")
@@ -159,6 +207,49 @@ class TaskView(ttk.Frame):
         self.tree_over.column("duration", width=110, anchor="center")
         self.tree_over.pack(fill=tk.BOTH, expand=True)
 
+        # Search results
+        self.frame_search = ttk.Frame(self.nb, style="Main.TFrame")
+        self.nb.add(self.frame_search, text="Search")
+
+        self.tree_search = ttk.Treeview(
+            self.frame_search,
+            columns=("title", "date", "duration"),
+            show="headings",
+            selectmode="browse",
+        )
+        self.tree_search.heading("title", text="Task")
+        self.tree_search.heading("date", text="Date")
+        self.tree_search.heading("duration", text="Duration")
+        self.tree_search.column("title", width=350)
+        self.tree_search.column("date", width=110, anchor="center")
+        self.tree_search.column("duration", width=110, anchor="center")
+        self.tree_search.pack(fill=tk.BOTH, expand=True)
+        self.search_rows = TreeSync(self.tree_search)
+        self.search_results = {}  # item -> Task
+        self.tree_search.bind("<Double-1>", self._on_search_open)
+
+        # Reports
+        self.frame_reports = ttk.Frame(self.nb, style="Main.TFrame")
+        self.nb.add(self.frame_reports, text="Reports")
+
+        report_bar = ttk.Frame(self.frame_reports, style="Main.TFrame")
+        report_bar.pack(fill=tk.X)
+        self.report_range = ttk.Combobox(
+            report_bar, values=list(REPORT_RANGES), state="readonly", width=14
+        )
+        self.report_range.current(0)
+        self.report_range.pack(side=tk.LEFT, pady=2)
+        self.report_range.bind("<<ComboboxSelected>>", lambda e: self._load_report())
+
+        self.txt_report = tk.Text(
+            self.frame_reports, height=12, wrap="none", font="TkFixedFont",
+            state="disabled",
+        )
+        self.txt_report.pack(fill=tk.BOTH, expand=True)
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        self._build_summary_lists()
+
         # Context menu
         self.menu = tk.Menu(self, tearoff=0)
         self.menu.add_command(label="Mark as done", command=self.mark_done)
@@ -169,22 +260,55 @@ class TaskView(ttk.Frame):
         self.menu.add_separator()
         self.menu.add_command(label="Edit task", command=self.edit_task)
         self.menu.add_command(label="Delete task", command=self.delete_task)
+        self.menu.add_command(label="Stop repeating", command=self.stop_repeating)
         self.menu.add_separator()
         self.menu.add_command(label="Open notes", command=self.open_notes)
 
         self.tree.bind("<Button-3>", self._on_right_click)
 
-        self.tree.bind("<ButtonPress-1>", self._on_left_press)
-        self.tree.bind("<B1-Motion>", self._on_left_motion)
-        self.tree.bind("<ButtonRelease-1>", self._on_left_release)
+        # Drag & drop reordering of the day list.
+        self.drag = TreeDrag(self.tree, self._save_move_to_db)
+
+    def _build_summary_lists(self):
+        """Paged models over tree_todo / tree_done / tree_over."""
+        self.list_todo = PagedList(
+            self.tree_todo,
+            lambda callback, **kw: self.db.read(
+                "get_upcoming_todos_page", get_now().date(), callback=callback, **kw
+            ),
+            self._summary_values,
+        )
+        self.list_done = PagedList(
+            self.tree_done,
+            lambda callback, **kw: self.db.read(
+                "get_completed_tasks_page", callback=callback, **kw
+            ),
+            self._summary_values,
+        )
+        self.list_over = PagedList(
+            self.tree_over,
+            lambda callback, **kw: self.db.read(
+                "get_overdue_tasks_page", get_now().date(), callback=callback, **kw
+            ),
+            self._summary_values,
+        )
+        # Only the list on screen is fetched; the others when their tab opens.
+        self._lists_by_tab = {
+            str(paged.tree.master): paged
+            for paged in (self.list_todo, self.list_done, self.list_over)
+        }
+        self._stale_lists = set(self._lists_by_tab.values())
 
     
-    def update_day(self, day):
+    def update_day(self, day, then=None):
+        """Show `day`'s tasks; then() once they are on screen."""
         self.lbl_day_value.config(text=day.strftime("%d.%m.%Y"))
-        self._load_tasks()
+        self._load_tasks(then)
 
     
     def add_task(self):
+        from tkinter import messagebox  # dialogs load on first use, not at startup
+
         title = self.entry_title.get().strip()
         desc = self.txt_desc.get("1.0", tk.END).strip()
 
@@ -193,69 +317,171 @@ class TaskView(ttk.Frame):
             return
 
         day = self.week_view.get_selected_date()
-        self.db.add_task(title, desc, day)
+        repeat = REPEAT_CHOICES[self.repeat.get()]
+
+        def added(_):
+            self._load_tasks()
+            self._tasks_changed()
+
+        if repeat is None:
+            self.db.call("add_task", title, desc, day, callback=added)
+        else:
+            freq, weekdays = repeat
+            self.db.call(
+                "add_recurrence", title, desc, freq, day,
+                weekdays=weekdays, callback=added,
+            )
 
         self.entry_title.delete(0, tk.END)
         self.txt_desc.delete("1.0", tk.END)
+        self.repeat.current(0)
 
-        self._load_tasks()
-
-    def _load_tasks(self):
+    def _load_tasks(self, then=None):
         day = self.week_view.get_selected_date()
-        tasks = self.db.get_tasks_by_date(day)
-
-        self.tree.delete(*self.tree.get_children())
-        self.tasks_by_item.clear()
-
-        for task in tasks:
-            sec = self._compute_display_seconds(task)
-            item = self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    task.title,
-                    (task.description or "").strip(),
-                    task.status,
-                    format_duration(sec),
-                ),
-            )
-            self.tasks_by_item[item] = task
+        done = UI.start("load_tasks")
+
+        def show(tasks):
+            self._show_tasks(day, tasks)
+            done()
+            if then is not None:
+                then()
+
+        self.db.query("get_tasks_by_date", day, callback=show)
+
+    def _show_tasks(self, day, tasks):
+        if day != self.week_view.get_selected_date():
+            return  # the user has moved on to another day meanwhile
+
+        self.rows.sync((task.id, self._row_values(task)) for task in tasks)
+        self.tasks_by_item = {self.rows.iid(task.id): task for task in tasks}
+        self._set_running({t.id: t for t in tasks if t.active_timer_start})
+
+    def _update_task(self, task_id: int, change, action: str):
+        """
+        Run change(db) on the DB worker, then refresh just that task's row
+        with the state read back in the same job. `action` names the
+        latency histogram (click to row updated).
+        """
+        done = UI.start(action)
+
+        def job(db):
+            change(db)
+            return db.get_task(task_id)
+
+        def show(task):
+            self._show_task(task_id, task)
+            done()
+
+        self.db.submit(job, callback=show)
+
+    def _show_task(self, task_id: int, task: Optional[Task]):
+        """Refresh a single row of the day list after a one-task action."""
+        iid = self.rows.iid(task_id)
+
+        if task is None or task.task_date != self.week_view.get_selected_date():
+            if iid is not None:
+                self.rows.remove(task_id)
+                self.tasks_by_item.pop(iid, None)
+            task = None
+        elif iid is None or task.id != task_id:
+            # A new row, or an occurrence stored as one by this write.
+            self._load_tasks()  # running timers are picked up there
+            self._tasks_changed()
+            return
+        else:
+            self.rows.update(task_id, self._row_values(task))
+            self.tasks_by_item[iid] = task
+
+        running = dict(self.running_tasks)
+        running.pop(task_id, None)
+        if task is not None and task.active_timer_start:
+            running[task_id] = task
+        self._set_running(running)
+        self._tasks_changed()
+
+    def _set_running(self, running):
+        changed = running.keys() != self.running_tasks.keys()
+        self.running_tasks = running
+        if changed:
+            # PlannerApp wakes its tick scheduler on this.
+            self.event_generate("<<TimersChanged>>", when="tail")
+
+    def _row_values(self, task: Task):
+        return (
+            task.title,
+            (task.description or "").strip(),
+            task.status,
+            format_duration(self._compute_display_seconds(task)),
+        )
 
-        self._refresh_summary_lists()
+    def _summary_values(self, task: Task):
+        return (
+            task.title,
+            format_date_pretty(task.task_date),
+            format_duration(self._compute_display_seconds(task)),
+        )
 
-    
-    def _fill_summary_tree(self, tree, tasks):
-        tree.delete(*tree.get_children())
-        for task in tasks:
-            sec = self._compute_display_seconds(task)
-            tree.insert(
-                "",
-                tk.END,
-                values=(
-                    task.title,
-                    format_date_pretty(task.task_date),
-                    format_duration(sec),
-                ),
-            )
+    def _tasks_changed(self):
+        """After a write: everything derived from tasks beside the day list."""
+        self._refresh_summary_lists()
+        self.week_view.refresh_counts()
 
     def _refresh_summary_lists(self):
-        today = get_now().date()
-        todos = self.db.get_upcoming_todos(today)
-        done = self.db.get_completed_tasks()
-        overdue = self.db.get_overdue_tasks(today)
+        """Reload the list on screen; hidden ones reload when their tab opens."""
+        self._stale_lists = set(self._lists_by_tab.values())
+        self.refresh_visible_list()
+        if self._reports_visible():
+            self._load_report()
+
+    def apply_changes(self, changes: Changes):
+        """
+        Another connection wrote tasks (ChangeWatcher): reload the day on
+        screen only if it was touched, mark just the global lists the
+        written tasks left or entered, and refetch the counts of those days.
+        """
+        if changes.full:
+            self._load_tasks()
+            self._tasks_changed()
+            return
 
-        self._fill_summary_tree(self.tree_todo, todos)
-        self._fill_summary_tree(self.tree_done, done)
-        self._fill_summary_tree(self.tree_over, overdue)
+        if self.week_view.get_selected_date().isoformat() in changes.days:
+            self._load_tasks()
+
+        today = get_now().date().isoformat()
+        for day, status in changes.places:
+            if status == "Done":
+                self._stale_lists.add(self.list_done)
+            elif day >= today:
+                self._stale_lists.add(self.list_todo)
+            else:
+                self._stale_lists.add(self.list_over)
+        self.refresh_visible_list()
+        if self._reports_visible():
+            self._load_report()
+        self.week_view.refresh_counts([date.fromisoformat(d) for d in changes.days])
+
+    def _visible_list(self) -> Optional[PagedList]:
+        return self._lists_by_tab.get(self.nb.select())
+
+    def refresh_visible_list(self, then=None):
+        """Load the global list on screen if it is stale; then() once shown."""
+        paged = self._visible_list()
+        if paged in self._stale_lists:
+            self._stale_lists.discard(paged)
+            paged.refresh(then)
+        elif then is not None:
+            then()
 
     
-    def _compute_display_seconds(self, task: Task) -> int:
+    def _compute_display_seconds(
+        self, task: Task, now: Optional[datetime] = None
+    ) -> int:
         base = int(task.total_seconds or 0)
 
         if task.active_timer_start:
             try:
                 start = datetime.fromisoformat(task.active_timer_start)
-                now = get_now()
+                now = now or get_now()
                 extra = max(0, int((now - start).total_seconds()))
                 return base + extra
             except Exception:
@@ -281,18 +507,24 @@ class TaskView(ttk.Frame):
         task = self._get_task()
         if not task:
             return
-        self.db.set_task_status(task.id, "Done")
-        self._load_tasks()
+        self._update_task(
+            task.id, lambda db: db.set_task_status(task.id, "Done"), "mark_done"
+        )
 
     def mark_not_done(self):
         task = self._get_task()
         if not task:
             return
-        self.db.set_task_status(task.id, "Not done")
-        self._load_tasks()
+        self._update_task(
+            task.id,
+            lambda db: db.set_task_status(task.id, "Not done"),
+            "mark_not_done",
+        )
 
 
     def start_timer(self):
+        from tkinter import messagebox
+
         task = self._get_task()
         if not task:
             return
@@ -301,11 +533,14 @@ class TaskView(ttk.Frame):
             messagebox.showinfo("Info", "Timer is already running for this task.")
             return
 
-        now = get_now().isoformat()
-        self.db.set_task_timer_start(task.id, now)
-        self._load_tasks()
+        now = get_now()
+        self._update_task(
+            task.id, lambda db: db.start_timer(task.id, now), "start_timer"
+        )
 
     def stop_timer(self):
+        from tkinter import messagebox
+
         task = self._get_task()
         if not task:
             return
@@ -314,21 +549,14 @@ class TaskView(ttk.Frame):
             messagebox.showinfo("Info", "No running timer for this task.")
             return
 
-        try:
-            start = datetime.fromisoformat(task.active_timer_start)
-            now = get_now()
-            elapsed = max(0, int((now - start).total_seconds()))
-        except Exception:
-            elapsed = 0
-
-        total = int(task.total_seconds or 0) + elapsed
-
-        self.db.update_task_total_seconds(task.id, total)
-        self.db.set_task_timer_start(task.id, None)
-
-        self._load_tasks()
+        now = get_now()
+        self._update_task(
+            task.id, lambda db: db.stop_timer(task.id, now), "stop_timer"
+        )
 
     def edit_task(self):
+        from tkinter import simpledialog
+
         task = self._get_task()
         if not task:
             return
@@ -347,10 +575,15 @@ class TaskView(ttk.Frame):
         if new_desc is None:
             new_desc = ""
 
-        self.db.update_task_title_desc(task.id, new_title, new_desc)
-        self._load_tasks()
+        self._update_task(
+            task.id,
+            lambda db: db.update_task_title_desc(task.id, new_title, new_desc),
+            "edit_task",
+        )
 
     def delete_task(self):
+        from tkinter import messagebox
+
         task = self._get_task()
         if not task:
             return
@@ -358,51 +591,150 @@ class TaskView(ttk.Frame):
         if not messagebox.askyesno("Delete", f"Delete '{task.title}'?"):
             return
 
-        self.db.delete_task(task.id)
-        self._load_tasks()
+        self._update_task(task.id, lambda db: db.delete_task(task.id), "delete_task")
+
+    def stop_repeating(self):
+        """End a repeat rule the day before the clicked occurrence."""
+        from tkinter import messagebox
+
+        task = self._get_task()
+        if not task:
+            return
+        if not is_occurrence(task.id):
+            messagebox.showinfo(
+                "Info", "Pick an occurrence that has not been changed yet."
+            )
+            return
+        if not messagebox.askyesno("Stop repeating", f"No more '{task.title}' from this day on?"):
+            return
+
+        rule_id, day = split_occurrence_id(task.id)
+
+        def ended(_):
+            self._load_tasks()
+            self._tasks_changed()
+
+        self.db.call("end_recurrence", rule_id, day - timedelta(days=1), callback=ended)
 
     # ----------------------------------------------------------------------
-    # Notes (TXT files) – save on close, Ctrl+S, etc.
+    # Search
     # ----------------------------------------------------------------------
 
-    def _get_note_path(self, task: Task) -> str:
-        if getattr(sys, "frozen", False):
-            base_dir = os.path.dirname(sys.executable)
-        else:
-            base_dir = os.path.dirname(os.path.dirname(__file__))
+    SEARCH_DELAY_MS = 250
+
+    def _on_search_key(self, event=None):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(self.SEARCH_DELAY_MS, self._run_search)
 
-        notes_dir = os.path.join(base_dir, "notes")
-        os.makedirs(notes_dir, exist_ok=True)
-        return os.path.join(notes_dir, f"task_{task.id}.txt")
+    def _run_search(self):
+        self._search_after = None
+        text = self.entry_search.get().strip()
+        if not text:
+            self._show_search(text, [])
+            return
+        self.nb.select(self.frame_search)
+        self.db.read(
+            "search", text, callback=lambda tasks: self._show_search(text, tasks)
+        )
+
+    def _show_search(self, text, tasks):
+        if text != self.entry_search.get().strip():
+            return  # typing went on; a newer search is on its way
+        self.search_rows.sync((t.id, self._summary_values(t)) for t in tasks)
+        self.search_results = {self.search_rows.iid(t.id): t for t in tasks}
+
+    def _on_search_open(self, event):
+        task = self.search_results.get(self.tree_search.identify_row(event.y))
+        if task:
+            self.week_view.set_date(task.task_date)
+
+    # ----------------------------------------------------------------------
+    # Reports
+    # ----------------------------------------------------------------------
+
+    def _reports_visible(self) -> bool:
+        return self.nb.select() == str(self.frame_reports)
+
+    def _on_tab_changed(self, event=None):
+        # Lists and reports are only fetched while their tab is showing.
+        self.refresh_visible_list()
+        if self._reports_visible():
+            self._load_report()
+
+    def _load_report(self):
+        import reports  # NumPy, if installed, loads with the first report
+
+        label = self.report_range.get()
+        today = get_now().date()
+        start, end, period = REPORT_RANGES[label](today)
+        done = UI.start("load_report")
+
+        def show(report):
+            if label != self.report_range.get():
+                return  # another range was picked meanwhile
+            self.txt_report.configure(state="normal")
+            self.txt_report.delete("1.0", tk.END)
+            self.txt_report.insert("1.0", reports.format_report(report, period))
+            self.txt_report.configure(state="disabled")
+            done()
+
+        self.db.submit_read(
+            lambda db: reports.build_report(db, start, end, today), callback=show
+        )
+
+    # ----------------------------------------------------------------------
+    # Notes (SQLite notes table, streamed in) – save on close, Ctrl+S, etc.
+    # ----------------------------------------------------------------------
 
     def open_notes(self):
         task = self._get_task()
         if not task:
             return
 
-        path = self._get_note_path(task)
-        content = ""
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-
         win = tk.Toplevel(self)
         win.title(f"Task notes - {task.title}")
         win.geometry("600x400")
         win.transient(self.winfo_toplevel())
         win.grab_set()
 
-        txt = tk.Text(win, wrap="word")
+        # Read-only until the whole note has streamed in, so a save can
+        # never write back a half-loaded note.
+        txt = tk.Text(win, wrap="word", state="disabled")
         txt.pack(fill=tk.BOTH, expand=True)
-        txt.insert("1.0", content)
+        loaded = False
+
+        def on_chunk(result):
+            nonlocal loaded
+            if not win.winfo_exists():
+                return
+            text, next_offset = result
+            txt.configure(state="normal")
+            txt.insert(tk.END, text)
+            if next_offset is None:
+                txt.edit_reset()
+                loaded = True
+            else:
+                txt.configure(state="disabled")
+                self.db.read(
+                    "read_note_chunk", task.id, next_offset, callback=on_chunk
+                )
+
+        self.db.read("read_note_chunk", task.id, 0, callback=on_chunk)
 
         btn_frame = ttk.Frame(win)
         btn_frame.pack(fill=tk.X)
 
         def do_save():
+            if not loaded:
+                return
             data = txt.get("1.0", tk.END).rstrip()
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(data)
+            # A note stores an occurrence as a task row: show that row.
+            stored = is_occurrence(task.id) and data
+            self.db.call(
+                "save_note", task.id, data,
+                callback=(lambda _: self._load_tasks()) if stored else None,
+            )
 
         def save_and_close():
             do_save()
@@ -419,27 +751,29 @@ class TaskView(ttk.Frame):
     # Drag & drop ordering
     # ----------------------------------------------------------------------
 
-    def _on_left_press(self, event):
-        item = self.tree.identify_row(event.y)
-        self._drag_item = item
-
-    def _on_left_motion(self, event):
-        if not self._drag_item:
-            return
-        target = self.tree.identify_row(event.y)
-        if not target or target == self._drag_item:
+    def _save_move_to_db(self, item):
+        """Only the dropped row is written; its neighbours keep their keys."""
+        task = self.tasks_by_item.get(item)
+        if not task:
             return
-        index = self.tree.index(target)
-        self.tree.move(self._drag_item, "", index)
+        prev_task = self.tasks_by_item.get(self.tree.prev(item))
+        next_task = self.tasks_by_item.get(self.tree.next(item))
 
-    def _on_left_release(self, event):
-        if not self._drag_item:
-            return
-        self._save_order_to_db()
-        self._drag_item = None
-
-    def _save_order_to_db(self):
-        for order, item_id in enumerate(self.tree.get_children()):
-            task = self.tasks_by_item.get(item_id)
-            if task:
-                self.db.set_task_order(task.id, order)
+        day = self.week_view.get_selected_date()
+        prev_id = prev_task.id if prev_task else None
+        next_id = next_task.id if next_task else None
+        done = UI.start("drop_task")
+
+        def move(db):
+            # One job, so one transaction: the move and, if its slot ran
+            # out of room, renumbering the day.
+            if db.move_task(task.id, prev_id, next_id):
+                db.rebalance_day(day)
+
+        def moved(_):
+            done()
+            if any(is_occurrence(i) for i in (task.id, prev_id or 0, next_id or 0)):
+                self._load_tasks()  # they are stored rows now
+            self._refresh_summary_lists()
+
+        self.db.submit(move, callback=moved)
@@ -0,0 +1,64 @@
+from typing import List, Optional
+
+from time_utils import get_now
+
+
+class TickScheduler:
+    """
+    One per-second tick driven by Tk's after(), on the UI thread.
+
+    Subscribers provide is_active() and tick(now). Ticks land just after
+    each wall-clock second, and nothing is scheduled at all while the
+    window is iconified or no subscriber is active; call wake() when
+    something may have become active (e.g. a timer was started).
+    """
+
+    # Land a little after the second boundary so now.second has advanced.
+    SLACK_MS = 5
+
+    def __init__(self, root):
+        self.root = root
+        self._subscribers: List = []
+        self._after_id: Optional[str] = None
+        self._iconified = False
+
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def add(self, subscriber):
+        self._subscribers.append(subscriber)
+        self.wake()
+
+    def wake(self, event=None):
+        if self._after_id is not None or self._iconified:
+            return
+        if not any(s.is_active() for s in self._subscribers):
+            return
+        now = get_now()
+        delay = 1000 - now.microsecond // 1000 + self.SLACK_MS
+        self._after_id = self.root.after(delay, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    # ------------------------------------------------------------------
+    def _tick(self):
+        self._after_id = None
+        now = get_now()
+        for s in self._subscribers:
+            if s.is_active():
+                s.tick(now)
+        self.wake()
+
+    def _on_unmap(self, event):
+        # <Unmap> also arrives for child widgets through the toplevel tag.
+        if event.widget is self.root and self.root.state() == "iconic":
+            self._iconified = True
+            self.stop()
+
+    def _on_map(self, event):
+        if event.widget is self.root and self._iconified:
+            self._iconified = False
+            self._tick()
@@ -1,66 +1,25 @@
-import threading
-import time
 from datetime import datetime
-from time_utils import get_now
-from models import Task
+
+from time_utils import format_duration
 
 
 class TimerService:
     """
-    Görev sürelerini HER SANİYE canlı olarak TreeView üzerinde günceller.
+    Çalışan zamanlayıcıların süre kolonunu HER SANİYE canlı günceller.
 
     NOT:
     - Görevleri her saniye DB'den çekmek yanlış.
-    - Bunun yerine TaskView içindeki tasks_by_item üzerinden hesap yapılır.
+    - Sadece active_timer_start dolu olan satırlar yeniden çizilir;
+      hiç zamanlayıcı yoksa TickScheduler bu servisi hiç çağırmaz.
     """
 
     def __init__(self, task_view):
         self.task_view = task_view
-        self._running = True
-
-        self.thread = threading.Thread(target=self._run, daemon=True)
-        self.thread.start()
-
-    def _run(self):
-        while self._running:
-            try:
-                self._update_durations()
-            except Exception:
-                pass
-
-            time.sleep(1)
-
-    def _update_durations(self):
-        """TreeView içindeki her görevin süre kolonunu canlı günceller."""
-
-        for item_id, task in list(self.task_view.tasks_by_item.items()):
-            seconds = self._compute_display_seconds(task)
-            try:
-                self.task_view.tree.set(item_id, "duration", self._format_duration(seconds))
-            except:
-                pass
-
-    def _compute_display_seconds(self, task: Task) -> int:
-        """TaskView’deki ile aynı hesap — ancak DB güncellemesi olmadan canlı hesap."""
-        base = int(task.total_seconds or 0)
-
-        if task.active_timer_start:
-            try:
-                start_dt = datetime.fromisoformat(task.active_timer_start)
-                now = get_now()
-                extra = max(0, int((now - start_dt).total_seconds()))
-                return base + extra
-            except:
-                return base
-
-        return base
 
-    def _format_duration(self, total):
-        """hh:mm:ss formatında süre string'i döner."""
-        h = total // 3600
-        m = (total % 3600) // 60
-        s = total % 60
-        return f"{h:02d}:{m:02d}:{s:02d}"
+    def is_active(self) -> bool:
+        return bool(self.task_view.running_tasks)
 
-    def stop(self):
-        self._running = False
+    def tick(self, now: datetime):
+        for task in list(self.task_view.running_tasks.values()):
+            seconds = self.task_view._compute_display_seconds(task, now)
+            self.task_view.rows.set(task.id, "duration", format_duration(seconds))
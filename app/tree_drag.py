@@ -0,0 +1,191 @@
+import tkinter as tk
+from typing import Callable, Optional, Tuple
+
+from metrics import UI
+
+
+class TreeDrag:
+    """
+    Drag & drop reordering for a flat Treeview.
+
+    <B1-Motion> only records the pointer; the drop slot under it is worked
+    out at most once per idle pass (after_idle), however many motion
+    events arrive meanwhile. The dragged row stays put while dragging – a
+    line marks where it will land – and moves once, on release, after
+    which on_drop(item) is called. Holding the pointer over the heading or
+    below the bottom edge scrolls the list; Escape cancels.
+    """
+
+    THRESHOLD = 4  # px the pointer travels before a press becomes a drag
+    EDGE = 24  # px above the bottom edge where auto-scroll starts; speed step
+    SCROLL_MS = 40  # auto-scroll step
+
+    def __init__(self, tree, on_drop: Callable[[str], None], color: str = "#007acc"):
+        self.tree = tree
+        self.on_drop = on_drop
+        self.color = color
+
+        self._item: Optional[str] = None
+        self._press_y = 0
+        self._x = self._y = 0
+        self._dragging = False
+        self._slot: Optional[int] = None  # index among the other rows
+        self._frame_id: Optional[str] = None
+        self._scroll_id: Optional[str] = None
+        self._line: Optional[tk.Frame] = None  # created on the first drag
+
+        tree.bind("<ButtonPress-1>", self._on_press, add="+")
+        tree.bind("<B1-Motion>", self._on_motion, add="+")
+        tree.bind("<ButtonRelease-1>", self._on_release, add="+")
+        tree.bind("<Escape>", self.cancel, add="+")
+
+    @property
+    def active(self) -> bool:
+        return self._dragging
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _on_press(self, event):
+        self.cancel()
+        self._item = self.tree.identify_row(event.y) or None
+        self._press_y = event.y
+
+    def _on_motion(self, event):
+        if self._item is None:
+            return
+        self._x, self._y = event.x, event.y
+        if not self._dragging:
+            if abs(event.y - self._press_y) < self.THRESHOLD:
+                return
+            self._dragging = True
+            self.tree.configure(cursor="fleur")
+        if self._frame_id is None:
+            self._frame_id = self.tree.after_idle(self._frame)
+
+    def _on_release(self, event):
+        item, dragging = self._item, self._dragging
+        if not dragging:
+            self._item = None
+            return
+        self._y = event.y
+        self._cancel_pending()
+        slot = self._slot_at(self._y)[0] if self.tree.exists(item) else None
+        self.cancel()
+
+        if slot is not None and slot != self.tree.index(item):
+            self.tree.move(item, "", slot)
+            self.on_drop(item)
+
+    def cancel(self, event=None):
+        """Abandon the drag in progress; nothing moves."""
+        self._cancel_pending()
+        if self._line is not None:
+            self._line.place_forget()
+        if self._dragging:
+            self.tree.configure(cursor="")
+        self._item = None
+        self._dragging = False
+        self._slot = None
+
+    def _cancel_pending(self):
+        if self._frame_id is not None:
+            self.tree.after_cancel(self._frame_id)
+            self._frame_id = None
+        if self._scroll_id is not None:
+            self.tree.after_cancel(self._scroll_id)
+            self._scroll_id = None
+
+    # ------------------------------------------------------------------
+    # One layout update per frame
+    # ------------------------------------------------------------------
+
+    def _frame(self):
+        self._frame_id = None
+        if not self._dragging:
+            return
+        if not self.tree.exists(self._item):
+            self.cancel()  # the list was reloaded from under the drag
+            return
+        with UI.timer("drag_frame"):
+            self._show_slot()
+        if self._scroll_id is None and self._scroll_step():
+            self._scroll_id = self.tree.after(self.SCROLL_MS, self._autoscroll)
+
+    def _show_slot(self):
+        slot, line_y = self._slot_at(self._y)
+        if slot is None:
+            return  # over the heading or empty space: keep the last slot
+        self._slot = slot
+        if self._line is None:
+            self._line = tk.Frame(self.tree, height=2, bg=self.color)
+        if line_y is None:
+            self._line.place_forget()
+        else:
+            self._line.place(x=0, y=line_y - 1, relwidth=1.0)
+
+    def _slot_at(self, y: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (index among the other rows, y of the insertion line) for a drop
+        at y; the line y is None when that gap is scrolled out of view.
+        """
+        tree, item = self.tree, self._item
+        y = min(y, tree.winfo_height() - 1)  # under the widget: its last row in view
+        row = tree.identify_row(y)
+        below = False
+        if row:
+            box = tree.bbox(row)
+            below = bool(box) and y >= box[1] + box[3] // 2
+        else:
+            children = tree.get_children()
+            if not children:
+                return None, None
+            if self._above_rows(y):
+                # Over the heading: before the first row in view.
+                first = int(round(tree.yview()[0] * len(children)))
+                row = children[min(first, len(children) - 1)]
+                box = tree.bbox(row)
+            else:
+                row = children[-1]
+                box = tree.bbox(row)
+                if not box or y < box[1] + box[3]:
+                    return None, None  # a gap between rows, or off the side
+                below = True  # empty space under the last row
+
+        slot = tree.index(row) + below
+        if slot > tree.index(item):
+            slot -= 1  # the dragged row itself leaves its old place
+        if not box:
+            return slot, None
+        return slot, box[1] + (box[3] if below else 0)
+
+    # ------------------------------------------------------------------
+    # Auto-scroll
+    # ------------------------------------------------------------------
+
+    def _scroll_step(self) -> int:
+        """Rows to scroll per step: <0 up, >0 down, faster further out."""
+        height = self.tree.winfo_height()
+        if self._above_rows(self._y):
+            return -1 - max(0, -self._y) // self.EDGE
+        if self._y > height - self.EDGE:
+            return 1 + max(0, self._y - height) // self.EDGE
+        return 0
+
+    def _above_rows(self, y: int) -> bool:
+        return y < 0 or self.tree.identify_region(self._x, y) == "heading"
+
+    def _autoscroll(self):
+        # Motion events stop while the pointer rests at the edge; this keeps
+        # scrolling (and moving the line) until it leaves the edge zone.
+        self._scroll_id = None
+        if not self._dragging:
+            return
+        step = self._scroll_step()
+        first, last = self.tree.yview()
+        if not step or (step < 0 and first <= 0) or (step > 0 and last >= 1):
+            return  # out of the edge zone, or nothing left to scroll
+        self.tree.yview_scroll(step, "units")
+        self._show_slot()
+        self._scroll_id = self.tree.after(self.SCROLL_MS, self._autoscroll)
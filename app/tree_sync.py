@@ -0,0 +1,156 @@
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+Row = Tuple[Hashable, Sequence[str]]
+
+
+def _stable_keys(keys: List[Hashable], target_index: Dict[Hashable, int]) -> Set[Hashable]:
+    """
+    Longest run of `keys` (current display order) that is already in target
+    order. Those rows never have to move; everything else is re-placed.
+    """
+    tails: List[int] = []       # smallest target index ending a run of length i+1
+    tail_pos: List[int] = []    # position in `keys` of that tail
+    prev: List[int] = [-1] * len(keys)
+
+    for pos, key in enumerate(keys):
+        t = target_index[key]
+        i = bisect_left(tails, t)
+        if i == len(tails):
+            tails.append(t)
+            tail_pos.append(pos)
+        else:
+            tails[i] = t
+            tail_pos[i] = pos
+        prev[pos] = tail_pos[i - 1] if i else -1
+
+    stable = set()
+    pos = tail_pos[-1] if tail_pos else -1
+    while pos != -1:
+        stable.add(keys[pos])
+        pos = prev[pos]
+    return stable
+
+
+class TreeSync:
+    """
+    Keeps a flat ttk.Treeview in step with a keyed list of rows.
+
+    Each call to sync() compares against what is already on screen and only
+    inserts, deletes, moves or sets the cells that differ, so selection,
+    focus and scroll position survive a refresh.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.columns: Tuple[str, ...] = tuple(tree["columns"])
+
+        self._iid_by_key: Dict[Hashable, str] = {}
+        self._key_by_iid: Dict[str, Hashable] = {}
+        self._values: Dict[Hashable, Tuple[str, ...]] = {}
+        self._order: List[Hashable] = []
+
+    # ------------------------------------------------------------------
+    def iid(self, key: Hashable) -> Optional[str]:
+        return self._iid_by_key.get(key)
+
+    def key(self, iid: str) -> Optional[Hashable]:
+        return self._key_by_iid.get(iid)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    # ------------------------------------------------------------------
+    def sync(self, rows: Iterable[Row]):
+        rows = [(key, tuple(values)) for key, values in rows]
+        target_index = {key: i for i, (key, _) in enumerate(rows)}
+
+        # Re-read the display order: drag & drop moves items behind our back.
+        if self._order:
+            self._order = [self._key_by_iid[i] for i in self.tree.get_children()]
+
+        # 1) rows that disappeared
+        stale = [k for k in self._order if k not in target_index]
+        if stale:
+            self.tree.delete(*[self._iid_by_key[k] for k in stale])
+            for k in stale:
+                self._forget(k)
+            self._order = [k for k in self._order if k in target_index]
+
+        # 2) new and moved rows, each placed right after its target
+        # predecessor. Once no misplaced row is left in front, the target
+        # index is simply the loop index and Tk need not be asked.
+        stable = _stable_keys(self._order, target_index)
+        misplaced = len(self._order) - len(stable)
+        prev_iid = ""
+        for i, (key, values) in enumerate(rows):
+            iid = self._iid_by_key.get(key)
+            if iid is None:
+                index = self.tree.index(prev_iid) + 1 if misplaced and prev_iid else i
+                iid = self.tree.insert("", index, values=values)
+                self._iid_by_key[key] = iid
+                self._key_by_iid[iid] = key
+                self._values[key] = values
+            elif key not in stable:
+                misplaced -= 1
+                self.tree.detach(iid)
+                index = self.tree.index(prev_iid) + 1 if misplaced and prev_iid else i
+                self.tree.move(iid, "", index)
+            prev_iid = iid
+
+        self._order = [key for key, _ in rows]
+
+        # 3) changed cells
+        for key, values in rows:
+            self.update(key, values)
+
+    def update(self, key: Hashable, values: Sequence[str]) -> bool:
+        """Set only the cells of one row that changed. False if not shown."""
+        iid = self._iid_by_key.get(key)
+        if iid is None:
+            return False
+        values = tuple(values)
+        old = self._values[key]
+        if old != values:
+            for col, before, after in zip(self.columns, old, values):
+                if before != after:
+                    self.tree.set(iid, col, after)
+            self._values[key] = values
+        return True
+
+    def set(self, key: Hashable, column: str, value: str) -> bool:
+        """Set a single cell, e.g. the live duration of a running timer."""
+        iid = self._iid_by_key.get(key)
+        if iid is None:
+            return False
+        values = self._values[key]
+        i = self.columns.index(column)
+        if values[i] != value:
+            self.tree.set(iid, column, value)
+            self._values[key] = values[:i] + (value,) + values[i + 1:]
+        return True
+
+    def remove(self, key: Hashable) -> bool:
+        iid = self._iid_by_key.get(key)
+        if iid is None:
+            return False
+        self.tree.delete(iid)
+        self._forget(key)
+        self._order.remove(key)
+        return True
+
+    def clear(self):
+        if self._order:
+            self.tree.delete(*[self._iid_by_key[k] for k in self._order])
+        self._iid_by_key.clear()
+        self._key_by_iid.clear()
+        self._values.clear()
+        self._order.clear()
+
+    def _forget(self, key: Hashable):
+        iid = self._iid_by_key.pop(key)
+        del self._key_by_iid[iid]
+        del self._values[key]
@@ -1,18 +1,36 @@
+import sys
+import time
 import tkinter as tk
 from tkinter import ttk
 
+import metrics
 from .week_view import WeekView
 from .task_view import TaskView
 from .status_bar import StatusBar
 from .clock_service import ClockService
 from .timer_service import TimerService
+from .tick_scheduler import TickScheduler
+from .change_watcher import ChangeWatcher
+from .debug_overlay import DebugOverlay
 
 
 class PlannerApp(tk.Tk):
-    def __init__(self, db):
+    def __init__(self, db, trace=None, log_dir=None, debug=False, started=None):
+        """
+        `trace` is the QueryTrace the Database connections record into;
+        with `log_dir`, UI and SQL timings are dumped there on close.
+        `debug` shows the StatusBar latency line from the start (F12).
+        `started` is the perf_counter() the startup timings count from
+        (default: now).
+        """
+        self._started = time.perf_counter() if started is None else started
+        self.startup = {}  # startup step -> ms since `started`
         super().__init__()
 
         self.db = db
+        self.trace = trace
+        self.log_dir = log_dir
+        self.db.attach(self)
 
         # Window
         self.title("Planner App")
@@ -122,11 +140,29 @@ class PlannerApp(tk.Tk):
         # ----- Layout -----
         self._create_layout()
 
+        self.scheduler = TickScheduler(self)
         self.clock_service = ClockService(self.status_bar)
         self.timer_service = TimerService(self.task_view)
+        self.scheduler.add(self.clock_service)
+        self.scheduler.add(self.timer_service)
+        self.bind("<<TimersChanged>>", self.scheduler.wake)
+
+        # Writes from other windows / cli.py / server.py show up within a second.
+        self.change_watcher = ChangeWatcher(self.db, self.task_view)
+        self.scheduler.add(self.change_watcher)
+
+        self.debug_overlay = DebugOverlay(self.status_bar, trace)
+        self.scheduler.add(self.debug_overlay)
+        self.bind("<F12>", self._toggle_debug)
+        if debug:
+            self._toggle_debug()
 
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
+        # Nothing is queried until the window is on screen.
+        self._mapped = False
+        self.bind("<Map>", self._on_map, add="+")
+
     def _create_layout(self):
         self.week_view = WeekView(self, self.db)
         self.week_view.pack(side=tk.TOP, fill=tk.X, padx=10, pady=10)
@@ -140,10 +176,41 @@ class PlannerApp(tk.Tk):
         self.status_bar = StatusBar(self)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+    # ------------------------------------------------------------------
+    # Startup: window first, then the selected day, then the visible list
+    # ------------------------------------------------------------------
+
+    def _on_map(self, event):
+        if event.widget is not self or self._mapped:
+            return
+        self._mapped = True
+        # Drawing happens in idle handlers; count the paint once they ran.
+        self.after_idle(self._first_paint)
+
+    def _startup_step(self, name: str):
+        ms = (time.perf_counter() - self._started) * 1000
+        self.startup[name] = round(ms, 1)
+        metrics.UI.record(f"startup.{name}", ms)
+
+    def _first_paint(self):
+        self._startup_step("first_paint")
+        self.task_view.update_day(
+            self.week_view.get_selected_date(), then=self._day_shown
+        )
+        # Queued behind the selected day: the badges can wait for its tasks.
+        self.week_view.refresh_counts()
+
+    def _day_shown(self):
+        self._startup_step("day_shown")
+        self.task_view.refresh_visible_list(then=self._interactive)
+
+    def _interactive(self):
+        self._startup_step("interactive")
+        self.event_generate("<<StartupDone>>", when="tail")
+
     def _on_close(self):
         try:
-            self.timer_service.stop()
-            self.clock_service.stop()
+            self.scheduler.stop()
         except Exception:
             pass
 
@@ -152,4 +219,17 @@ class PlannerApp(tk.Tk):
         except Exception:
             pass
 
+        if self.log_dir:
+            try:
+                sections = {"ui": metrics.UI.snapshot()}
+                if self.trace is not None:
+                    sections["sql"] = self.trace.snapshot()
+                metrics.dump(self.log_dir, **sections)
+            except Exception as exc:
+                print(f"Could not write timings: {exc}", file=sys.stderr)
+
         self.destroy()
+
+    def _toggle_debug(self, event=None):
+        self.debug_overlay.toggle()
+        self.scheduler.wake()
@@ -2,8 +2,9 @@ import tkinter as tk
 from tkinter import ttk
 from datetime import date, timedelta
 
-from time_utils import format_date_pretty, get_now
-from .calendar_view import CalendarPopup
+from metrics import UI
+from time_utils import format_date_pretty, format_duration, get_now
+from .day_counts import DayCountsCache
 
 
 class WeekView(ttk.Frame):
@@ -14,6 +15,11 @@ class WeekView(ttk.Frame):
     - today
     - calendar popup
     - exit button
+
+    Day buttons carry the day's open/done counts and tracked time. Counts
+    are fetched a week at a time (one GROUP BY query) and the weeks either
+    side of the visible one are prefetched, so paging paints from cache.
+    The cache is shared with the calendar popup.
     """
 
     def __init__(self, master, db):
@@ -26,8 +32,11 @@ class WeekView(ttk.Frame):
         self.week_start: date = today - timedelta(days=today.weekday())
         self.selected_date: date = today
 
+        self.counts = DayCountsCache(db)
+
         self._build_ui()
-        self._refresh()
+        # Counts are fetched after the first paint (PlannerApp._first_paint).
+        self._refresh(load_counts=False)
 
     def _build_ui(self):
         ctrl_frame = ttk.Frame(self, style="Top.TFrame")
@@ -79,7 +88,7 @@ class WeekView(ttk.Frame):
             btn.grid(row=0, column=i, padx=3, pady=3)
             self.day_buttons.append(btn)
 
-    def _refresh(self):
+    def _refresh(self, load_counts: bool = True):
         start = self.week_start
         end = start + timedelta(days=6)
 
@@ -87,19 +96,63 @@ class WeekView(ttk.Frame):
             text=f"{format_date_pretty(start)}  -  {format_date_pretty(end)}"
         )
 
+        self._paint_days()
+        if load_counts:
+            self._load_counts()
+
+        if hasattr(self.master, "task_view"):
+            self.master.task_view.update_day(self.selected_date)
+
+    def _paint_days(self):
         names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        counts = self.counts.get(self.week_start, self.week_start + timedelta(days=6))
 
         for i, btn in enumerate(self.day_buttons):
-            d = start + timedelta(days=i)
-            text = f"{names[i]}\n{d.strftime('%d.%m')}"
+            d = self.week_start + timedelta(days=i)
+            text = f"{names[i]} {d.strftime('%d.%m')}\n{self._badge(counts, d)}"
 
             if d == self.selected_date:
                 btn.config(text=text, style="Selected.TButton")
             else:
                 btn.config(text=text, style="TButton")
 
-        if hasattr(self.master, "task_view"):
-            self.master.task_view.update_day(self.selected_date)
+    @staticmethod
+    def _badge(counts, d: date) -> str:
+        """Second and third line of a day button ("" while counts load)."""
+        if counts is None:
+            return "\n"
+        c = counts.get(d)
+        if c is None:
+            return "-\n"
+        time_text = format_duration(c.seconds)[:-3] if c.seconds else ""
+        return f"○ {c.open}  ✓ {c.done}\n{time_text}"
+
+    # ------------------------------------------------------------------
+    # Per-day counts
+    # ------------------------------------------------------------------
+
+    def _load_counts(self):
+        """The visible week first, then the weeks either side."""
+        for offset in (0, -7, 7):
+            week_start = self.week_start + timedelta(days=offset)
+            self.counts.load(
+                week_start,
+                week_start + timedelta(days=6),
+                lambda _, w=week_start: self._counts_arrived(w),
+            )
+
+    def _counts_arrived(self, week_start: date):
+        if week_start == self.week_start:
+            self._paint_days()
+
+    def refresh_counts(self, days=None):
+        """
+        Tasks changed (on `days`, or anywhere): fetch the affected counts
+        again; old ones stay on screen meanwhile. Also the first fetch,
+        once the window is on screen.
+        """
+        self.counts.invalidate(days)
+        self._load_counts()
 
     def get_selected_date(self) -> date:
         return self.selected_date
@@ -110,8 +163,10 @@ class WeekView(ttk.Frame):
         self._refresh()
 
     def _select_day(self, idx: int):
-        self.selected_date = self.week_start + timedelta(days=idx)
-        self._refresh()
+        # Until the load is queued; the load itself is "load_tasks".
+        with UI.timer("select_day"):
+            self.selected_date = self.week_start + timedelta(days=idx)
+            self._refresh()
 
     def prev_week(self):
         self.week_start -= timedelta(days=7)
@@ -126,6 +181,8 @@ class WeekView(ttk.Frame):
         self.set_date(today)
 
     def open_calendar(self):
+        from .calendar_view import CalendarPopup  # loaded on first use
+
         CalendarPopup(self.master, self)
 
     def _exit_app(self):
@@ -0,0 +1,96 @@
+"""
+Query plans and timings for the day view and global lists, before and
+after the index migration.
+
+    python benchmarks/bench_indexes.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+
+
+TODAY = date(2025, 6, 1)
+
+QUERIES = {
+    "get_tasks_by_date": (
+        "SELECT * FROM tasks WHERE task_date=? ORDER BY sort_order, id",
+        (TODAY.isoformat(),),
+    ),
+    "get_upcoming_todos": (
+        "SELECT * FROM tasks WHERE status='Not done' AND task_date >= ? "
+        "ORDER BY task_date, sort_order, id",
+        (TODAY.isoformat(),),
+    ),
+    "get_overdue_tasks": (
+        "SELECT * FROM tasks WHERE status='Not done' AND task_date < ? "
+        "ORDER BY task_date DESC, sort_order, id",
+        (TODAY.isoformat(),),
+    ),
+    "get_completed_tasks": (
+        "SELECT * FROM tasks WHERE status='Done' "
+        "ORDER BY task_date DESC, sort_order, id",
+        (),
+    ),
+}
+
+
+def fill(conn: sqlite3.Connection, rows: int, years: int = 5):
+    rnd = random.Random(42)
+    first = TODAY - timedelta(days=365 * years)
+    span = 365 * years + 30
+    orders = {}
+    batch = []
+    for i in range(rows):
+        day = (first + timedelta(days=rnd.randrange(span))).isoformat()
+        order = orders.get(day, 0)
+        orders[day] = order + 1
+        status = "Done" if day < TODAY.isoformat() and rnd.random() < 0.9 else "Not done"
+        batch.append((f"Task {i}", "", day, status, rnd.randrange(7200), order))
+    conn.executemany(
+        "INSERT INTO tasks (title, description, task_date, status, "
+        "total_seconds, sort_order) VALUES (?, ?, ?, ?, ?, ?)",
+        batch,
+    )
+    conn.commit()
+
+
+def report(conn: sqlite3.Connection, label: str, repeat: int):
+    print(f"\n== {label} ==")
+    for name, (sql, params) in QUERIES.items():
+        plan = [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        ms = (time.perf_counter() - t0) * 1000 / repeat
+        print(f"{name:22s} {ms:9.2f} ms   {' | '.join(plan)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        migrate(conn, target=1)
+        fill(conn, args.rows)
+        report(conn, f"schema v1, {args.rows} rows", args.repeat)
+
+        migrate(conn)
+        report(conn, f"schema v{conn.execute('PRAGMA user_version').fetchone()[0]}, "
+                     f"{args.rows} rows", args.repeat)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
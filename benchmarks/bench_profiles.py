@@ -0,0 +1,100 @@
+"""
+Commit latency of every mutating Database method under each connection
+profile (database.PROFILES).
+
+    python benchmarks/bench_profiles.py --dir /mnt/shared/tmp --ops 200
+
+Point --dir at the volume the real tasks.db lives on; fsync cost is what
+separates the profiles, and it depends entirely on the disk.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import PROFILES, Database  # noqa: E402
+
+DAY = date(2025, 6, 1)
+
+
+def seed(db: Database, rows: int):
+    with db.transaction():
+        for i in range(rows):
+            db.add_task(f"Seed {i}", "", DAY + timedelta(days=i % 30))
+
+
+def bench_profile(path: str, profile_name: str, ops: int):
+    db = Database(path, profile=PROFILES[profile_name])
+    seed(db, 1_000)
+    ids = [t.id for t in db.get_tasks_by_date(DAY)]
+    now = datetime(2025, 6, 1, 9)
+
+    def move(i):
+        # Neighbours as the day is ordered now (set_task_order shuffled it).
+        order = [t.id for t in db.get_tasks_by_date(DAY) if t.id != ids[0]]
+        k = 1 + i % 10
+        db.move_task(ids[0], order[k - 1], order[k])
+
+    steps = {
+        "add_task": lambda i: db.add_task(f"Task {i}", "desc", DAY),
+        "set_task_status": lambda i: db.set_task_status(
+            ids[i % len(ids)], "Done" if i % 2 else "Not done"
+        ),
+        "start_timer": lambda i: db.start_timer(ids[i % len(ids)], now),
+        "stop_timer": lambda i: db.stop_timer(ids[i % len(ids)], now + timedelta(minutes=5)),
+        "update_task_title_desc": lambda i: db.update_task_title_desc(
+            ids[i % len(ids)], f"Renamed {i}", "desc"
+        ),
+        "set_task_order": lambda i: db.set_task_order(ids[i % len(ids)], i),
+        "move_task": move,
+        "reorder_tasks": lambda i: db.reorder_tasks(DAY, ids[i % 3:] + ids[:i % 3]),
+        "delete_task": lambda i: db.delete_task(db.add_task("tmp", "", DAY)),
+    }
+
+    results = {}
+    for name, step in steps.items():
+        samples = []
+        for i in range(ops):
+            t0 = time.perf_counter()
+            step(i)
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        results[name] = (
+            statistics.mean(samples),
+            samples[int(len(samples) * 0.95) - 1],
+        )
+    db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", default=None, help="directory for the test DBs")
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        table = {}
+        for name in args.profiles:
+            table[name] = bench_profile(
+                os.path.join(tmp, f"{name}.db"), name, args.ops
+            )
+
+    methods = list(next(iter(table.values())))
+    header = "".join(f"{p + ' mean/p95':>24s}" for p in args.profiles)
+    print(f"{'ms per call':28s}{header}")
+    for m in methods:
+        cells = "".join(
+            f"{table[p][m][0]:>13.3f} /{table[p][m][1]:>8.3f}" for p in args.profiles
+        )
+        print(f"{m:28s}{cells}")
+
+
+if __name__ == "__main__":
+    main()
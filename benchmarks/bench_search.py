@@ -0,0 +1,79 @@
+"""
+Full-text search latency (Database.search) on a synthetic database.
+
+    python benchmarks/bench_search.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, _fts_query  # noqa: E402
+
+BASE_WORDS = (
+    "report meeting invoice review draft call email plan budget design "
+    "release backup deploy client sprint refactor docs bug fix groceries "
+    "gym dentist travel taxes garden homework reading laundry birthday"
+).split()
+
+
+def vocabulary(rnd: random.Random, size: int = 5000):
+    """Common base words plus made-up ones, with Zipf-like frequencies."""
+    words = list(BASE_WORDS)
+    while len(words) < size:
+        words.append("".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=rnd.randrange(4, 10))))
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+QUERIES = ["report", "inv", "client call", "dentist", "refactor docs", "zzz"]
+
+
+def fill(db: Database, rows: int):
+    rnd = random.Random(7)
+    words, weights = vocabulary(rnd)
+    first = date(2020, 1, 1)
+    with db.transaction():
+        for i in range(rows):
+            title = " ".join(rnd.choices(words, weights, k=3))
+            desc = " ".join(rnd.choices(words, weights, k=rnd.randrange(0, 12)))
+            db.add_task(title, desc, first + timedelta(days=rnd.randrange(2000)))
+            if i % 20 == 0:
+                db.save_note(i + 1, " ".join(rnd.choices(words, weights, k=200)))
+
+
+def match_count(db: Database, q: str) -> int:
+    return db.conn.execute(
+        "SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH ?", (_fts_query(q),)
+    ).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "tasks.db"))
+        fill(db, args.rows)
+        print(f"{'query':16s} {'matches':>8s} {'shown':>6s} {'median ms':>10s}")
+        for q in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                hits = db.search(q)
+                samples.append((time.perf_counter() - t0) * 1000)
+            print(f"{q:16s} {match_count(db, q):8d} {len(hits):6d} "
+                  f"{statistics.median(samples):10.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Load test of server.py: starts a local instance on a generated database and
+drives it from keep-alive connections with a mix of day lists, single
+tasks, week counts and status writes. Prints requests per second and
+per-route latency.
+
+    python benchmarks/bench_server.py --rows 100000 --clients 16 --seconds 10
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765 --rows 0
+
+With --url an already running server is measured instead (its database
+must have tasks; --rows 0 skips generating one).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datagen import generate  # noqa: E402
+
+# (route name, weight); see Client.request_for().
+MIX = (
+    ("GET day", 60),
+    ("GET task", 20),
+    ("GET counts", 10),
+    ("PATCH status", 10),
+)
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                parts.append(chunk[:-2])
+            payload = b"".join(parts)
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _pick(rng: random.Random, days, ids):
+    route = rng.choices([r for r, _ in MIX], [w for _, w in MIX])[0]
+    if route == "GET day":
+        return route, "GET", f"/tasks?date={rng.choice(days)}", None
+    if route == "GET task":
+        return route, "GET", f"/tasks/{rng.choice(ids)}", None
+    if route == "GET counts":
+        monday = date.fromisoformat(rng.choice(days))
+        monday -= timedelta(days=monday.weekday())
+        sunday = monday + timedelta(days=6)
+        return route, "GET", f"/counts?from={monday}&to={sunday}", None
+    status = rng.choice(("Done", "Not done"))
+    return route, "PATCH", f"/tasks/{rng.choice(ids)}", {"status": status}
+
+
+async def _worker(client: Client, seed: int, days, ids, deadline: float, timings):
+    rng = random.Random(seed)
+    await client.connect()
+    try:
+        while time.perf_counter() < deadline:
+            route, method, path, body = _pick(rng, days, ids)
+            t0 = time.perf_counter()
+            status, _ = await client.request(method, path, body)
+            timings[route].append(time.perf_counter() - t0)
+            if status >= 500:
+                timings["errors"].append(0.0)
+    finally:
+        client.close()
+
+
+async def _sample(host: str, port: int):
+    """Days and ids that exist, read through the API itself."""
+    client = Client(host, port)
+    await client.connect()
+    try:
+        _, body = await client.request("GET", "/tasks?from=2000-01-01&to=2100-12-31")
+    finally:
+        client.close()
+    tasks = json.loads(body)
+    if not tasks:
+        raise SystemExit("the database has no tasks to request")
+    return sorted({t["task_date"] for t in tasks}), [t["id"] for t in tasks]
+
+
+async def run_load(host: str, port: int, clients: int, seconds: float):
+    days, ids = await _sample(host, port)
+    timings = defaultdict(list)
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(Client(host, port), seed, days, ids, deadline, timings)
+        for seed in range(clients)
+    ))
+    return timings, time.perf_counter() - t0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(host: str, port: int, timeout: float = 30.0):
+    stop = time.monotonic() + timeout
+    while time.monotonic() < stop:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"server on {host}:{port} did not come up")
+
+
+def report(timings, elapsed: float):
+    errors = len(timings.pop("errors", []))
+    total = sum(len(v) for v in timings.values())
+    print(f"{total} requests in {elapsed:.1f}s: {total / elapsed:,.0f} req/s, {errors} errors")
+    print(f"{'route':16s}{'count':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for route, _ in MIX:
+        xs = sorted(timings.get(route, []))
+        if not xs:
+            continue
+        p95 = xs[min(len(xs) - 1, int(len(xs) * 0.95))]
+        print(
+            f"{route:16s}{len(xs):>8}{statistics.median(xs) * 1000:>9.2f}"
+            f"{p95 * 1000:>9.2f}{xs[-1] * 1000:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profile", default="wal")
+    parser.add_argument("--url", help="measure a running server instead")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        timings, elapsed = asyncio.run(
+            run_load(url.hostname, url.port or 80, args.clients, args.seconds)
+        )
+        report(timings, elapsed)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.db")
+        generate(path, args.rows)
+        port = _free_port()
+        env = dict(os.environ, PLANNER_DB_PROFILE=args.profile)
+        server = subprocess.Popen(
+            [sys.executable, "server.py", "--db", path, "--port", str(port),
+             "--readers", str(args.readers)],
+            cwd=ROOT, env=env, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for("127.0.0.1", port)
+            timings, elapsed = asyncio.run(
+                run_load("127.0.0.1", port, args.clients, args.seconds)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+    report(timings, elapsed)
+
+
+if __name__ == "__main__":
+    main()
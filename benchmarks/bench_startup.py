@@ -0,0 +1,111 @@
+"""
+Cold-start timings of the app: module import, time to first paint (window
+on screen), to the selected day's tasks, and to interactive (the visible
+global list loaded), each from process start.
+
+    python benchmarks/bench_startup.py --rows 100000 --runs 5
+
+The window steps need a display; without one only the import is timed.
+Also checks that modules meant to load on first use (dialogs, calendar,
+reports) are not imported at startup, and that cli.py pulls in neither
+tkinter nor the app package.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datagen import generate  # noqa: E402
+
+# Must not be imported by `import main`.
+LAZY_MODULES = (
+    "app.calendar_view",
+    "tkinter.messagebox",
+    "tkinter.simpledialog",
+    "reports",
+    "numpy",
+)
+
+_IMPORT_PROBE = f"""
+import sys, time, json
+t0 = time.perf_counter()
+import main
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"import_ms": ms,
+                  "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+# Must not be imported by `import cli`.
+CLI_FORBIDDEN = ("tkinter", "_tkinter", "app")
+
+_CLI_PROBE = f"""
+import sys, time, json
+t0 = time.perf_counter()
+import cli
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"import_ms": ms,
+                  "loaded": [m for m in {CLI_FORBIDDEN!r} if m in sys.modules]}}))
+"""
+
+
+def _python(args, env=None):
+    out = subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True, timeout=120,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def has_display() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", default="wal")
+    args = parser.parse_args()
+
+    imports = [_python(["-c", _IMPORT_PROBE]) for _ in range(args.runs)]
+    loaded = sorted({m for r in imports for m in r["loaded"]})
+    print(f"import main            {statistics.median(r['import_ms'] for r in imports):8.1f} ms")
+    if loaded:
+        print(f"loaded at startup, should be lazy: {', '.join(loaded)}")
+
+    cli = [_python(["-c", _CLI_PROBE]) for _ in range(args.runs)]
+    cli_loaded = sorted({m for r in cli for m in r["loaded"]})
+    print(f"import cli             {statistics.median(r['import_ms'] for r in cli):8.1f} ms")
+    if cli_loaded:
+        print(f"loaded by cli.py, must not be: {', '.join(cli_loaded)}")
+    loaded += cli_loaded
+
+    if not has_display():
+        print("no display: window timings skipped")
+        return 1 if loaded else 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.db")
+        generate(path, args.rows)
+        env = dict(
+            os.environ,
+            PLANNER_DB=path,
+            PLANNER_DB_PROFILE=args.profile,
+            PLANNER_STARTUP_PROBE="1",
+        )
+        runs = [_python(["main.py"], env=env) for _ in range(args.runs)]
+
+    for step in ("first_paint", "day_shown", "interactive"):
+        print(f"{step:22s}{statistics.median(r[step] for r in runs):8.1f} ms")
+    return 1 if loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
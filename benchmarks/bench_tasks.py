@@ -0,0 +1,125 @@
+"""
+Memory and throughput of loading Task objects: the old mapping (sqlite3.Row,
+a dataclass with a __dict__, the date parsed per row, SELECT *) against the
+slotted Task built from tuples, with and without the description column.
+
+    python benchmarks/bench_tasks.py --rows 1000000
+    python benchmarks/bench_tasks.py --db existing.db
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from itertools import starmap
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import LIST_COLUMNS, TASK_COLUMNS  # noqa: E402
+from datagen import generate  # noqa: E402
+from models import Task  # noqa: E402
+
+
+@dataclass
+class DictTask:
+    """models.Task as it was before __slots__."""
+
+    id: int
+    title: str
+    description: Optional[str]
+    task_date: date
+    status: str
+    total_seconds: Optional[int]
+    active_timer_start: Optional[str]
+    sort_order: int
+
+
+def load_legacy(conn: sqlite3.Connection):
+    conn.row_factory = sqlite3.Row
+    try:
+        return [
+            DictTask(
+                id=row["id"],
+                title=row["title"],
+                description=row["description"],
+                task_date=date.fromisoformat(row["task_date"]),
+                status=row["status"],
+                total_seconds=row["total_seconds"],
+                active_timer_start=row["active_timer_start"],
+                sort_order=row["sort_order"] or 0,
+            )
+            for row in conn.execute("SELECT * FROM tasks").fetchall()
+        ]
+    finally:
+        conn.row_factory = None
+
+
+def load_compact(conn: sqlite3.Connection):
+    return list(starmap(Task, conn.execute(f"SELECT {TASK_COLUMNS} FROM tasks")))
+
+
+def load_list(conn: sqlite3.Connection):
+    return list(starmap(Task, conn.execute(f"SELECT {LIST_COLUMNS} FROM tasks")))
+
+
+LOADERS = {
+    "legacy (Row + dataclass)": load_legacy,
+    "compact (tuple + slots)": load_compact,
+    "compact, list columns": load_list,
+}
+
+
+def measure(conn: sqlite3.Connection, load, repeat: int):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        tasks = load(conn)
+        times.append(time.perf_counter() - t0)
+        del tasks
+
+    # Memory held by the loaded list (what a cache or a view keeps alive).
+    gc.collect()
+    tracemalloc.start()
+    tasks = load(conn)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tasks), min(times), held, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", help="existing database instead of generating one")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db
+        if path is None:
+            path = os.path.join(tmp, "tasks.db")
+            t0 = time.perf_counter()
+            generate(path, args.rows)
+            print(f"generated {args.rows} tasks in {time.perf_counter() - t0:.1f}s")
+        conn = sqlite3.connect(path)
+        try:
+            print(f"{'':28s}{'rows':>9}{'load s':>9}{'rows/s':>11}{'held MB':>9}"
+                  f"{'B/row':>7}{'peak MB':>9}")
+            for name, load in LOADERS.items():
+                n, secs, held, peak = measure(conn, load, args.repeat)
+                print(
+                    f"{name:28s}{n:>9}{secs:>9.2f}{n / secs:>11,.0f}"
+                    f"{held / 2**20:>9.1f}{held / max(n, 1):>7.0f}{peak / 2**20:>9.1f}"
+                )
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
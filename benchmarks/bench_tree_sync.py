@@ -0,0 +1,99 @@
+"""
+Full Treeview rebuild versus keyed reconciliation (app.tree_sync.TreeSync).
+
+    python benchmarks/bench_tree_sync.py            # headless FakeTree
+    python benchmarks/bench_tree_sync.py --tk       # real ttk.Treeview
+
+Scenarios per size: an unchanged refresh, one status change, and one row
+dragged from the top to the bottom.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from app.tree_sync import TreeSync  # noqa: E402
+from fake_tree import FakeTree  # noqa: E402
+
+COLUMNS = ("title", "description", "status", "duration")
+
+
+def make_rows(n):
+    return [
+        (i, (f"Task {i}", f"Description {i}", "Not done", "00:00:00"))
+        for i in range(n)
+    ]
+
+
+def scenarios(n):
+    base = make_rows(n)
+    status = list(base)
+    k = n // 2
+    status[k] = (k, status[k][1][:2] + ("Done",) + status[k][1][3:])
+    moved = base[1:] + base[:1]
+    return base, [("unchanged", base), ("one status", status), ("one move", moved)]
+
+
+def full_rebuild(tree, rows):
+    tree.delete(*tree.get_children())
+    for _, values in rows:
+        tree.insert("", "end", values=values)
+
+
+def new_tree(use_tk):
+    if not use_tk:
+        return FakeTree(COLUMNS)
+    from tkinter import ttk
+    return ttk.Treeview(columns=COLUMNS, show="headings")
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def run(n, use_tk):
+    base, cases = scenarios(n)
+    print(f"\n== {n} rows ({'Tk' if use_tk else 'FakeTree'}) ==")
+    print(f"{'scenario':12s} {'rebuild ms':>11s} {'calls':>7s} {'sync ms':>9s} {'calls':>7s}")
+    for name, rows in cases:
+        rebuild_tree = new_tree(use_tk)
+        full_rebuild(rebuild_tree, base)
+        if not use_tk:
+            rebuild_tree.calls.clear()
+        t_rebuild = timed(lambda: full_rebuild(rebuild_tree, rows))
+        rebuild_calls = sum(rebuild_tree.calls.values()) if not use_tk else "-"
+
+        sync_tree = new_tree(use_tk)
+        sync = TreeSync(sync_tree)
+        sync.sync(base)
+        if not use_tk:
+            sync_tree.calls.clear()
+        t_sync = timed(lambda: sync.sync(rows))
+        calls = sum(sync_tree.calls.values()) if not use_tk else "-"
+        print(f"{name:12s} {t_rebuild:11.2f} {rebuild_calls!s:>7s} "
+              f"{t_sync:9.2f} {calls!s:>7s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--tk", action="store_true", help="use a real Treeview")
+    args = parser.parse_args()
+
+    if args.tk:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+
+    for n in args.sizes:
+        run(n, args.tk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Deterministic synthetic planner data.
+
+    python benchmarks/datagen.py /tmp/tasks.db --rows 100000 --seed 1
+
+The same --rows/--seed/--years always yields the same tasks. Tasks are
+spread over `years` years ending a few months after TODAY, with the
+shapes a real planner has: most past tasks done, a tail of overdue ones,
+a sparse future; many tasks without a description; tracked time roughly
+log-normal; a handful of running timers today; notes on a few tasks.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import Database  # noqa: E402
+from task_io import import_tasks  # noqa: E402
+
+# Fixed "today" so generated datasets (and what counts as overdue in them)
+# do not depend on when the benchmark runs.
+TODAY = date(2025, 6, 1)
+FUTURE_DAYS = 120
+RUNNING_TIMERS = 3  # open tasks on TODAY whose timer is running
+
+_WORDS = (
+    "review report meeting call email plan draft fix update write read "
+    "budget client design test deploy invoice order gym groceries doctor "
+    "backup refactor sprint retro notes slides paper chapter exam lab "
+    "project team weekly monthly quarterly release docs bug feature"
+).split()
+
+
+def _zipf_weights(n: int):
+    return [1 / (i + 1) for i in range(n)]
+
+
+def records(rows: int, seed: int = 0, years: int = 3) -> Iterator[Dict[str, object]]:
+    """`rows` task records for task_io.import_tasks, in a fixed order."""
+    rnd = random.Random(seed)
+    weights = _zipf_weights(len(_WORDS))
+    first = TODAY - timedelta(days=365 * years - FUTURE_DAYS)
+    span = (TODAY - first).days + FUTURE_DAYS
+    now = datetime.combine(TODAY, datetime.min.time()) + timedelta(hours=10)
+    running = 0
+
+    for i in range(rows):
+        # Busier recently: skew the day towards the end of the range.
+        day = first + timedelta(days=int(span * rnd.random() ** 0.7))
+        past = day < TODAY
+
+        if past:
+            status = "Done" if rnd.random() < 0.85 else "Not done"
+        else:
+            status = "Done" if rnd.random() < 0.05 else "Not done"
+
+        words = rnd.choices(_WORDS, weights, k=rnd.randint(1, 4))
+        title = " ".join(words).capitalize()
+
+        r = rnd.random()
+        if r < 0.45:
+            desc = ""
+        else:
+            k = 3 if r < 0.85 else rnd.randint(10, 60)
+            desc = " ".join(rnd.choices(_WORDS, weights, k=k))
+
+        if status == "Done" or (past and rnd.random() < 0.3):
+            seconds = int(rnd.lognormvariate(math.log(1500), 1.0))
+        else:
+            seconds = 0
+
+        timer = None
+        if day == TODAY and status == "Not done" and running < RUNNING_TIMERS:
+            running += 1
+            started = now - timedelta(seconds=rnd.randint(60, 7200))
+            timer = started.isoformat(timespec="seconds")
+
+        note = ""
+        if rnd.random() < 0.05:
+            note = "\n".join(
+                " ".join(rnd.choices(_WORDS, weights, k=12))
+                for _ in range(rnd.randint(1, 40))
+            )
+
+        yield {
+            "title": f"{title} {i}",
+            "description": desc,
+            "task_date": day.isoformat(),
+            "status": status,
+            "total_seconds": seconds,
+            "active_timer_start": timer,
+            "notes": note,
+        }
+
+
+def generate(path: str, rows: int, seed: int = 0, years: int = 3) -> str:
+    """Create (or extend) the database at `path` with generated tasks."""
+    db = Database(path, cache_size=0)
+    try:
+        import_tasks(db, records(rows, seed, years))
+        db.conn.execute("ANALYZE")
+        db.conn.commit()
+    finally:
+        db.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        parser.error(f"{args.path} exists; generate into a new file")
+    generate(args.path, args.rows, args.seed, args.years)
+    print(f"{args.rows} tasks written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Headless stand-in for a flat ttk.Treeview.
+
+Implements the subset of the widget API the views use, with list-based
+ordering like Tk's own sibling list, and counts every call so a benchmark
+can report how much work would have reached Tk.
+"""
+from collections import Counter
+from itertools import count
+
+
+class FakeTree:
+    def __init__(
+        self, columns=("title", "description", "status", "duration"), master=None
+    ):
+        self.master = master  # a notebook tab's name, for TaskView's tab lookup
+        self._columns = tuple(columns)
+        self._children = []
+        self._values = {}
+        self._ids = count(1)
+        self.calls = Counter()
+
+    def __getitem__(self, option):
+        if option == "columns":
+            return self._columns
+        raise KeyError(option)
+
+    def get_children(self, item=""):
+        self.calls["get_children"] += 1
+        return tuple(self._children)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls["insert"] += 1
+        iid = iid or f"I{next(self._ids):06X}"
+        if index == "end":
+            index = len(self._children)
+        self._children.insert(index, iid)
+        self._values[iid] = list(values)
+        return iid
+
+    def delete(self, *items):
+        self.calls["delete"] += 1
+        gone = set(items)
+        self._children = [i for i in self._children if i not in gone]
+        for i in items:
+            del self._values[i]
+
+    def move(self, item, parent, index):
+        self.calls["move"] += 1
+        if item in self._children:
+            self._children.remove(item)
+        self._children.insert(index, item)
+
+    def detach(self, *items):
+        self.calls["detach"] += 1
+        for item in items:
+            self._children.remove(item)
+
+    def index(self, item):
+        self.calls["index"] += 1
+        return self._children.index(item)
+
+    def set(self, item, column=None, value=None):
+        self.calls["set"] += 1
+        self._values[item][self._columns.index(column)] = value
+
+    def item(self, item, option=None, **kw):
+        self.calls["item"] += 1
+        if "values" in kw:
+            self._values[item] = list(kw["values"])
+        return {"values": self._values[item]}
+
+    def prev(self, item):
+        i = self._children.index(item)
+        return self._children[i - 1] if i > 0 else ""
+
+    def next(self, item):
+        i = self._children.index(item)
+        return self._children[i + 1] if i + 1 < len(self._children) else ""
+
+    def configure(self, **kw):
+        self.calls["configure"] += 1
+
+    def after_idle(self, func, *args):
+        func(*args)
+
+    def yview_scroll(self, number, what):
+        self.calls["yview_scroll"] += 1
+
+    def values(self):
+        """Rows in display order, for assertions."""
+        return [tuple(self._values[i]) for i in self._children]
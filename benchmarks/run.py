@@ -0,0 +1,699 @@
+"""
+Benchmark suite: every Database method, the task view's list logic on a
+headless tree, startup migrations and reordering, over a generated
+dataset (see datagen.py).
+
+    python benchmarks/run.py --rows 100000 --save benchmarks/baseline.json
+    python benchmarks/run.py --rows 100000 --compare benchmarks/baseline.json
+
+--compare exits with status 1 when a case's median is slower than the
+baseline by more than its threshold (baseline "thresholds", by case name
+or "default"). --save keeps the thresholds of an existing baseline file.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, time as dtime, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from database import PROFILES, Database  # noqa: E402
+from datagen import TODAY, generate  # noqa: E402
+from fake_tree import FakeTree  # noqa: E402
+from migrations import migrate  # noqa: E402
+from models import Changes  # noqa: E402
+from reports import build_report  # noqa: E402
+
+DEFAULT_THRESHOLD = 0.5   # 50% slower than baseline counts as a regression
+MIN_DELTA_MS = 0.25       # ...and by more than run-to-run noise
+
+# Methods that are plumbing rather than something to time.
+NOT_TIMED = {"close", "transaction", "savepoint"}
+
+CASES: Dict[str, Callable] = {}
+
+
+def case(name: str, runs: int = 50):
+    """
+    Register a benchmark; fn(ctx) returns step(i), (setup(i), step(i)) or
+    (setup(i), step(i), teardown()) – teardown undoes what the case left
+    in the database, so later cases time the same data.
+    """
+    def register(fn):
+        fn.runs = runs
+        CASES[name] = fn
+        return fn
+    return register
+
+
+# ----------------------------------------------------------------------
+# Headless view plumbing
+# ----------------------------------------------------------------------
+
+class SyncDatabase:
+    """AsyncDatabase stand-in that runs every call inline."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def call(self, method, *args, callback=None, errback=None, **kwargs):
+        self.submit(lambda db: getattr(db, method)(*args, **kwargs), callback)
+
+    read = query = call
+
+    def submit(self, fn, callback=None, errback=None, worker=None, writes=True):
+        result = fn(self.db)
+        if callback is not None:
+            callback(result)
+
+    submit_read = submit
+
+
+class FakeWeekView:
+    def __init__(self, day):
+        self.day = day
+
+    def get_selected_date(self):
+        return self.day
+
+    def refresh_counts(self, days=None):
+        pass
+
+
+def headless_task_view(db: Database, day):
+    """A TaskView whose trees are FakeTrees; no Tk root is created."""
+    from app import task_view
+
+    now = datetime.combine(TODAY, dtime(10))
+    task_view.get_now = lambda: now
+
+    view = task_view.TaskView.__new__(task_view.TaskView)
+    view.db = SyncDatabase(db)
+    view.week_view = FakeWeekView(day)
+    view.tasks_by_item = {}
+    view.running_tasks = {}
+    view.event_generate = lambda *args, **kwargs: None
+
+    view.tree = FakeTree()
+    view.rows = task_view.TreeSync(view.tree)
+    view.tree_todo = FakeTree(("title", "date", "duration"), master="todo")
+    view.tree_done = FakeTree(("title", "date", "duration"), master="done")
+    view.tree_over = FakeTree(("title", "date", "duration"), master="over")
+    view._build_summary_lists()
+    view._visible_list = lambda: view.list_todo  # the To-do tab is showing
+    view._reports_visible = lambda: False
+    return view
+
+
+# ----------------------------------------------------------------------
+# Context
+# ----------------------------------------------------------------------
+
+class Context:
+    def __init__(self, path: str, profile: str):
+        self.path = path
+        self.profile = PROFILES[profile]
+        self.db = Database(path, cache_size=0, profile=self.profile)
+        self.cached_db = Database(path, profile=self.profile)
+
+        busiest = self.db.conn.execute(
+            "SELECT task_date FROM tasks GROUP BY task_date "
+            "ORDER BY COUNT(*) DESC, task_date LIMIT 2"
+        ).fetchall()
+        self.busy_day = datetime.strptime(busiest[0][0], "%Y-%m-%d").date()
+        self.other_day = datetime.strptime(busiest[-1][0], "%Y-%m-%d").date()
+        self.day_ids = [t.id for t in self.db.get_tasks_by_date(self.busy_day)]
+        self.ids = [
+            r[0] for r in self.db.conn.execute(
+                "SELECT id FROM tasks ORDER BY id LIMIT 1000"
+            )
+        ]
+        self.note_id = self.db.conn.execute(
+            "SELECT task_id FROM notes ORDER BY length(body) DESC LIMIT 1"
+        ).fetchone()[0]
+
+    def pick(self, i: int) -> int:
+        return self.ids[(i * 7919) % len(self.ids)]
+
+    def close(self):
+        self.db.close()
+        self.cached_db.close()
+
+
+# ----------------------------------------------------------------------
+# Startup
+# ----------------------------------------------------------------------
+
+@case("startup.import_main", runs=5)
+def _(ctx):
+    """A fresh interpreter importing main.py (no window; see bench_startup.py)."""
+    cmd = [sys.executable, "-c", "import main"]
+    return lambda i: subprocess.run(cmd, cwd=ROOT, check=True)
+
+
+@case("startup.cli_list", runs=5)
+def _(ctx):
+    """A fresh interpreter running `cli.py list` for the busiest day."""
+    cmd = [sys.executable, "cli.py", "--db", ctx.path, "list",
+           "--date", ctx.busy_day.isoformat()]
+    return lambda i: subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+
+@case("startup.open_current", runs=20)
+def _(ctx):
+    return lambda i: Database(ctx.path, profile=ctx.profile).close()
+
+
+@case("startup.migrate_legacy", runs=3)
+def _(ctx):
+    """Open a database still on the original schema (migration 1 only)."""
+    template = ctx.path + ".legacy"
+    if not os.path.exists(template):
+        conn = sqlite3.connect(template)
+        migrate(conn, target=1)
+        conn.execute("ATTACH DATABASE ? AS src", (ctx.path,))
+        conn.execute(
+            "INSERT INTO tasks (id, title, description, task_date, status, "
+            "total_seconds, active_timer_start, sort_order) "
+            "SELECT id, title, description, task_date, status, total_seconds, "
+            "active_timer_start, sort_order / 65536 FROM src.tasks"
+        )
+        conn.commit()
+        conn.close()
+    work = ctx.path + ".migrate"
+
+    def setup(i):
+        shutil.copyfile(template, work)
+
+    def step(i):
+        Database(work, profile=ctx.profile).close()
+
+    return setup, step
+
+
+# ----------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------
+
+@case("db.get_tasks_by_date")
+def _(ctx):
+    return lambda i: ctx.db.get_tasks_by_date(ctx.busy_day)
+
+
+@case("db.get_tasks_by_date.cached")
+def _(ctx):
+    return lambda i: ctx.cached_db.get_tasks_by_date(ctx.busy_day)
+
+
+@case("db.get_tasks_between", runs=20)
+def _(ctx):
+    """A month around the busiest day (what `cli.py list --from/--to` reads)."""
+    return lambda i: ctx.db.get_tasks_between(
+        ctx.busy_day - timedelta(days=15), ctx.busy_day + timedelta(days=15)
+    )
+
+
+@case("db.get_day_counts")
+def _(ctx):
+    """The week strip's badges for the busiest week."""
+    monday = ctx.busy_day - timedelta(days=ctx.busy_day.weekday())
+    return lambda i: ctx.db.get_day_counts(monday, monday + timedelta(days=6))
+
+
+@case("db.get_task")
+def _(ctx):
+    return lambda i: ctx.db.get_task(ctx.pick(i))
+
+
+@case("db.get_upcoming_todos", runs=10)
+def _(ctx):
+    return lambda i: ctx.db.get_upcoming_todos(TODAY)
+
+
+@case("db.get_overdue_tasks", runs=10)
+def _(ctx):
+    return lambda i: ctx.db.get_overdue_tasks(TODAY)
+
+
+@case("db.get_completed_tasks", runs=5)
+def _(ctx):
+    return lambda i: ctx.db.get_completed_tasks()
+
+
+@case("db.get_upcoming_todos_page")
+def _(ctx):
+    return lambda i: ctx.db.get_upcoming_todos_page(TODAY, limit=101)
+
+
+@case("db.get_overdue_tasks_page")
+def _(ctx):
+    return lambda i: ctx.db.get_overdue_tasks_page(TODAY, limit=101)
+
+
+@case("db.get_completed_tasks_page")
+def _(ctx):
+    return lambda i: ctx.db.get_completed_tasks_page(limit=101)
+
+
+@case("db.search")
+def _(ctx):
+    words = ["review", "client budget", "deploy rel", "groceries", "notes"]
+    return lambda i: ctx.db.search(words[i % len(words)])
+
+
+@case("db.get_note")
+def _(ctx):
+    return lambda i: ctx.db.get_note(ctx.note_id)
+
+
+@case("db.read_note_chunk")
+def _(ctx):
+    return lambda i: ctx.db.read_note_chunk(ctx.note_id, 0)
+
+
+@case("db.get_sessions")
+def _(ctx):
+    return lambda i: ctx.db.get_sessions(ctx.pick(i))
+
+
+@case("db.time_total")
+def _(ctx):
+    return lambda i: ctx.db.time_total(TODAY - timedelta(days=365), TODAY)
+
+
+@case("db.time_by_day")
+def _(ctx):
+    return lambda i: ctx.db.time_by_day(TODAY - timedelta(days=365), TODAY)
+
+
+@case("db.time_by_task")
+def _(ctx):
+    return lambda i: ctx.db.time_by_task(TODAY - timedelta(days=7), TODAY, limit=20)
+
+
+@case("db.iter_note_chunks")
+def _(ctx):
+    return lambda i: list(ctx.db.iter_note_chunks(ctx.note_id, 1024))
+
+
+@case("reports.year", runs=5)
+def _(ctx):
+    """The Reports tab's "This year" over the year ending TODAY."""
+    return lambda i: build_report(ctx.db, TODAY - timedelta(days=364), TODAY, TODAY)
+
+
+# ----------------------------------------------------------------------
+# Views (FakeTree)
+# ----------------------------------------------------------------------
+
+@case("view.load_tasks")
+def _(ctx):
+    """Switch between the two busiest days: a full day list every time."""
+    view = headless_task_view(ctx.db, ctx.busy_day)
+    days = (ctx.busy_day, ctx.other_day)
+
+    def step(i):
+        view.week_view.day = days[i % 2]
+        view._load_tasks()
+
+    return step
+
+
+@case("view.reload_same_day")
+def _(ctx):
+    view = headless_task_view(ctx.db, ctx.busy_day)
+    view._load_tasks()
+    return lambda i: view._load_tasks()
+
+
+@case("view.refresh_summary_lists")
+def _(ctx):
+    view = headless_task_view(ctx.db, ctx.busy_day)
+    return lambda i: view._refresh_summary_lists()
+
+
+@case("view.apply_changes")
+def _(ctx):
+    """
+    Another window marked a past task done: only the hidden Overdue and
+    Done lists go stale (cf. view.refresh_summary_lists, which reloads).
+    """
+    view = headless_task_view(ctx.db, ctx.busy_day)
+    past = (TODAY - timedelta(days=30)).isoformat()
+    changes = Changes(
+        frozenset({ctx.ids[0]}), frozenset({(past, "Done"), (past, "Not done")})
+    )
+    return lambda i: view.apply_changes(changes)
+
+
+# ----------------------------------------------------------------------
+# Writes and reordering (these change the dataset; they run last)
+# ----------------------------------------------------------------------
+
+@case("db.add_task")
+def _(ctx):
+    return lambda i: ctx.db.add_task(f"Bench {i}", "", ctx.other_day)
+
+
+@case("db.set_task_status")
+def _(ctx):
+    return lambda i: ctx.db.set_task_status(
+        ctx.pick(i), "Done" if i % 2 else "Not done"
+    )
+
+
+@case("db.start_timer")
+def _(ctx):
+    now = datetime.combine(TODAY, dtime(9))
+    return lambda i: ctx.db.start_timer(ctx.pick(i), now)
+
+
+@case("db.stop_timer")
+def _(ctx):
+    """Every run crosses midnight once: two sessions, two rollup rows."""
+    start = datetime.combine(TODAY, dtime(23))
+
+    def setup(i):
+        ctx.db.start_timer(ctx.pick(i), start)
+
+    return setup, lambda i: ctx.db.stop_timer(ctx.pick(i), start + timedelta(hours=2))
+
+
+@case("db.update_task_title_desc")
+def _(ctx):
+    return lambda i: ctx.db.update_task_title_desc(ctx.pick(i), f"Renamed {i}", "desc")
+
+
+@case("db.save_note")
+def _(ctx):
+    return lambda i: ctx.db.save_note(ctx.pick(i), f"note {i}\n" * 20)
+
+
+@case("db.set_task_order")
+def _(ctx):
+    return lambda i: ctx.db.set_task_order(ctx.day_ids[i % len(ctx.day_ids)], i)
+
+
+@case("db.move_task")
+def _(ctx):
+    """Drag the top task of the busiest day to the bottom, repeatedly."""
+    def step(i):
+        ids = [t.id for t in ctx.db.get_tasks_by_date(ctx.busy_day)]
+        ctx.db.move_task(ids[0], ids[-1], None)
+
+    return step
+
+
+@case("db.reorder_tasks", runs=20)
+def _(ctx):
+    ids = list(ctx.day_ids)
+    return lambda i: ctx.db.reorder_tasks(ctx.busy_day, ids[::-1] if i % 2 else ids)
+
+
+@case("db.rebalance_day", runs=20)
+def _(ctx):
+    return lambda i: ctx.db.rebalance_day(ctx.busy_day)
+
+
+@case("db.delete_task")
+def _(ctx):
+    def setup(i):
+        ctx.victim = ctx.db.add_task("Doomed", "", ctx.other_day)
+
+    return setup, lambda i: ctx.db.delete_task(ctx.victim)
+
+
+def _daily_rules(ctx, n: int):
+    """n daily rules over the whole dataset; returns their teardown."""
+    first = ctx.db.conn.execute("SELECT MIN(task_date) FROM tasks").fetchone()[0]
+    start = datetime.strptime(first, "%Y-%m-%d").date()
+    ids = [ctx.db.add_recurrence(f"Daily {k}", "", "daily", start) for k in range(n)]
+
+    def teardown():
+        for rule_id in ids:
+            ctx.db.delete_recurrence(rule_id)
+
+    return teardown
+
+
+@case("db.add_recurrence", runs=20)
+def _(ctx):
+    added = []
+
+    def teardown():
+        for rule_id in added:
+            ctx.db.delete_recurrence(rule_id)
+
+    def step(i):
+        added.append(
+            ctx.db.add_recurrence(f"Weekly {i}", "", "weekly", TODAY, weekdays=0b10101)
+        )
+
+    return None, step, teardown
+
+
+@case("db.get_recurrences")
+def _(ctx):
+    """10 rules; cache_size=0, so read from the table every time."""
+    return None, lambda i: ctx.db.get_recurrences(), _daily_rules(ctx, 10)
+
+
+@case("db.end_recurrence", runs=20)
+def _(ctx):
+    teardown = _daily_rules(ctx, 1)
+    rule_id = ctx.db.get_recurrences()[0].id
+    return None, lambda i: ctx.db.end_recurrence(rule_id, TODAY + timedelta(days=i)), teardown
+
+
+@case("db.delete_recurrence", runs=20)
+def _(ctx):
+    def setup(i):
+        ctx.rule_id = ctx.db.add_recurrence("Doomed", "", "daily", TODAY)
+
+    return setup, lambda i: ctx.db.delete_recurrence(ctx.rule_id)
+
+
+@case("db.materialize_occurrence", runs=20)
+def _(ctx):
+    """A different day's occurrence each run becomes a row."""
+    from recurrence import occurrence_id
+
+    teardown = _daily_rules(ctx, 1)
+    rule_id = ctx.db.get_recurrences()[0].id
+    stored = []
+
+    def step(i):
+        day = TODAY + timedelta(days=i + 1)
+        stored.append(ctx.db.materialize_occurrence(occurrence_id(rule_id, day)))
+
+    def undo():
+        for task_id in stored:
+            ctx.db.delete_task(task_id)
+        teardown()
+
+    return None, step, undo
+
+
+@case("db.get_tasks_by_date.recurring")
+def _(ctx):
+    """The busiest day with 10 daily rules, expanded on every call (no cache)."""
+    return None, lambda i: ctx.db.get_tasks_by_date(ctx.busy_day), _daily_rules(ctx, 10)
+
+
+@case("db.get_day_counts.recurring")
+def _(ctx):
+    """A month of badges with 10 daily rules (CalendarPopup)."""
+    first = ctx.busy_day.replace(day=1)
+    return (
+        None,
+        lambda i: ctx.db.get_day_counts(first, first + timedelta(days=41)),
+        _daily_rules(ctx, 10),
+    )
+
+
+@case("db.get_upcoming_todos_page.recurring")
+def _(ctx):
+    """First To-do page with 10 daily rules: only its first month is expanded."""
+    return (
+        None,
+        lambda i: ctx.db.get_upcoming_todos_page(TODAY, limit=101),
+        _daily_rules(ctx, 10),
+    )
+
+
+@case("db.data_version")
+def _(ctx):
+    return lambda i: ctx.cached_db.data_version()
+
+
+@case("db.changes_since", runs=20)
+def _(ctx):
+    """The newest 100 change_log rows."""
+    last = ctx.db.conn.execute("SELECT MAX(id) FROM change_log").fetchone()[0]
+    return lambda i: ctx.db.changes_since(last - 100)
+
+
+@case("db.poll_changes")
+def _(ctx):
+    """One task written by another connection since the last poll."""
+    def setup(i):
+        ctx.db.set_task_status(ctx.pick(i), "Done" if i % 2 else "Not done")
+
+    return setup, lambda i: ctx.cached_db.poll_changes()
+
+
+@case("db.poll_changes.idle")
+def _(ctx):
+    """Nothing written since: the per-second cost in the app."""
+    ctx.cached_db.poll_changes()
+    return lambda i: ctx.cached_db.poll_changes()
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def measure(made, runs: int) -> Dict[str, float]:
+    setup, step, *teardown = made if isinstance(made, tuple) else (None, made)
+    if setup is not None:
+        setup(-1)
+    step(-1)  # warm-up
+    samples: List[float] = []
+    for i in range(runs):
+        if setup is not None:
+            setup(i)
+        t0 = time.perf_counter()
+        step(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    for undo in teardown:
+        undo()
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 4),
+        "runs": runs,
+    }
+
+
+def uncovered() -> List[str]:
+    timed = {name.split(".")[1] for name in CASES if name.startswith("db.")}
+    public = {
+        name for name in vars(Database)
+        if not name.startswith("_") and callable(getattr(Database, name))
+    }
+    return sorted(public - timed - NOT_TIMED)
+
+
+def run_suite(path: str, profile: str, only: Optional[List[str]] = None):
+    ctx = Context(path, profile)
+    results = {}
+    try:
+        for name, fn in CASES.items():
+            if only and not any(name.startswith(p) for p in only):
+                continue
+            results[name] = measure(fn(ctx), fn.runs)
+            print(
+                f"{name:36s}{results[name]['median_ms']:>10.3f} ms"
+                f"{results[name]['p95_ms']:>10.3f} ms p95",
+                file=sys.stderr,
+            )
+    finally:
+        ctx.close()
+    return results
+
+
+def compare(baseline: dict, results: dict) -> List[str]:
+    thresholds = baseline.get("thresholds", {})
+    default = thresholds.get("default", DEFAULT_THRESHOLD)
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        limit = thresholds.get(name, default)
+        old, new = before["median_ms"], now["median_ms"]
+        if new > old * (1 + limit) and new - old > MIN_DELTA_MS:
+            regressions.append(
+                f"{name}: {old:.3f} -> {new:.3f} ms (+{(new / old - 1) * 100:.0f}%, "
+                f"threshold {limit * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", default="wal", choices=sorted(PROFILES))
+    parser.add_argument("--dir", default=None, help="directory for the test DB")
+    parser.add_argument("--only", nargs="+", help="case name prefixes to run")
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="JSON", help="check against a baseline")
+    args = parser.parse_args()
+
+    missing = uncovered()
+    if missing:
+        print(f"warning: no benchmark for Database.{', '.join(missing)}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "tasks.db")
+        t0 = time.perf_counter()
+        generate(path, args.rows, args.seed)
+        print(
+            f"generated {args.rows} tasks in {time.perf_counter() - t0:.1f}s",
+            file=sys.stderr,
+        )
+        results = run_suite(path, args.profile, args.only)
+
+    report = {
+        "meta": {
+            "rows": args.rows,
+            "seed": args.seed,
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+        },
+        "thresholds": {"default": DEFAULT_THRESHOLD},
+        "results": results,
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("rows") != args.rows:
+            print("warning: baseline was recorded with a different --rows", file=sys.stderr)
+        regressions = compare(baseline, results)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    if args.save:
+        if os.path.exists(args.save):
+            with open(args.save, encoding="utf-8") as f:
+                report["thresholds"] = json.load(f).get("thresholds", report["thresholds"])
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Scripting interface: planner operations straight on the database, with
+JSON on stdout. Never imports tkinter or the app package, so a call costs
+an interpreter start and one connection – fit for shell loops and cron.
+
+    python cli.py add "Write report" --date 2025-06-02 --desc "Q2 numbers"
+    python cli.py list --date 2025-06-02
+    python cli.py list --from 2025-06-01 --to 2025-06-30 --status open
+    python cli.py done 42
+    python cli.py timer start 42
+    python cli.py repeat "Stand-up" --every weekly --on mon,wed,fri
+    python cli.py report --from 2025-01-01
+
+The database is --db, else PLANNER_DB, else tasks.db next to this file.
+Errors print {"error": ...} and exit with status 1.
+
+Most of a call is interpreter start and imports; loops that issue many
+commands can pipe them to `batch` instead, one command line per input
+line and one JSON line back each, all over a single connection:
+
+    printf 'done 4\ndone 5\nlist\n' | python cli.py batch
+"""
+import argparse
+import json
+import os
+import shlex
+import sqlite3
+import sys
+from datetime import date
+from typing import Dict, List, Optional
+
+from database import Database, profile_named
+from models import Task
+from recurrence import FREQS, WEEKDAYS, Rule, weekday_mask
+from time_utils import get_now
+
+STATUS_FILTERS = {"open": "Not done", "done": "Done"}
+
+
+class CliError(Exception):
+    """A request the database can't satisfy (unknown id, bad range)."""
+
+
+def task_json(task: Task, description: bool = True) -> Dict[str, object]:
+    """
+    Task -> record with the same keys as task_io's export. Pass
+    description=False for rows read with LIST_COLUMNS, which leave it out.
+    """
+    record = {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "task_date": task.task_day,
+        "status": task.status,
+        "total_seconds": task.total_seconds or 0,
+        "active_timer_start": task.active_timer_start,
+        "sort_order": task.sort_order,
+    }
+    if not description:
+        del record["description"]
+    return record
+
+
+def rule_json(rule: Rule) -> Dict[str, object]:
+    return {
+        "id": rule.id,
+        "title": rule.title,
+        "description": rule.description,
+        "every": rule.freq,
+        "interval": rule.interval,
+        "on": [name for i, name in enumerate(WEEKDAYS) if rule.weekdays >> i & 1],
+        "from": rule.start.isoformat(),
+        "until": rule.end.isoformat() if rule.end else None,
+    }
+
+
+def _get(db: Database, task_id: int) -> Task:
+    task = db.get_task(task_id)
+    if task is None:
+        raise CliError(f"no task with id {task_id}")
+    return task
+
+
+# ------------------------------------------------------------
+# Commands: each returns the JSON-able result
+# ------------------------------------------------------------
+
+def cmd_add(db: Database, args) -> object:
+    task_id = db.add_task(args.title, args.desc, args.date or get_now().date())
+    return task_json(_get(db, task_id))
+
+
+def cmd_list(db: Database, args) -> object:
+    if args.date and (args.start or args.end):
+        raise CliError("give either --date or --from/--to")
+    if args.start or args.end:
+        start = args.start or args.end
+        end = args.end or args.start
+        if start > end:
+            raise CliError("--from is after --to")
+        tasks = db.get_tasks_between(start, end)
+    else:
+        tasks = db.get_tasks_by_date(args.date or get_now().date())
+    if args.status:
+        status = STATUS_FILTERS[args.status]
+        tasks = [t for t in tasks if t.status == status]
+    return [task_json(t) for t in tasks]
+
+
+def cmd_show(db: Database, args) -> object:
+    return task_json(_get(db, args.id))
+
+
+def cmd_status(db: Database, args) -> object:
+    _get(db, args.id)
+    db.set_task_status(args.id, args.status)
+    return task_json(_get(db, args.id))
+
+
+def cmd_timer(db: Database, args) -> object:
+    _get(db, args.id)
+    now = get_now()
+    if args.action == "start":
+        started = db.start_timer(args.id, now)
+        return dict(task_json(_get(db, args.id)), started=started)
+    added = db.stop_timer(args.id, now)
+    return dict(task_json(_get(db, args.id)), added_seconds=added)
+
+
+def cmd_repeat(db: Database, args) -> object:
+    try:
+        rule_id = db.add_recurrence(
+            args.title, args.desc, args.every, args.start or get_now().date(),
+            end=args.until, interval=args.interval,
+            weekdays=weekday_mask(args.on.split(",")) if args.on else 0,
+        )
+    except ValueError as exc:
+        raise CliError(str(exc)) from None
+    return next(rule_json(r) for r in db.get_recurrences() if r.id == rule_id)
+
+
+def cmd_rules(db: Database, args) -> object:
+    return [rule_json(r) for r in db.get_recurrences()]
+
+
+def cmd_unrepeat(db: Database, args) -> object:
+    if not any(r.id == args.id for r in db.get_recurrences()):
+        raise CliError(f"no repeat rule with id {args.id}")
+    db.delete_recurrence(args.id)
+    return {"deleted": args.id}
+
+
+def cmd_report(db: Database, args) -> object:
+    from reports import build_report  # pulls in numpy when installed
+
+    try:
+        return build_report(db, args.start, args.end, args.today).to_dict()
+    except ValueError as exc:
+        raise CliError(str(exc)) from None
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+
+def default_db_path() -> str:
+    return os.environ.get("PLANNER_DB") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "tasks.db"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    day = date.fromisoformat
+    parser = argparse.ArgumentParser(description="Planner from the command line (JSON output).")
+    parser.add_argument("--db", default=None, help="database file (default: PLANNER_DB or ./tasks.db)")
+    parser.add_argument("--indent", type=int, default=None, help="pretty-print the JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="add a task")
+    p.add_argument("title")
+    p.add_argument("--desc", default="")
+    p.add_argument("--date", type=day, help="YYYY-MM-DD (default: today)")
+    p.set_defaults(run=cmd_add)
+
+    p = sub.add_parser("list", help="tasks of a day or a range of days")
+    p.add_argument("--date", type=day, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--from", dest="start", type=day)
+    p.add_argument("--to", dest="end", type=day)
+    p.add_argument("--status", choices=sorted(STATUS_FILTERS))
+    p.set_defaults(run=cmd_list)
+
+    p = sub.add_parser("show", help="one task")
+    p.add_argument("id", type=int)
+    p.set_defaults(run=cmd_show)
+
+    p = sub.add_parser("done", help="mark a task done")
+    p.add_argument("id", type=int)
+    p.set_defaults(run=cmd_status, status="Done")
+
+    p = sub.add_parser("undone", help="mark a task not done")
+    p.add_argument("id", type=int)
+    p.set_defaults(run=cmd_status, status="Not done")
+
+    p = sub.add_parser("timer", help="start or stop a task's timer")
+    p.add_argument("action", choices=("start", "stop"))
+    p.add_argument("id", type=int)
+    p.set_defaults(run=cmd_timer)
+
+    p = sub.add_parser("repeat", help="add a repeating task")
+    p.add_argument("title")
+    p.add_argument("--desc", default="")
+    p.add_argument("--every", choices=FREQS, default="daily")
+    p.add_argument("--interval", type=int, default=1, help="every n days/weeks/months")
+    p.add_argument("--on", help="weekly: days such as mon,wed,fri (default: the first day's)")
+    p.add_argument("--from", dest="start", type=day, help="first day (default: today)")
+    p.add_argument("--until", type=day, help="last day (default: none)")
+    p.set_defaults(run=cmd_repeat)
+
+    p = sub.add_parser("rules", help="list repeat rules")
+    p.set_defaults(run=cmd_rules)
+
+    p = sub.add_parser("unrepeat", help="delete a repeat rule (stored tasks stay)")
+    p.add_argument("id", type=int)
+    p.set_defaults(run=cmd_unrepeat)
+
+    sub.add_parser("batch", help="read commands from stdin, one per line")
+
+    today = get_now().date()
+    p = sub.add_parser("report", help="time and completion report")
+    p.add_argument("--from", dest="start", type=day, default=today.replace(day=1))
+    p.add_argument("--to", dest="end", type=day, default=today)
+    p.add_argument("--today", type=day, default=today)
+    p.set_defaults(run=cmd_report)
+    return parser
+
+
+def _emit(result, indent: Optional[int] = None):
+    # One write: json.dump would hand stdout a chunk per token.
+    sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=indent) + "\n")
+
+
+def run_batch(db: Database, parser: argparse.ArgumentParser, lines) -> int:
+    """Run one command per line; returns how many failed."""
+    failed = 0
+    for line in lines:
+        try:
+            argv = shlex.split(line)
+            if not argv:
+                continue
+            args = parser.parse_args(argv)
+            if args.command == "batch":
+                raise CliError("batch does not nest")
+            # A command that fails half-way leaves nothing behind.
+            with db.transaction():
+                result = args.run(db, args)
+        except (SystemExit, ValueError):  # argparse already explained on stderr
+            result = {"error": f"bad command: {line.strip()}"}
+            failed += 1
+        except CliError as exc:
+            result = {"error": str(exc)}
+            failed += 1
+        except sqlite3.Error as exc:
+            result = {"error": f"database: {exc}"}
+            failed += 1
+        _emit(result)
+        sys.stdout.flush()  # the caller may wait for each answer
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # One-shot process: no task cache worth keeping, same journal as the app.
+    try:
+        profile = profile_named(os.environ.get("PLANNER_DB_PROFILE"))
+    except ValueError as exc:
+        _emit({"error": str(exc)})
+        return 1
+    try:
+        db = Database(args.db or default_db_path(), cache_size=0, profile=profile)
+    except sqlite3.Error as exc:
+        _emit({"error": f"database: {exc}"})
+        return 1
+    try:
+        if args.command == "batch":
+            return 1 if run_batch(db, parser, sys.stdin) else 0
+        result = args.run(db, args)
+    except CliError as exc:
+        _emit({"error": str(exc)})
+        return 1
+    except sqlite3.Error as exc:
+        _emit({"error": f"database: {exc}"})
+        return 1
+    finally:
+        db.close()
+
+    _emit(result, args.indent)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,83 +1,262 @@
 import sqlite3
-from datetime import date
-from typing import List, Optional
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from itertools import starmap
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
-from models import Task
+from metrics import QueryTrace, TracedConnection
+from migrations import ORDER_GAP, migrate
+from models import Changes, DayCounts, Task
+from recurrence import (
+    FREQS, OCCURRENCE_ORDER, RULE_COLUMNS, TODO_HORIZON, OccurrenceCache, Rule,
+    expand, is_occurrence, month_range, months, occurrence,
+    rule_dates, split_occurrence_id,
+)
+from task_cache import DAY, DONE, OVERDUE, TODO, TaskCache
+
+# Task(*row) takes the columns in this order.
+TASK_COLUMNS = (
+    "id, title, description, task_date, status, total_seconds, "
+    "active_timer_start, COALESCE(sort_order, 0)"
+)
+# The global lists and search results never show the description; leave
+# it out (None) rather than read every long one back.
+LIST_COLUMNS = TASK_COLUMNS.replace("description", "NULL")
+
+# (task_date, sort_order, id) of a list row; pages continue after/before it.
+Cursor = Tuple[str, int, int]
+
+PAGE_SIZE = 200
+
+# Sort keys of the global lists as (column, descending).
+_ASC_ORDER = (("task_date", False), ("sort_order", False), ("id", False))
+_DESC_ORDER = (("task_date", True), ("sort_order", False), ("id", False))
+
+
+def _keyset(order, cursor: Cursor, backward: bool):
+    """
+    WHERE fragment selecting the rows after `cursor` in `order` (before it
+    when `backward`). The leading bound on the first column keeps it an
+    index range instead of a filtered scan.
+    """
+    terms = []
+    params = []
+    for i, (col, desc) in enumerate(order):
+        op = "<" if desc != backward else ">"
+        eqs = [f"{c}=?" for c, _ in order[:i]]
+        terms.append("(" + " AND ".join(eqs + [f"{col} {op} ?"]) + ")")
+        params.extend(cursor[: i + 1])
+    first_col, first_desc = order[0]
+    bound = "<=" if first_desc != backward else ">="
+    sql = f"{first_col} {bound} ? AND (" + " OR ".join(terms) + ")"
+    return sql, [cursor[0]] + params
+
+
+def page_cursor(task: Task) -> Cursor:
+    return (task.task_day, task.sort_order, task.id)
+
+
+def _fts_query(text: str) -> str:
+    """
+    User input -> FTS5 query: every word must match as a prefix. Words are
+    quoted, so operators and punctuation in the input are taken literally.
+    """
+    words = [w.replace('"', '""') for w in text.split()]
+    return " ".join(f'"{w}"*' for w in words)
+
+
+NOTE_CHUNK = 64 * 1024
+
+
+def _utf8_boundary(data: bytes) -> int:
+    """Length of the longest prefix of `data` that ends on a whole character."""
+    i = len(data)
+    # Step back over continuation bytes (10xxxxxx) to the last lead byte.
+    while i > 0 and len(data) - i < 4 and (data[i - 1] & 0xC0) == 0x80:
+        i -= 1
+    if i == 0:
+        return len(data)
+    lead = data[i - 1]
+    need = 1 if lead < 0x80 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return len(data) if len(data) - (i - 1) >= need else i - 1
+
+
+def _day_pieces(start: datetime, end: datetime) -> List[Tuple[str, str]]:
+    """[start, end) cut at every midnight in between, as ISO (start, end) pairs."""
+    pieces = []
+    while True:
+        midnight = datetime.combine(start.date() + timedelta(days=1), time())
+        piece_end = min(end, midnight)
+        pieces.append(
+            (start.isoformat(timespec="seconds"), piece_end.isoformat(timespec="seconds"))
+        )
+        if piece_end >= end:
+            return pieces
+        start = midnight
+
+
+class ConnectionProfile(NamedTuple):
+    """PRAGMA settings applied to every connection Database opens."""
+
+    journal_mode: str = "delete"
+    synchronous: str = "full"
+    cache_size: int = -2000  # negative = KiB, SQLite's own convention
+    mmap_size: int = 0
+    temp_store: str = "default"
+
+    def apply(self, conn: sqlite3.Connection, readonly: bool = False):
+        if not readonly:
+            # A no-op when unchanged; WAL is persistent in the file.
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA temp_store={self.temp_store}")
+
+
+PROFILES: Dict[str, ConnectionProfile] = {
+    # SQLite defaults: rollback journal, fsync on every commit.
+    "default": ConnectionProfile(),
+    # WAL: readers never block the writer; a commit is one sequential
+    # append, and with synchronous=NORMAL it is fsynced at checkpoints only
+    # (a power cut can lose the last commits, never corrupt the file).
+    "wal": ConnectionProfile(
+        journal_mode="wal",
+        synchronous="normal",
+        cache_size=-16000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="memory",
+    ),
+    # WAL, but still fsync every commit.
+    "wal-full": ConnectionProfile(
+        journal_mode="wal",
+        synchronous="full",
+        cache_size=-16000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="memory",
+    ),
+}
+
+# WAL keeps its index in shared memory next to the file, which network
+# filesystems (SMB shares, NFS) do not provide: opt in on a local disk.
+DEFAULT_PROFILE = "default"
+
+
+def profile_named(name: Optional[str]) -> ConnectionProfile:
+    """PROFILES[name], DEFAULT_PROFILE for None or ""; ValueError if unknown."""
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"PLANNER_DB_PROFILE: unknown profile {name!r} (one of {', '.join(PROFILES)})"
+        )
+    return PROFILES[name]
 
 
 class Database:
-    def __init__(self, path: str):
-        self.conn = sqlite3.connect(path)
-        self.conn.row_factory = sqlite3.Row
-        self._create_tables()
-        self._migrate_sort_order()
-        self._migrate_status_language()
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 128,
+        profile: ConnectionProfile = PROFILES[DEFAULT_PROFILE],
+        readonly: bool = False,
+        trace: Optional[QueryTrace] = None,
+    ):
+        """
+        `readonly` opens a secondary connection for queries only: it skips
+        migrations and keeps no task cache, since writes made through the
+        main connection would never invalidate it.
+
+        `trace` records every statement (SQL, duration, rows) into the given
+        QueryTrace; without it the connection is a plain sqlite3 one.
+        """
+        self.path = path
+        self.profile = profile
+        self.readonly = readonly
+        self.trace = trace
+
+        factory = TracedConnection if trace is not None else sqlite3.Connection
+        if readonly:
+            from pathlib import Path  # imported on the reader's thread, not at startup
+
+            uri = Path(path).absolute().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, factory=factory)
+            cache_size = 0
+        else:
+            self.conn = sqlite3.connect(path, factory=factory)
+        if trace is not None:
+            self.conn.query_trace = trace
+            self.conn.set_trace_callback(trace.on_trace)
+        self._tx_depth = 0
+        self.cache = TaskCache(cache_size)
+        self.occurrences = OccurrenceCache(24 if cache_size > 0 else 0)
+
+        profile.apply(self.conn, readonly=readonly)
+        if not readonly:
+            migrate(self.conn)
+            # poll_changes() reports what others commit from here on.
+            self._seen_version = self.data_version()
+            self._seen_change = self._last_change()
 
     # ------------------------------------------------------------
-    def _create_tables(self):
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                task_date TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'Not done',
-                total_seconds INTEGER DEFAULT 0,
-                active_timer_start TEXT,
-                sort_order INTEGER DEFAULT 0
-            )
-            """
-        )
-        self.conn.commit()
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator["Database"]:
+        """
+        Group several calls into one commit:
 
-    def _migrate_sort_order(self):
-        """Eski DB'de sort_order yoksa ekler ve gün içinde sıraları doldurur."""
-        cur = self.conn.execute("PRAGMA table_info(tasks)")
-        cols = [row["name"] for row in cur.fetchall()]
-        if "sort_order" not in cols:
-            self.conn.execute(
-                "ALTER TABLE tasks ADD COLUMN sort_order INTEGER DEFAULT 0"
-            )
-            cur2 = self.conn.execute(
-                "SELECT id, task_date FROM tasks ORDER BY task_date, id"
-            )
-            orders = {}
-            for row in cur2:
-                d = row["task_date"]
-                o = orders.get(d, 0)
-                self.conn.execute(
-                    "UPDATE tasks SET sort_order=? WHERE id=?", (o, row["id"])
-                )
-                orders[d] = o + 1
+            with db.transaction():
+                db.set_task_status(task_id, "Done")
+                db.stop_timer(task_id, now)
+
+        Blocks may nest; only the outermost one commits (or rolls back).
+
+        `immediate` takes the write lock up front (BEGIN IMMEDIATE). A block
+        that reads before it writes needs it under WAL: if another
+        connection commits in between, the read snapshot cannot be turned
+        into a write and the first write fails with "database is locked".
+        Waiting for the lock at BEGIN goes through the busy timeout instead.
+        """
+        if immediate and self._tx_depth == 0 and not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.rollback()
+                # Reads inside the block may have cached rolled-back rows.
+                self.cache.clear()
+                self.occurrences.clear()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
             self.conn.commit()
 
-    def _migrate_status_language(self):
+    @contextmanager
+    def savepoint(self, name: str = "unit") -> Iterator["Database"]:
         """
-        Eski Türkçe statüleri İngilizce'ye çevir:
-        Yapılmadı -> Not done
-        Yapıldı   -> Done
+        Atomic step inside a larger transaction: if the block raises, only
+        its own changes are undone and the surrounding work carries on.
         """
-        self.conn.execute(
-            "UPDATE tasks SET status='Not done' WHERE status='Yapılmadı'"
-        )
-        self.conn.execute(
-            "UPDATE tasks SET status='Done' WHERE status='Yapıldı'"
-        )
-        self.conn.commit()
+        with self.transaction():
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+            self.conn.execute(f"SAVEPOINT {name}")
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute(f"ROLLBACK TO {name}")
+                self.conn.execute(f"RELEASE {name}")
+                self.cache.clear()
+                self.occurrences.clear()
+                raise
+            self.conn.execute(f"RELEASE {name}")
 
     # ------------------------------------------------------------
-    def _row_to_task(self, row: sqlite3.Row) -> Task:
-        return Task(
-            id=row["id"],
-            title=row["title"],
-            description=row["description"],
-            task_date=date.fromisoformat(row["task_date"]),
-            status=row["status"],
-            total_seconds=row["total_seconds"],
-            active_timer_start=row["active_timer_start"],
-            sort_order=row["sort_order"] or 0,
-        )
+    @staticmethod
+    def _tasks(cur: sqlite3.Cursor) -> List[Task]:
+        """Rows selected as TASK_COLUMNS / LIST_COLUMNS -> Tasks."""
+        return list(starmap(Task, cur.fetchall()))
 
     # ------------------------------------------------------------
     # Daily operations
@@ -85,110 +264,935 @@ class Database:
 
     def add_task(self, title: str, desc: str, day: date) -> int:
         date_str = day.isoformat()
-        cur = self.conn.execute(
-            "SELECT COALESCE(MAX(sort_order), -1) + 1 AS next_order "
-            "FROM tasks WHERE task_date=?",
-            (date_str,),
-        )
-        next_order = cur.fetchone()[0] or 0
-
-        cur2 = self.conn.execute(
-            """
-            INSERT INTO tasks (title, description, task_date, status,
-                               total_seconds, active_timer_start, sort_order)
-            VALUES (?, ?, ?, 'Not done', 0, NULL, ?)
-            """,
-            (title, desc, date_str, next_order),
-        )
-        self.conn.commit()
-        return cur2.lastrowid
+        with self.transaction():
+            # New tasks go one gap below the day's last task; the MAX is an
+            # index seek inside the same statement.
+            cur = self.conn.execute(
+                """
+                INSERT INTO tasks (title, description, task_date, status,
+                                   total_seconds, active_timer_start, sort_order)
+                SELECT ?, ?, ?, 'Not done', 0, NULL,
+                       COALESCE(MAX(sort_order), -?) + ?
+                FROM tasks WHERE task_date=?
+                """,
+                (title, desc, date_str, ORDER_GAP, ORDER_GAP, date_str),
+            )
+        self.cache.invalidate_membership(date_str, "Not done")
+        return cur.lastrowid
 
     def get_tasks_by_date(self, day: date) -> List[Task]:
+        key = (DAY, day.isoformat())
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         cur = self.conn.execute(
-            """
-            SELECT * FROM tasks
+            f"""
+            SELECT {TASK_COLUMNS} FROM tasks
             WHERE task_date=?
             ORDER BY sort_order, id
             """,
             (day.isoformat(),),
         )
-        rows = cur.fetchall()
-        return [self._row_to_task(r) for r in rows]
+        tasks = self._tasks(cur)
+        extra = self._occurrences(day, day)
+        if extra:
+            tasks = sorted(extra + tasks, key=lambda t: (t.sort_order, t.id))
+        self.cache.put(key, tasks)
+        return tasks
 
-    def set_task_status(self, task_id: int, status: str):
-        self.conn.execute(
-            "UPDATE tasks SET status=? WHERE id=?", (status, task_id)
+    def get_tasks_between(self, start: date, end: date) -> List[Task]:
+        """Tasks of the days start..end, in day order (not cached)."""
+        cur = self.conn.execute(
+            f"""
+            SELECT {TASK_COLUMNS} FROM tasks
+            WHERE task_date BETWEEN ? AND ?
+            ORDER BY task_date, sort_order, id
+            """,
+            (start.isoformat(), end.isoformat()),
         )
-        self.conn.commit()
+        tasks = self._tasks(cur)
+        extra = self._occurrences(start, end)
+        if extra:
+            tasks = sorted(extra + tasks, key=page_cursor)
+        return tasks
 
-    def set_task_timer_start(self, task_id: int, start_iso: Optional[str]):
-        self.conn.execute(
-            "UPDATE tasks SET active_timer_start=? WHERE id=?",
-            (start_iso, task_id),
-        )
-        self.conn.commit()
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        The task, or for an occurrence id the occurrence – or the row it
+        has become since.
+        """
+        if is_occurrence(task_id):
+            rule_id, day = split_occurrence_id(task_id)
+            row = self._exception(rule_id, day)
+            if row is not None:
+                return self.get_task(row[0]) if row[0] is not None else None
+            rule = self._rule(rule_id)
+            if rule is None or next(rule_dates(rule, day, day), None) is None:
+                return None
+            return occurrence(rule, day)
 
-    def update_task_total_seconds(self, task_id: int, total: int):
-        self.conn.execute(
-            "UPDATE tasks SET total_seconds=? WHERE id=?",
-            (total, task_id),
-        )
-        self.conn.commit()
+        row = self.conn.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks WHERE id=?", (task_id,)
+        ).fetchone()
+        return Task(*row) if row else None
+
+    def _invalidate_placement(self, task_id: int):
+        """Drop cached lists the task is in or now belongs in."""
+        self.cache.invalidate_task(task_id)
+        row = self.conn.execute(
+            "SELECT task_date, status FROM tasks WHERE id=?", (task_id,)
+        ).fetchone()
+        if row:
+            self.cache.invalidate_membership(row[0], row[1])
+
+    def set_task_status(self, task_id: int, status: str):
+        if is_occurrence(task_id) and status == "Not done":
+            return  # occurrences are open until stored otherwise
+        with self.transaction():
+            task_id = self.materialize_occurrence(task_id)
+            self.conn.execute(
+                "UPDATE tasks SET status=? WHERE id=?", (status, task_id)
+            )
+        self._invalidate_placement(task_id)
 
     def update_task_title_desc(self, task_id: int, title: str, desc: str):
-        self.conn.execute(
-            "UPDATE tasks SET title=?, description=? WHERE id=?",
-            (title, desc, task_id),
-        )
-        self.conn.commit()
+        with self.transaction():
+            task_id = self.materialize_occurrence(task_id)
+            self.conn.execute(
+                "UPDATE tasks SET title=?, description=? WHERE id=?",
+                (title, desc, task_id),
+            )
+        self.cache.invalidate_task(task_id)
 
     def delete_task(self, task_id: int):
-        self.conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
-        self.conn.commit()
+        if is_occurrence(task_id):
+            self._delete_occurrence(task_id)
+            return
+        with self.transaction():
+            self.conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
+        self.cache.invalidate_task(task_id)
 
     def set_task_order(self, task_id: int, order: int):
-        self.conn.execute(
-            "UPDATE tasks SET sort_order=? WHERE id=?", (order, task_id)
+        with self.transaction():
+            task_id = self.materialize_occurrence(task_id)
+            self.conn.execute(
+                "UPDATE tasks SET sort_order=? WHERE id=?", (order, task_id)
+            )
+        self._invalidate_placement(task_id)
+
+    def reorder_tasks(self, day: date, ordered_ids: Sequence[int]) -> int:
+        """
+        Renumber the day in the given order, ORDER_GAP apart, in one
+        transaction. Only rows whose sort_order actually changes are
+        written; returns how many were.
+        """
+        current = dict(
+            self.conn.execute(
+                "SELECT id, sort_order FROM tasks WHERE task_date=?",
+                (day.isoformat(),),
+            ).fetchall()
         )
-        self.conn.commit()
+        changes = [
+            (i * ORDER_GAP, task_id)
+            for i, task_id in enumerate(ordered_ids)
+            if task_id in current and current[task_id] != i * ORDER_GAP
+        ]
+        if changes:
+            with self.transaction():
+                self.conn.executemany(
+                    "UPDATE tasks SET sort_order=? WHERE id=?", changes
+                )
+            for _, task_id in changes:
+                self.cache.invalidate_task(task_id)
+            self.cache.invalidate_membership(day.isoformat(), "Not done")
+            self.cache.invalidate_membership(day.isoformat(), "Done")
+        return len(changes)
+
+    def rebalance_day(self, day: date) -> int:
+        """Restore full gaps between the day's tasks, keeping their order."""
+        ids = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT id FROM tasks WHERE task_date=? ORDER BY sort_order, id",
+                (day.isoformat(),),
+            )
+        ]
+        return self.reorder_tasks(day, ids)
+
+    def move_task(
+        self, task_id: int, prev_id: Optional[int], next_id: Optional[int]
+    ) -> bool:
+        """
+        Place a task between two neighbours of its day (None = list edge)
+        by writing only its own sort_order. Returns True when the slot it
+        landed in has no room left, i.e. the day should be rebalanced soon.
+        Occurrences among the three are stored first: their place is
+        written too.
+        """
+        if any(i is not None and is_occurrence(i) for i in (task_id, prev_id, next_id)):
+            with self.transaction():
+                task_id, prev_id, next_id = (
+                    None if i is None else self.materialize_occurrence(i)
+                    for i in (task_id, prev_id, next_id)
+                )
+                if task_id is None:
+                    return False  # the occurrence was deleted meanwhile
+                return self.move_task(task_id, prev_id, next_id)
+
+        if task_id in (prev_id, next_id):
+            raise ValueError("a task cannot be its own neighbour")
+        if prev_id is not None and prev_id == next_id:
+            raise ValueError("prev and next are the same task")
+
+        lo, hi = self._neighbour_orders(prev_id, next_id)
+        if lo is not None and hi is not None and (lo, prev_id) >= (hi, next_id):
+            raise ValueError("prev does not sort before next")
+
+        with self.transaction():
+            if lo is not None and hi is not None and hi - lo < 2:
+                # Out of room: renumber the day, then read the new slot.
+                day = self.conn.execute(
+                    "SELECT task_date FROM tasks WHERE id=?", (prev_id,)
+                ).fetchone()[0]
+                self.rebalance_day(date.fromisoformat(day))
+                lo, hi = self._neighbour_orders(prev_id, next_id)
+                if hi - lo < 2:
+                    raise ValueError("prev and next are not neighbours of one day")
+
+            if lo is None and hi is None:
+                order = 0
+            elif lo is None:
+                order = hi - ORDER_GAP
+            elif hi is None:
+                order = lo + ORDER_GAP
+            else:
+                order = (lo + hi) // 2
+
+            self.set_task_order(task_id, order)
+
+        return (
+            (lo is not None and order - lo < 2)
+            or (hi is not None and hi - order < 2)
+        )
+
+    def _neighbour_orders(
+        self, prev_id: Optional[int], next_id: Optional[int]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        neighbours = dict(
+            self.conn.execute(
+                "SELECT id, sort_order FROM tasks WHERE id IN (?, ?)",
+                (prev_id, next_id),
+            ).fetchall()
+        )
+        return neighbours.get(prev_id), neighbours.get(next_id)
+
+    def get_day_counts(self, start: date, end: date) -> Dict[date, DayCounts]:
+        """
+        Open/done counts and tracked seconds of the tasks on each day
+        start..end, in one pass over idx_tasks_day_time. Days without
+        tasks are left out.
+        """
+        cur = self.conn.execute(
+            """
+            SELECT task_date, SUM(status != 'Done'), SUM(status = 'Done'),
+                   SUM(COALESCE(total_seconds, 0))
+            FROM tasks WHERE task_date BETWEEN ? AND ?
+            GROUP BY task_date
+            """,
+            (start.isoformat(), end.isoformat()),
+        )
+        counts = {
+            date.fromisoformat(d): DayCounts(n_open, n_done, secs)
+            for d, n_open, n_done, secs in cur
+        }
+        for task in self._occurrences(start, end):
+            n_open, n_done, secs = counts.get(task.task_date, (0, 0, 0))
+            counts[task.task_date] = DayCounts(n_open + 1, n_done, secs)
+        return counts
 
     # ------------------------------------------------------------
     # Global lists (To-do / Done / Overdue)
     # ------------------------------------------------------------
 
     def get_upcoming_todos(self, today: date) -> List[Task]:
-        """status 'Not done' and date today or later."""
+        """
+        status 'Not done' and date today or later; occurrences up to
+        TODO_HORIZON ahead.
+        """
+        key = (TODO, today.isoformat(), "all")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         cur = self.conn.execute(
-            """
-            SELECT * FROM tasks
+            f"""
+            SELECT {LIST_COLUMNS} FROM tasks
             WHERE status='Not done' AND task_date >= ?
             ORDER BY task_date, sort_order, id
             """,
             (today.isoformat(),),
         )
-        return [self._row_to_task(r) for r in cur.fetchall()]
+        tasks = self._tasks(cur)
+        extra = self._occurrences(today, today + TODO_HORIZON)
+        if extra:
+            tasks = sorted(extra + tasks, key=page_cursor)
+        self.cache.put(key, tasks)
+        return tasks
 
     def get_overdue_tasks(self, today: date) -> List[Task]:
-        """status 'Not done' and date in the past."""
+        """
+        status 'Not done' and date in the past. Occurrences that were never
+        stored are not listed: a missed repeat is not a task left undone.
+        """
+        key = (OVERDUE, today.isoformat(), "all")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         cur = self.conn.execute(
-            """
-            SELECT * FROM tasks
+            f"""
+            SELECT {LIST_COLUMNS} FROM tasks
             WHERE status='Not done' AND task_date < ?
             ORDER BY task_date DESC, sort_order, id
             """,
             (today.isoformat(),),
         )
-        return [self._row_to_task(r) for r in cur.fetchall()]
+        tasks = self._tasks(cur)
+        self.cache.put(key, tasks)
+        return tasks
 
     def get_completed_tasks(self) -> List[Task]:
+        key = (DONE, "all")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         cur = self.conn.execute(
-            """
-            SELECT * FROM tasks
+            f"""
+            SELECT {LIST_COLUMNS} FROM tasks
             WHERE status='Done'
             ORDER BY task_date DESC, sort_order, id
             """
         )
-        return [self._row_to_task(r) for r in cur.fetchall()]
+        tasks = self._tasks(cur)
+        self.cache.put(key, tasks)
+        return tasks
+
+    # ------------------------------------------------------------
+    # Global lists, one page at a time (keyset pagination)
+    # ------------------------------------------------------------
+
+    def _page(
+        self,
+        key: tuple,
+        where: str,
+        params: Sequence,
+        order,
+        after: Optional[Cursor],
+        before: Optional[Cursor],
+        limit: int,
+        occurrences: Optional[Callable[[Optional[Cursor], bool, int], List[Task]]] = None,
+    ) -> List[Task]:
+        """
+        Up to `limit` rows right after `after` or right before `before`
+        (from the start when both are None), always in list order.
+        `key` names the list for the cache. `occurrences(cursor, backward,
+        limit)` adds those of an ascending list, in the same scan order.
+        """
+        key = key + (after, before, limit)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        backward = before is not None
+        cursor = before if backward else after
+        params = list(params)
+        if cursor is not None:
+            clause, extra = _keyset(order, cursor, backward)
+            where = f"{where} AND {clause}"
+            params.extend(extra)
+
+        order_by = ", ".join(
+            f"{col} {'DESC' if desc != backward else 'ASC'}" for col, desc in order
+        )
+        cur = self.conn.execute(
+            f"SELECT {LIST_COLUMNS} FROM tasks WHERE {where} ORDER BY {order_by} LIMIT ?",
+            params + [limit],
+        )
+        tasks = self._tasks(cur)
+        extra = occurrences(cursor, backward, limit) if occurrences else None
+        if extra:
+            tasks = sorted(tasks + extra, key=page_cursor, reverse=backward)[:limit]
+        if backward:
+            tasks.reverse()
+        self.cache.put(key, tasks)
+        return tasks
+
+    def get_upcoming_todos_page(
+        self,
+        today: date,
+        after: Optional[Cursor] = None,
+        before: Optional[Cursor] = None,
+        limit: int = PAGE_SIZE,
+    ) -> List[Task]:
+        return self._page(
+            (TODO, today.isoformat()),
+            "status='Not done' AND task_date >= ?",
+            (today.isoformat(),),
+            _ASC_ORDER, after, before, limit,
+            lambda cursor, backward, n: self._todo_occurrences(today, cursor, backward, n),
+        )
+
+    def get_overdue_tasks_page(
+        self,
+        today: date,
+        after: Optional[Cursor] = None,
+        before: Optional[Cursor] = None,
+        limit: int = PAGE_SIZE,
+    ) -> List[Task]:
+        return self._page(
+            (OVERDUE, today.isoformat()),
+            "status='Not done' AND task_date < ?",
+            (today.isoformat(),),
+            _DESC_ORDER, after, before, limit,
+        )
+
+    def get_completed_tasks_page(
+        self,
+        after: Optional[Cursor] = None,
+        before: Optional[Cursor] = None,
+        limit: int = PAGE_SIZE,
+    ) -> List[Task]:
+        return self._page(
+            (DONE,), "status='Done'", (), _DESC_ORDER, after, before, limit
+        )
+
+    # ------------------------------------------------------------
+    # Repeating tasks (recurrence.py)
+    # ------------------------------------------------------------
+
+    def add_recurrence(
+        self,
+        title: str,
+        desc: str,
+        freq: str,
+        start: date,
+        end: Optional[date] = None,
+        interval: int = 1,
+        weekdays: int = 0,
+    ) -> int:
+        """
+        Store a rule; its occurrences show up in every range that reads
+        tasks from now on, without a row each.
+        """
+        if freq not in FREQS:
+            raise ValueError(f"freq must be one of {', '.join(FREQS)}")
+        if interval < 1:
+            raise ValueError("interval must be 1 or more")
+        if end is not None and end < start:
+            raise ValueError("the rule ends before it starts")
+        with self.transaction():
+            cur = self.conn.execute(
+                """
+                INSERT INTO recurrences (title, description, freq, interval,
+                                         weekdays, start_date, end_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (title, desc, freq, interval, weekdays, start.isoformat(),
+                 end.isoformat() if end else None),
+            )
+        self._rules_changed()
+        return cur.lastrowid
+
+    def get_recurrences(self) -> List[Rule]:
+        return sorted(self._rules().values())
+
+    def end_recurrence(self, rule_id: int, last: date):
+        """Stop a rule after `last`; what it stored stays either way."""
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE recurrences SET end_date=? WHERE id=?",
+                (last.isoformat(), rule_id),
+            )
+        self._rules_changed()
+
+    def delete_recurrence(self, rule_id: int):
+        """Remove a rule and its occurrences; tasks it stored are kept."""
+        with self.transaction():
+            self.conn.execute("DELETE FROM recurrences WHERE id=?", (rule_id,))
+            self.conn.execute(
+                "DELETE FROM recurrence_exceptions WHERE recurrence_id=?", (rule_id,)
+            )
+        self._rules_changed()
+
+    def materialize_occurrence(self, task_id: int) -> Optional[int]:
+        """
+        The stored task behind `task_id`: the id itself for a stored task;
+        for an occurrence, the row it became, inserted now on first write.
+        None if the occurrence was deleted or its rule no longer has it.
+        """
+        if not is_occurrence(task_id):
+            return task_id
+        rule_id, day = split_occurrence_id(task_id)
+        with self.transaction():
+            row = self._exception(rule_id, day)
+            if row is not None:
+                return row[0]
+            rule = self._rule(rule_id)
+            if rule is None or next(rule_dates(rule, day, day), None) is None:
+                return None
+            cur = self.conn.execute(
+                """
+                INSERT INTO tasks (title, description, task_date, status,
+                                   total_seconds, active_timer_start, sort_order)
+                VALUES (?, ?, ?, 'Not done', 0, NULL, ?)
+                """,
+                (rule.title, rule.description, day.isoformat(), OCCURRENCE_ORDER),
+            )
+            self.conn.execute(
+                "INSERT INTO recurrence_exceptions (day, recurrence_id, task_id) "
+                "VALUES (?, ?, ?)",
+                (day.isoformat(), rule_id, cur.lastrowid),
+            )
+        self._occurrence_gone(task_id)
+        return cur.lastrowid
+
+    def _delete_occurrence(self, task_id: int):
+        rule_id, day = split_occurrence_id(task_id)
+        with self.transaction():
+            row = self._exception(rule_id, day)
+            if row is not None:
+                if row[0] is not None:
+                    self.delete_task(row[0])  # it was stored meanwhile
+                return
+            self.conn.execute(
+                "INSERT INTO recurrence_exceptions (day, recurrence_id, task_id) "
+                "VALUES (?, ?, NULL)",
+                (day.isoformat(), rule_id),
+            )
+        self._occurrence_gone(task_id)
+
+    def _occurrence_gone(self, task_id: int):
+        """An occurrence was stored or deleted: it leaves its day."""
+        day = split_occurrence_id(task_id)[1].isoformat()
+        self.occurrences.invalidate_day(day)
+        self.cache.invalidate_task(task_id)
+        self.cache.invalidate_membership(day, "Not done")
+
+    def _rules_changed(self):
+        self.occurrences.clear()
+        self.cache.clear()
+
+    def _rule(self, rule_id: int) -> Optional[Rule]:
+        row = self.conn.execute(
+            f"SELECT {RULE_COLUMNS} FROM recurrences WHERE id=?", (rule_id,)
+        ).fetchone()
+        return Rule.from_row(row) if row else None
+
+    def _rules(self) -> Dict[int, Rule]:
+        rules = self.occurrences.rules
+        if rules is None:
+            rules = {
+                row[0]: Rule.from_row(row)
+                for row in self.conn.execute(f"SELECT {RULE_COLUMNS} FROM recurrences")
+            }
+            self.occurrences.set_rules(rules)
+        return rules
+
+    def _exception(self, rule_id: int, day: date) -> Optional[Tuple[Optional[int]]]:
+        return self.conn.execute(
+            "SELECT task_id FROM recurrence_exceptions WHERE day=? AND recurrence_id=?",
+            (day.isoformat(), rule_id),
+        ).fetchone()
+
+    def _expand(self, first: date, last: date) -> List[Task]:
+        skip = set(
+            self.conn.execute(
+                "SELECT day, recurrence_id FROM recurrence_exceptions "
+                "WHERE day BETWEEN ? AND ?",
+                (first.isoformat(), last.isoformat()),
+            ).fetchall()
+        )
+        return expand(self._rules().values(), first, last, skip)
+
+    def _month_occurrences(self, month) -> List[Task]:
+        cached = self.occurrences.get(month)
+        if cached is not None:
+            return cached
+        tasks = self._expand(*month_range(month))
+        self.occurrences.put(month, tasks)
+        return tasks
+
+    def _occurrences(self, start: date, end: date) -> List[Task]:
+        """Occurrences on days start..end still to be stored, in list order."""
+        if not self._rules():
+            return []  # one cached check for the common case
+        if self.occurrences.maxsize <= 0:
+            return self._expand(start, end)  # nothing kept: just the range
+        lo, hi = start.isoformat(), end.isoformat()
+        return [
+            task
+            for month in months(start, end)
+            for task in self._month_occurrences(month)
+            if lo <= task.task_day <= hi
+        ]
+
+    def _todo_occurrences(
+        self, today: date, cursor: Optional[Cursor], backward: bool, limit: int
+    ) -> List[Task]:
+        """
+        Up to `limit` occurrences of the To-do list right after `cursor`
+        (before it when `backward`), in scan order; months are expanded
+        only until the page is full.
+        """
+        if not self._rules():
+            return []
+        first, last = today, today + TODO_HORIZON
+        if cursor is not None:
+            day = date.fromisoformat(cursor[0])
+            if backward:
+                last = min(last, day)
+            else:
+                first = max(first, day)
+        if first > last:
+            return []
+        lo, hi = first.isoformat(), last.isoformat()
+        cursor = tuple(cursor) if cursor is not None else None
+
+        found: List[Task] = []
+        span = months(first, last)
+        for month in reversed(span) if backward else span:
+            tasks = self._month_occurrences(month)
+            for task in reversed(tasks) if backward else tasks:
+                if not lo <= task.task_day <= hi:
+                    continue
+                if cursor is not None and (
+                    page_cursor(task) >= cursor if backward else page_cursor(task) <= cursor
+                ):
+                    continue
+                found.append(task)
+                if len(found) == limit:
+                    return found
+        return found
+
+    # ------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------
+
+    def search(self, text: str, limit: int = 50) -> List[Task]:
+        """Tasks whose title, description or notes match, best match first."""
+        query = _fts_query(text)
+        if not query:
+            return []
+        cur = self.conn.execute(
+            f"""
+            SELECT {LIST_COLUMNS} FROM (
+                SELECT rowid, rank FROM tasks_fts
+                WHERE tasks_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hits
+            JOIN tasks ON tasks.id = hits.rowid
+            ORDER BY hits.rank
+            """,
+            (query, limit),
+        )
+        return self._tasks(cur)
+
+    # ------------------------------------------------------------
+    # Changes made by other connections (other windows, cli.py, server.py)
+    # ------------------------------------------------------------
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the file."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _last_change(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_log").fetchone()[0]
+
+    def changes_since(self, change_id: int, limit: int = 5000) -> Tuple[int, Changes]:
+        """
+        change_log rows after `change_id`, as (last id read, Changes).
+        Changes.full is set when the log was trimmed past `change_id` or
+        holds more than `limit` rows after it.
+        """
+        oldest = self.conn.execute("SELECT MIN(id) FROM change_log").fetchone()[0]
+        if oldest is not None and oldest > change_id + 1 and change_id > 0:
+            return self._last_change(), Changes(frozenset(), frozenset(), full=True)
+
+        rows = self.conn.execute(
+            "SELECT id, task_id, task_date, status FROM change_log "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (change_id, limit + 1),
+        ).fetchall()
+        if len(rows) > limit or any(r[2] is None for r in rows):
+            # Too many, or a repeat rule changed (logged without a day).
+            return self._last_change(), Changes(frozenset(), frozenset(), full=True)
+        if not rows:
+            return change_id, Changes(frozenset(), frozenset())
+        return rows[-1][0], Changes(
+            frozenset(r[1] for r in rows if r[1]), frozenset((r[2], r[3]) for r in rows)
+        )
+
+    def poll_changes(self) -> Optional[Changes]:
+        """
+        What other connections committed since the last poll, or None (one
+        PRAGMA when nothing did). Cached entries the writes touched are
+        dropped. Writes made through this connection since the previous
+        poll come back too; they are not told apart.
+        """
+        version = self.data_version()
+        if version == self._seen_version:
+            return None
+        self._seen_version = version
+        self._seen_change, changes = self.changes_since(self._seen_change)
+
+        if changes.full:
+            self.cache.clear()
+            self.occurrences.clear()
+        else:
+            for task_id in changes.task_ids:
+                self.cache.invalidate_task(task_id)
+            for day, status in changes.places:
+                self.cache.invalidate_membership(day, status)
+                self.occurrences.invalidate_day(day)
+        return changes
+
+    # ------------------------------------------------------------
+    # Time tracking
+    # ------------------------------------------------------------
+
+    def start_timer(self, task_id: int, now: datetime) -> bool:
+        """Open a time session; False if the task's timer already runs."""
+        with self.transaction():
+            task_id = self.materialize_occurrence(task_id)
+            if task_id is None:
+                return False
+            running = self.conn.execute(
+                "SELECT 1 FROM time_sessions WHERE task_id=? AND ended_at IS NULL",
+                (task_id,),
+            ).fetchone()
+            if running:
+                return False
+            start = now.isoformat(timespec="seconds")
+            self.conn.execute(
+                "INSERT INTO time_sessions (task_id, started_at) VALUES (?, ?)",
+                (task_id, start),
+            )
+            self.conn.execute(
+                "UPDATE tasks SET active_timer_start=? WHERE id=?", (start, task_id)
+            )
+        self.cache.invalidate_task(task_id)
+        return True
+
+    def stop_timer(self, task_id: int, now: datetime) -> int:
+        """
+        Close the task's running session at `now`; returns the seconds it
+        added. A session running past midnight is stored as one session
+        per day, so each day's rollup gets its own share.
+        """
+        if is_occurrence(task_id):
+            return 0  # never started: starting one stores it
+        with self.transaction():
+            row = self.conn.execute(
+                "SELECT id, started_at FROM time_sessions "
+                "WHERE task_id=? AND ended_at IS NULL",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return 0
+            session_id, started = row[0], datetime.fromisoformat(row[1])
+            # Sessions are kept to the second, so the pieces add up exactly.
+            now = max(now.replace(microsecond=0), started)
+
+            # Cut [started, now) at every midnight in between.
+            first, *rest = _day_pieces(started, now)
+            self.conn.execute(
+                "UPDATE time_sessions SET ended_at=? WHERE id=?",
+                (first[1], session_id),
+            )
+            self._insert_sessions(task_id, rest)
+            self.conn.execute(
+                "UPDATE tasks SET active_timer_start=NULL WHERE id=?", (task_id,)
+            )
+        self.cache.invalidate_task(task_id)
+        return int((now - started).total_seconds())
+
+    def _insert_sessions(self, task_id: int, pieces: List[Tuple[str, str]]):
+        self.conn.executemany(
+            "INSERT INTO time_sessions (task_id, started_at, ended_at) "
+            "VALUES (?, ?, ?)",
+            [(task_id, start, end) for start, end in pieces],
+        )
+
+    # Older timer API, kept for scripts written against it. The sessions
+    # stay the record: both go through time_sessions.
+
+    def set_task_timer_start(self, task_id: int, start_iso: Optional[str]):
+        """
+        Start the task's timer at `start_iso`, or with None drop the running
+        session without recording it (callers added the time themselves
+        through update_task_total_seconds).
+        """
+        if start_iso is not None:
+            self.start_timer(task_id, datetime.fromisoformat(start_iso))
+            return
+        with self.transaction():
+            self.conn.execute(
+                "DELETE FROM time_sessions WHERE task_id=? AND ended_at IS NULL",
+                (task_id,),
+            )
+            self.conn.execute(
+                "UPDATE tasks SET active_timer_start=NULL WHERE id=?", (task_id,)
+            )
+        self.cache.invalidate_task(task_id)
+
+    def update_task_total_seconds(self, task_id: int, total: int):
+        """
+        Raise the task's tracked total to `total`. The difference is stored
+        as sessions from midnight of the task's day, the way migration 7
+        stored the old totals; ValueError if it would lower the total.
+        """
+        with self.transaction():
+            row = self.conn.execute(
+                "SELECT task_date, COALESCE(total_seconds, 0) FROM tasks WHERE id=?",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return
+            added = total - row[1]
+            if added < 0:
+                raise ValueError("tracked time can only be lowered by editing sessions")
+            if added:
+                start = datetime.combine(date.fromisoformat(row[0]), time())
+                self._insert_sessions(
+                    task_id, _day_pieces(start, start + timedelta(seconds=added))
+                )
+        self.cache.invalidate_task(task_id)
+
+    def get_sessions(self, task_id: int) -> List[Tuple[str, Optional[str]]]:
+        """(started_at, ended_at) of a task's sessions, oldest first."""
+        return [
+            tuple(r)
+            for r in self.conn.execute(
+                "SELECT started_at, ended_at FROM time_sessions "
+                "WHERE task_id=? ORDER BY started_at",
+                (task_id,),
+            )
+        ]
+
+    # Range aggregates read the daily_time rollup only; they cover closed
+    # sessions (a running timer counts once it is stopped).
+
+    def time_total(self, start: date, end: date) -> int:
+        """Seconds tracked on days start..end (inclusive)."""
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(seconds), 0) FROM daily_time WHERE day BETWEEN ? AND ?",
+            (start.isoformat(), end.isoformat()),
+        ).fetchone()[0]
+
+    def time_by_day(self, start: date, end: date) -> List[Tuple[date, int]]:
+        """(day, seconds) for each day start..end that has tracked time."""
+        cur = self.conn.execute(
+            """
+            SELECT day, SUM(seconds) FROM daily_time
+            WHERE day BETWEEN ? AND ?
+            GROUP BY day ORDER BY day
+            """,
+            (start.isoformat(), end.isoformat()),
+        )
+        return [(date.fromisoformat(d), secs) for d, secs in cur]
+
+    def time_by_task(
+        self, start: date, end: date, limit: Optional[int] = None
+    ) -> List[Tuple[int, str, int]]:
+        """(task_id, title, seconds) over days start..end, most time first."""
+        cur = self.conn.execute(
+            """
+            SELECT t.id, t.title, r.seconds
+            FROM (
+                SELECT task_id, SUM(seconds) AS seconds FROM daily_time
+                WHERE day BETWEEN ? AND ?
+                GROUP BY task_id
+            ) AS r JOIN tasks t ON t.id = r.task_id
+            ORDER BY r.seconds DESC, t.id
+            LIMIT ?
+            """,
+            (start.isoformat(), end.isoformat(), -1 if limit is None else limit),
+        )
+        return [tuple(r) for r in cur]
+
+    # ------------------------------------------------------------
+    # Notes
+    # ------------------------------------------------------------
+
+    def save_note(self, task_id: int, text: str):
+        """Store a task's note; an empty note removes the row."""
+        if is_occurrence(task_id) and not text:
+            return
+        with self.transaction():
+            task_id = self.materialize_occurrence(task_id)
+            if task_id is None:
+                return
+            if text:
+                self.conn.execute(
+                    """
+                    INSERT INTO notes (task_id, body) VALUES (?, ?)
+                    ON CONFLICT(task_id) DO UPDATE SET body = excluded.body
+                    """,
+                    (task_id, text),
+                )
+            else:
+                self.conn.execute("DELETE FROM notes WHERE task_id=?", (task_id,))
+
+    def get_note(self, task_id: int) -> str:
+        row = self.conn.execute(
+            "SELECT body FROM notes WHERE task_id=?", (task_id,)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def read_note_chunk(
+        self, task_id: int, offset: int = 0, size: int = NOTE_CHUNK
+    ) -> Tuple[str, Optional[int]]:
+        """
+        About `size` bytes of a note starting at byte `offset`, cut on a
+        character boundary. Returns (text, next_offset); next_offset is
+        None once the end is reached.
+        """
+        size = max(size, 4)  # room for at least one whole character
+        if hasattr(self.conn, "blobopen"):
+            try:
+                with self.conn.blobopen(
+                    "notes", "body", task_id, readonly=True
+                ) as blob:
+                    total = len(blob)
+                    blob.seek(offset)
+                    data = blob.read(size)
+            except sqlite3.OperationalError:
+                return "", None  # no note for this task
+        else:
+            row = self.conn.execute(
+                "SELECT length(CAST(body AS BLOB)), "
+                "substr(CAST(body AS BLOB), ?, ?) FROM notes WHERE task_id=?",
+                (offset + 1, size, task_id),
+            ).fetchone()
+            if row is None:
+                return "", None
+            total, data = row
+
+        end = offset + len(data)
+        if end < total:
+            data = data[: _utf8_boundary(data)]
+            end = offset + len(data)
+        return data.decode("utf-8"), (end if end < total else None)
+
+    def iter_note_chunks(self, task_id: int, size: int = NOTE_CHUNK) -> Iterator[str]:
+        offset: Optional[int] = 0
+        while offset is not None:
+            text, offset = self.read_note_chunk(task_id, offset, size)
+            if text:
+                yield text
 
     def close(self):
         self.conn.close()
@@ -1,8 +1,14 @@
-import os
-import sys
+import time
 
-from database import Database
-from app.ui import PlannerApp
+STARTED = time.perf_counter()  # startup timings count from here
+
+import os  # noqa: E402
+import sys  # noqa: E402
+
+from database import Database, profile_named  # noqa: E402
+from metrics import QueryTrace  # noqa: E402
+from app.db_worker import AsyncDatabase  # noqa: E402
+from app.ui import PlannerApp  # noqa: E402
 
 
 def get_base_dir() -> str:
@@ -18,11 +24,47 @@ def get_base_dir() -> str:
 def main():
     base_dir = get_base_dir()
 
-    # DB file will live next to the .exe (or in project root when dev)
-    db_path = os.path.join(base_dir, "tasks.db")
-
-    db = Database(db_path)
-    app = PlannerApp(db)
+    # DB file will live next to the .exe (or in project root when dev);
+    # PLANNER_DB points elsewhere.
+    db_path = os.environ.get("PLANNER_DB") or os.path.join(base_dir, "tasks.db")
+
+    # PLANNER_DB_PROFILE picks the connection settings (see database.PROFILES);
+    # WAL is opt-in, it does not work on network drives.
+    try:
+        profile = profile_named(os.environ.get("PLANNER_DB_PROFILE"))
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+    # Every statement is timed unless PLANNER_TRACE=0; timings land in
+    # logs/ when the app closes. PLANNER_DEBUG=1 shows them live (F12).
+    trace = None if os.environ.get("PLANNER_TRACE") == "0" else QueryTrace()
+
+    # The connection is opened (and migrated) on the DB worker thread; with
+    # WAL a second, read-only connection serves the global lists.
+    reader = None
+    if profile.journal_mode == "wal":
+        reader = lambda: Database(db_path, profile=profile, readonly=True, trace=trace)
+    db = AsyncDatabase(
+        lambda: Database(db_path, profile=profile, trace=trace), reader=reader
+    )
+    # benchmarks/bench_startup.py: print the startup timings and quit.
+    probe = os.environ.get("PLANNER_STARTUP_PROBE") == "1"
+
+    app = PlannerApp(
+        db,
+        trace=trace,
+        log_dir=None if probe else os.path.join(base_dir, "logs"),
+        debug=os.environ.get("PLANNER_DEBUG") == "1",
+        started=STARTED,
+    )
+    if probe:
+        def report(event):
+            import json
+
+            print(json.dumps(app.startup), flush=True)
+            app._on_close()
+
+        app.bind("<<StartupDone>>", report)
     app.mainloop()
 
 
@@ -0,0 +1,367 @@
+"""
+Instrumentation: SQL statement tracing and latency histograms.
+
+Nothing here imports Tk; the DB worker threads record into the same
+objects the UI reads, so every mutation takes the owner's lock.
+"""
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+# Histogram bucket upper bounds, in milliseconds (the last bucket is open).
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Fixed log-scale buckets: constant memory however many samples."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th sample (0 < q <= 1),
+        capped at the largest sample seen.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                bound = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                return min(bound, round(self.max_ms, 3))
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip([*map(str, BUCKETS_MS), "inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """Named latency histograms for UI actions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists: Dict[str, Histogram] = {}
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            hist = self._hists.get(name)
+            if hist is None:
+                hist = self._hists[name] = Histogram()
+            hist.record(ms)
+
+    def start(self, name: str) -> Callable[[], None]:
+        """
+        For actions that finish in a later callback:
+
+            done = metrics.start("mark_done")
+            ...            # later, once the result is on screen
+            done()
+
+        Calling done() more than once records only the first time.
+        """
+        t0 = time.perf_counter()
+        finished = False
+
+        def done():
+            nonlocal finished
+            if not finished:
+                finished = True
+                self.record(name, (time.perf_counter() - t0) * 1000)
+
+        return done
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {name: h.snapshot() for name, h in sorted(self._hists.items())}
+
+
+# UI action latencies (click to result on screen), shared by all views.
+UI = Metrics()
+
+
+# ----------------------------------------------------------------------
+# SQL tracing
+# ----------------------------------------------------------------------
+
+class _Statement:
+    """Running totals of one SQL text."""
+
+    __slots__ = ("calls", "rows", "hist")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.hist = Histogram()
+
+
+class QueryTrace:
+    """
+    Every statement a traced connection runs: the last `recent` ones as
+    they happened (SQL, duration, rows) and per-SQL totals for the rest.
+
+    Durations cover execute() plus fetching the rows. Statements SQLite
+    runs on its own behalf (implicit BEGIN, trigger bodies) come from the
+    trace callback and appear in the recent list without a duration.
+    """
+
+    def __init__(self, recent: int = 200, max_statements: int = 500):
+        self._lock = threading.Lock()
+        self.recent: Deque[list] = deque(maxlen=recent)
+        self._stats: "OrderedDict[str, _Statement]" = OrderedDict()
+        self._max_statements = max_statements
+        self.total = Histogram()
+
+    def begin(self, sql: str) -> list:
+        entry = [datetime.now().strftime("%H:%M:%S.%f")[:-3], sql, 0.0, 0]
+        with self._lock:
+            self.recent.append(entry)
+        return entry
+
+    def add(self, entry: list, ms: float, rows: int):
+        """More time/rows for a statement (a fetch after execute)."""
+        with self._lock:
+            entry[2] += ms
+            entry[3] += rows
+
+    def finish(self, entry: list):
+        sql, ms, rows = entry[1], entry[2], entry[3]
+        with self._lock:
+            stat = self._stats.get(sql)
+            if stat is None:
+                stat = self._stats[sql] = _Statement()
+                if len(self._stats) > self._max_statements:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(sql)
+            stat.calls += 1
+            stat.rows += rows
+            stat.hist.record(ms)
+            self.total.record(ms)
+
+    def on_trace(self, sql: str):
+        """
+        sqlite3 trace callback. Our own statements are already timed; list
+        only what SQLite runs on its own (the implicit BEGIN, and trigger
+        bodies on builds that report them as "-- TRIGGER ...").
+        """
+        if sql == "BEGIN " or sql.startswith("-- TRIGGER"):
+            with self._lock:
+                self.recent.append(
+                    [datetime.now().strftime("%H:%M:%S.%f")[:-3], sql.strip(), None, None]
+                )
+
+    def slowest(self, n: int = 10) -> List[Dict[str, object]]:
+        with self._lock:
+            stats = list(self._stats.items())
+        stats.sort(key=lambda kv: kv[1].hist.total_ms, reverse=True)
+        return [
+            {
+                "sql": sql,
+                "calls": s.calls,
+                "rows": s.rows,
+                "total_ms": round(s.hist.total_ms, 3),
+                "p95_ms": s.hist.percentile(0.95),
+                "max_ms": round(s.hist.max_ms, 3),
+            }
+            for sql, s in stats[:n]
+        ]
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            recent = [
+                {"at": at, "sql": sql, "ms": ms if ms is None else round(ms, 3), "rows": rows}
+                for at, sql, ms, rows in self.recent
+            ]
+            total = self.total.snapshot()
+        return {"total": total, "statements": self.slowest(50), "recent": recent}
+
+
+def _squash(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to its connection's QueryTrace."""
+
+    _entry: Optional[list] = None
+
+    @property
+    def trace(self) -> "QueryTrace":
+        return self.connection.query_trace
+
+    def _done(self):
+        if self._entry is not None:
+            self.trace.finish(self._entry)
+            self._entry = None
+
+    def _fetched(self, t0: float, rows: int):
+        if self._entry is not None:
+            self.trace.add(self._entry, (time.perf_counter() - t0) * 1000, rows)
+
+    def execute(self, sql, parameters=()):
+        self._done()
+        self._entry = self.trace.begin(_squash(sql))
+        t0 = time.perf_counter()
+        super().execute(sql, parameters)
+        self._fetched(t0, max(self.rowcount, 0))
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._done()
+        self._entry = self.trace.begin(_squash(sql))
+        t0 = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._fetched(t0, max(self.rowcount, 0))
+        self._done()
+        return self
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(t0, row is not None)
+        if row is None:
+            self._done()
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(t0, len(rows))
+        if not rows:
+            self._done()
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(t0, len(rows))
+        self._done()
+        return rows
+
+    def __next__(self):
+        t0 = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._done()
+            raise
+        self._fetched(t0, 1)
+        return row
+
+    def close(self):
+        self._done()
+        super().close()
+
+    def __del__(self):
+        # fetchone() callers rarely read to the end; count the statement
+        # when the cursor goes away instead.
+        self._done()
+
+
+class TracedConnection(sqlite3.Connection):
+    """
+    sqlite3.connect(factory=TracedConnection); set `query_trace` before use.
+    Statements run through execute()/executemany() and the commits are
+    timed; conn.set_trace_callback(log.on_trace) adds the rest.
+    """
+
+    query_trace: "QueryTrace"
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def _timed(self, sql: str, fn):
+        log = self.query_trace
+        entry = log.begin(sql)
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            log.add(entry, (time.perf_counter() - t0) * 1000, 0)
+            log.finish(entry)
+
+    def commit(self):
+        if self.in_transaction:
+            self._timed("COMMIT", super().commit)
+        else:
+            super().commit()
+
+    def rollback(self):
+        if self.in_transaction:
+            self._timed("ROLLBACK", super().rollback)
+        else:
+            super().rollback()
+
+
+# ----------------------------------------------------------------------
+# Dump
+# ----------------------------------------------------------------------
+
+def dump(
+    directory: str,
+    keep: int = 10,
+    **sections: object,
+) -> str:
+    """
+    Write one JSON file per session into `directory` (perf-<time>.json),
+    keeping only the newest `keep`. Sections are snapshots by name.
+    """
+    import json  # only needed on the way out
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f"perf-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sections, f, indent=2, ensure_ascii=False)
+
+    old = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("perf-") and name.endswith(".json")
+    )
+    for name in old[:-keep]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    return path
@@ -0,0 +1,515 @@
+"""
+Versioned schema migrations.
+
+The schema version lives in ``PRAGMA user_version``. Every entry in
+MIGRATIONS moves the database one version forward and runs exactly once,
+inside its own transaction, so a crash never leaves a half-applied step.
+"""
+import os
+import sqlite3
+from typing import Callable, List
+
+# Distance between neighbouring sort_order values. Moving a task takes the
+# midpoint of its new neighbours, so a day can absorb ~16 moves into the
+# same slot before it has to be renumbered.
+ORDER_GAP = 1 << 16
+
+
+def _m001_base_schema(conn: sqlite3.Connection):
+    """Tasks table, plus the fix-ups older builds used to run on every launch."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            task_date TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'Not done',
+            total_seconds INTEGER DEFAULT 0,
+            active_timer_start TEXT,
+            sort_order INTEGER DEFAULT 0
+        )
+        """
+    )
+
+    # Eski DB'de sort_order yoksa ekler ve gün içinde sıraları doldurur.
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(tasks)")]
+    if "sort_order" not in cols:
+        conn.execute("ALTER TABLE tasks ADD COLUMN sort_order INTEGER DEFAULT 0")
+        orders = {}
+        updates = []
+        for task_id, task_date in conn.execute(
+            "SELECT id, task_date FROM tasks ORDER BY task_date, id"
+        ):
+            o = orders.get(task_date, 0)
+            updates.append((o, task_id))
+            orders[task_date] = o + 1
+        conn.executemany("UPDATE tasks SET sort_order=? WHERE id=?", updates)
+
+    # Eski Türkçe statüler: Yapılmadı -> Not done, Yapıldı -> Done
+    conn.execute("UPDATE tasks SET status='Not done' WHERE status='Yapılmadı'")
+    conn.execute("UPDATE tasks SET status='Done' WHERE status='Yapıldı'")
+
+
+def _m002_task_indexes(conn: sqlite3.Connection):
+    """Indexes matching the ORDER BY of the day view and the global lists."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_day_order "
+        "ON tasks(task_date, sort_order, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_day "
+        "ON tasks(status, task_date, sort_order, id)"
+    )
+    conn.execute("ANALYZE tasks")
+
+
+def _m003_sparse_sort_order(conn: sqlite3.Connection):
+    """Spread each day's dense 0..n-1 order out to multiples of ORDER_GAP."""
+    conn.executemany(
+        "UPDATE tasks SET sort_order=? WHERE id=?",
+        conn.execute(
+            f"""
+            SELECT (ROW_NUMBER() OVER (
+                        PARTITION BY task_date ORDER BY sort_order, id
+                    ) - 1) * {ORDER_GAP}, id
+            FROM tasks
+            """
+        ).fetchall(),
+    )
+
+
+def _m004_desc_list_index(conn: sqlite3.Connection):
+    """Completed / Overdue are newest-day-first; give them a matching index."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_day_desc "
+        "ON tasks(status, task_date DESC, sort_order, id)"
+    )
+    conn.execute("ANALYZE tasks")
+
+
+def _notes_dir(conn: sqlite3.Connection) -> str:
+    """The app keeps notes/ next to tasks.db."""
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    return os.path.join(os.path.dirname(db_file), "notes") if db_file else ""
+
+
+def _note_files(conn: sqlite3.Connection):
+    """(task_id, path) of every notes/task_<id>.txt whose task still exists."""
+    notes_dir = _notes_dir(conn)
+    if not notes_dir or not os.path.isdir(notes_dir):
+        return []
+    found = {}
+    for name in os.listdir(notes_dir):
+        stem, ext = os.path.splitext(name)
+        if ext == ".txt" and stem.startswith("task_") and stem[5:].isdigit():
+            found[int(stem[5:])] = os.path.join(notes_dir, name)
+    existing = {row[0] for row in conn.execute("SELECT id FROM tasks")}
+    return sorted((tid, path) for tid, path in found.items() if tid in existing)
+
+
+def _m005_search_index(conn: sqlite3.Connection):
+    """FTS5 index over title, description and note text, fed by triggers."""
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description, notes,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    # Title matches weigh most, then description, then notes.
+    conn.execute(
+        "INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')"
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, title, description, notes)
+            VALUES (new.id, new.title, COALESCE(new.description, ''), '');
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_au
+        AFTER UPDATE OF title, description ON tasks BEGIN
+            UPDATE tasks_fts
+            SET title = new.title, description = COALESCE(new.description, '')
+            WHERE rowid = new.id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            DELETE FROM tasks_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    conn.execute(
+        "INSERT INTO tasks_fts(rowid, title, description, notes) "
+        "SELECT id, title, COALESCE(description, ''), '' FROM tasks"
+    )
+
+    for task_id, path in _note_files(conn):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            conn.execute(
+                "UPDATE tasks_fts SET notes=? WHERE rowid=?", (f.read(), task_id)
+            )
+
+
+def _m006_notes_table(conn: sqlite3.Connection):
+    """
+    Notes move from notes/task_<id>.txt files into the database. The files
+    are imported once and left in place; nothing reads them afterwards.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notes (
+            task_id INTEGER PRIMARY KEY,
+            body TEXT NOT NULL
+        )
+        """
+    )
+    # A task's note goes with it.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_notes_ad AFTER DELETE ON tasks BEGIN
+            DELETE FROM notes WHERE task_id = old.id;
+        END
+        """
+    )
+    # The search index follows the notes table from now on.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+            UPDATE tasks_fts SET notes = new.body WHERE rowid = new.task_id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF body ON notes BEGIN
+            UPDATE tasks_fts SET notes = new.body WHERE rowid = new.task_id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+            UPDATE tasks_fts SET notes = '' WHERE rowid = old.task_id;
+        END
+        """
+    )
+
+    for task_id, path in _note_files(conn):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            body = f.read()
+        if body:
+            conn.execute(
+                "INSERT OR REPLACE INTO notes (task_id, body) VALUES (?, ?)",
+                (task_id, body),
+            )
+
+
+# Seconds covered by a time_sessions row (closed sessions only).
+_SESSION_SECONDS = (
+    "CAST(ROUND((julianday({r}.ended_at) - julianday({r}.started_at)) * 86400)"
+    " AS INTEGER)"
+)
+
+
+def backfill_time_sessions(conn: sqlite3.Connection, first_id: int, last_id: int):
+    """
+    Turn total_seconds / active_timer_start of tasks first_id..last_id into
+    time_sessions rows and their daily_time rollup, as if the tracked time
+    had been worked from midnight of the task's day (split into whole days
+    past 24 h). Run with the time_sessions triggers absent or dropped:
+    total_seconds is already right and must not be added to again.
+    """
+    conn.execute(
+        """
+        WITH RECURSIVE chunks(task_id, start, remaining) AS (
+            SELECT id, julianday(task_date), total_seconds FROM tasks
+            WHERE total_seconds > 0 AND id BETWEEN ? AND ?
+            UNION ALL
+            SELECT task_id, start + 1, remaining - 86400 FROM chunks
+            WHERE remaining > 86400
+        )
+        INSERT INTO time_sessions (task_id, started_at, ended_at)
+        SELECT task_id,
+               strftime('%Y-%m-%dT%H:%M:%S', start),
+               strftime('%Y-%m-%dT%H:%M:%S', start + min(remaining, 86400) / 86400.0)
+        FROM chunks
+        """,
+        (first_id, last_id),
+    )
+    conn.execute(
+        """
+        INSERT INTO time_sessions (task_id, started_at, ended_at)
+        SELECT id, active_timer_start, NULL FROM tasks
+        WHERE active_timer_start IS NOT NULL AND id BETWEEN ? AND ?
+        """,
+        (first_id, last_id),
+    )
+    conn.execute(
+        f"""
+        INSERT INTO daily_time (day, task_id, seconds)
+        SELECT date(s.started_at), s.task_id, SUM({_SESSION_SECONDS.format(r="s")})
+        FROM time_sessions s
+        WHERE s.task_id BETWEEN ? AND ? AND s.ended_at IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (day, task_id) DO UPDATE SET seconds = seconds + excluded.seconds
+        """,
+        (first_id, last_id),
+    )
+
+
+def _m007_time_sessions(conn: sqlite3.Connection):
+    """
+    Timer history: one time_sessions row per run of a timer (ended_at NULL
+    while it runs; stop_timer splits runs at midnight so every closed
+    session lies within one day), and daily_time, seconds per (day, task),
+    kept current by triggers. tasks.total_seconds stays as the per-task
+    total the views show and is maintained by the same triggers.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS time_sessions (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_time_sessions_task "
+        "ON time_sessions (task_id, started_at)"
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_time (
+            day TEXT NOT NULL,
+            task_id INTEGER NOT NULL,
+            seconds INTEGER NOT NULL,
+            PRIMARY KEY (day, task_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_daily_time_task ON daily_time (task_id, day)"
+    )
+
+    # Existing totals become sessions before the triggers exist.
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+    backfill_time_sessions(conn, 1, last_id)
+
+    new_secs = _SESSION_SECONDS.format(r="new")
+    old_secs = _SESSION_SECONDS.format(r="old")
+    add_new = f"""
+            INSERT INTO daily_time (day, task_id, seconds)
+            SELECT date(new.started_at), new.task_id, {new_secs}
+            WHERE new.ended_at IS NOT NULL
+            ON CONFLICT (day, task_id) DO UPDATE SET seconds = seconds + excluded.seconds;
+            UPDATE tasks SET total_seconds = COALESCE(total_seconds, 0) + {new_secs}
+            WHERE id = new.task_id AND new.ended_at IS NOT NULL;
+    """
+    remove_old = f"""
+            UPDATE daily_time SET seconds = seconds - {old_secs}
+            WHERE day = date(old.started_at) AND task_id = old.task_id
+              AND old.ended_at IS NOT NULL;
+            DELETE FROM daily_time
+            WHERE day = date(old.started_at) AND task_id = old.task_id AND seconds <= 0;
+            UPDATE tasks SET total_seconds = total_seconds - {old_secs}
+            WHERE id = old.task_id AND old.ended_at IS NOT NULL;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS time_sessions_ai AFTER INSERT ON time_sessions
+        BEGIN {add_new} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS time_sessions_au
+        AFTER UPDATE OF task_id, started_at, ended_at ON time_sessions
+        BEGIN {remove_old} {add_new} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS time_sessions_ad AFTER DELETE ON time_sessions
+        BEGIN {remove_old} END
+        """
+    )
+    # A task's sessions (and so its rollup rows) go with it.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_sessions_ad AFTER DELETE ON tasks BEGIN
+            DELETE FROM time_sessions WHERE task_id = old.id;
+        END
+        """
+    )
+
+
+def _m008_report_index(conn: sqlite3.Connection):
+    """Covering index for reports: a date range scan never touches the table."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_day_time "
+        "ON tasks(task_date, status, total_seconds)"
+    )
+    conn.execute("ANALYZE tasks")
+
+
+# Rows of change_log kept; a reader that fell further behind reloads everything.
+CHANGE_LOG_KEEP = 10_000
+
+
+def _m009_change_log(conn: sqlite3.Connection):
+    """
+    change_log: one row per task written, by any connection or process,
+    with the (task_date, status) it left and the one it landed in, so other
+    windows can refresh just the days and lists a write touched. Triggers
+    fill it and keep the newest CHANGE_LOG_KEEP rows.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL,
+            task_date TEXT,
+            status TEXT
+        )
+        """
+    )
+    log = "INSERT INTO change_log (task_id, task_date, status) VALUES"
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_log_ai AFTER INSERT ON tasks BEGIN
+            {log} (new.id, new.task_date, new.status);
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_log_au AFTER UPDATE ON tasks BEGIN
+            {log} (new.id, new.task_date, new.status);
+            INSERT INTO change_log (task_id, task_date, status)
+            SELECT old.id, old.task_date, old.status
+            WHERE old.task_date IS NOT new.task_date OR old.status IS NOT new.status;
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_log_ad AFTER DELETE ON tasks BEGIN
+            {log} (old.id, old.task_date, old.status);
+        END
+        """
+    )
+    # Trim in steps of 1000 rows rather than one row per insert.
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_trim AFTER INSERT ON change_log
+        WHEN new.id % 1000 = 0 BEGIN
+            DELETE FROM change_log WHERE id <= new.id - {CHANGE_LOG_KEEP};
+        END
+        """
+    )
+
+
+def _m010_recurrences(conn: sqlite3.Connection):
+    """
+    Repeating tasks. A rule is stored once; its occurrences are not rows
+    but computed per viewed range (recurrence.py). recurrence_exceptions
+    lists the days a rule no longer generates: those that became a real
+    task (task_id) and those that were deleted (task_id NULL). Rule writes
+    log a change with no date (= reload everything), exceptions one on
+    their day, so other windows pick them up like task writes.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recurrences (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            freq TEXT NOT NULL,
+            interval INTEGER NOT NULL DEFAULT 1,
+            weekdays INTEGER NOT NULL DEFAULT 0,
+            start_date TEXT NOT NULL,
+            end_date TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recurrence_exceptions (
+            day TEXT NOT NULL,
+            recurrence_id INTEGER NOT NULL,
+            task_id INTEGER,
+            PRIMARY KEY (day, recurrence_id)
+        ) WITHOUT ROWID
+        """
+    )
+    log = "INSERT INTO change_log (task_id, task_date, status) VALUES"
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS recurrences_log_{event[0].lower()}
+            AFTER {event} ON recurrences BEGIN
+                {log} (0, NULL, NULL);
+            END
+            """
+        )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS recurrence_exceptions_log_ai
+        AFTER INSERT ON recurrence_exceptions BEGIN
+            {log} (0, new.day, 'Not done');
+        END
+        """
+    )
+
+
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _m001_base_schema,
+    _m002_task_indexes,
+    _m003_sparse_sort_order,
+    _m004_desc_list_index,
+    _m005_search_index,
+    _m006_notes_table,
+    _m007_time_sessions,
+    _m008_report_index,
+    _m009_change_log,
+    _m010_recurrences,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: int = SCHEMA_VERSION) -> int:
+    """
+    Bring the database up to `target`. Returns the number of steps applied,
+    so an up-to-date database costs a single PRAGMA read.
+    """
+    version = get_version(conn)
+    applied = 0
+    while version < target:
+        step = MIGRATIONS[version]
+        conn.execute("BEGIN")
+        try:
+            step(conn)
+            version += 1
+            conn.execute(f"PRAGMA user_version = {version}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        applied += 1
+    return applied
@@ -1,15 +1,100 @@
-from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple, Union
+
+
+# Day and status strings are shared between tasks: SQLite hands back a new
+# str per row, and a large list repeats a few thousand days and two statuses.
+_shared: Dict[str, str] = {}
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(day: str) -> date:
+    return date.fromisoformat(day)
 
 
-@dataclass
 class Task:
-    id: int
-    title: str
-    description: Optional[str]
-    task_date: date
-    status: str
-    total_seconds: Optional[int]
-    active_timer_start: Optional[str]
-    sort_order: int
+    """
+    One tasks row. Rows come from the database as plain tuples and are
+    built positionally (Task(*row), columns as in database.TASK_COLUMNS);
+    task_date stays the ISO string it is stored as until first read.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "task_day", "status",
+        "total_seconds", "active_timer_start", "sort_order", "_date",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        description: Optional[str],
+        task_date: Union[date, str],
+        status: str,
+        total_seconds: Optional[int],
+        active_timer_start: Optional[str],
+        sort_order: int = 0,
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        if isinstance(task_date, date):
+            self.task_day = task_date.isoformat()
+            self._date: Optional[date] = task_date
+        else:
+            self.task_day = _shared.setdefault(task_date, task_date)  # YYYY-MM-DD
+            self._date = None
+        self.status = _shared.setdefault(status, status)
+        self.total_seconds = total_seconds
+        self.active_timer_start = active_timer_start
+        self.sort_order = sort_order
+
+    @property
+    def task_date(self) -> date:
+        if self._date is None:
+            self._date = _parse_day(self.task_day)
+        return self._date
+
+    def _fields(self) -> tuple:
+        return (
+            self.id, self.title, self.description, self.task_day, self.status,
+            self.total_seconds, self.active_timer_start, self.sort_order,
+        )
+
+    def __eq__(self, other):
+        if other.__class__ is not Task:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Task(id={self.id!r}, title={self.title!r}, "
+            f"description={self.description!r}, task_date={self.task_day!r}, "
+            f"status={self.status!r}, total_seconds={self.total_seconds!r}, "
+            f"active_timer_start={self.active_timer_start!r}, "
+            f"sort_order={self.sort_order!r})"
+        )
+
+
+class DayCounts(NamedTuple):
+    """What the week strip shows for one day."""
+    open: int
+    done: int
+    seconds: int
+
+
+class Changes(NamedTuple):
+    """
+    Task writes committed since the last Database.poll_changes(). `places`
+    holds every (task_date, status) a written task left or landed in.
+    """
+    task_ids: FrozenSet[int]
+    places: FrozenSet[Tuple[str, str]]
+    full: bool = False  # too many to list: reload everything
+
+    @property
+    def days(self) -> FrozenSet[str]:
+        return frozenset(day for day, _ in self.places)
@@ -0,0 +1,211 @@
+"""
+Repeating tasks: rules and the occurrences they expand to.
+
+A rule is one row of `recurrences`. Its occurrences are never stored up
+front; they are computed for just the days a view asks for, a calendar
+month at a time, and come back as Tasks whose (negative) id encodes the
+rule and the day. They go through the same lists and rows as stored
+tasks until something is written to one – done, edited, timed, noted or
+moved – and Database.materialize_occurrence() turns it into a real row.
+"""
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from migrations import ORDER_GAP
+from models import Task
+
+FREQS = ("daily", "weekly", "monthly")
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")  # bit i = WEEKDAYS[i]
+
+# Occurrences sit above the day's own tasks until one is moved.
+OCCURRENCE_ORDER = -ORDER_GAP
+
+# The To-do list shows open occurrences up to this far ahead; a rule
+# without an end would otherwise fill it forever.
+TODO_HORIZON = timedelta(days=365)
+
+_DAY_BITS = 20  # date.toordinal() stays below 2**20 until the year 2870
+
+Month = Tuple[int, int]
+
+
+class Rule(NamedTuple):
+    """One recurrences row."""
+    id: int
+    title: str
+    description: Optional[str]
+    freq: str  # one of FREQS
+    interval: int  # every n days / weeks / months
+    weekdays: int  # weekly: bit mask over WEEKDAYS; 0 = the start's weekday
+    start: date
+    end: Optional[date]  # last day it may fall on; None = no end
+
+    @classmethod
+    def from_row(cls, row) -> "Rule":
+        rule_id, title, desc, freq, interval, weekdays, start, end = row
+        return cls(
+            rule_id, title, desc, freq, interval, weekdays,
+            date.fromisoformat(start), date.fromisoformat(end) if end else None,
+        )
+
+
+RULE_COLUMNS = (
+    "id, title, description, freq, interval, weekdays, start_date, end_date"
+)
+
+
+def weekday_mask(names: Iterable[str]) -> int:
+    """["mon", "fri"] -> bit mask for Rule.weekdays."""
+    mask = 0
+    for name in names:
+        try:
+            mask |= 1 << WEEKDAYS.index(name.strip().lower()[:3])
+        except ValueError:
+            raise ValueError(f"unknown weekday {name!r}") from None
+    return mask
+
+
+# ------------------------------------------------------------
+# Occurrence ids
+# ------------------------------------------------------------
+
+def occurrence_id(rule_id: int, day: date) -> int:
+    return -((rule_id << _DAY_BITS) | day.toordinal())
+
+
+def is_occurrence(task_id: int) -> bool:
+    """True for the id of an occurrence that is not a stored task (yet)."""
+    return task_id < 0
+
+
+def split_occurrence_id(task_id: int) -> Tuple[int, date]:
+    """occurrence id -> (rule id, day)."""
+    n = -task_id
+    return n >> _DAY_BITS, date.fromordinal(n & ((1 << _DAY_BITS) - 1))
+
+
+# ------------------------------------------------------------
+# Expansion
+# ------------------------------------------------------------
+
+def _month_end(year: int, month: int) -> date:
+    if month == 12:
+        return date(year, 12, 31)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+
+def month_of(day: date) -> Month:
+    return day.year, day.month
+
+
+def month_range(month: Month) -> Tuple[date, date]:
+    return date(month[0], month[1], 1), _month_end(*month)
+
+
+def months(first: date, last: date) -> List[Month]:
+    """Calendar months overlapping first..last, in order."""
+    out = []
+    y, m = first.year, first.month
+    while (y, m) <= (last.year, last.month):
+        out.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return out
+
+
+def rule_dates(rule: Rule, first: date, last: date) -> Iterator[date]:
+    """The days in first..last the rule falls on, in order."""
+    first = max(first, rule.start)
+    if rule.end is not None:
+        last = min(last, rule.end)
+    if first > last:
+        return
+    n = max(1, rule.interval)
+
+    if rule.freq == "daily":
+        day = first + timedelta(days=-(first - rule.start).days % n)
+        step = timedelta(days=n)
+        while day <= last:
+            yield day
+            day += step
+
+    elif rule.freq == "weekly":
+        mask = rule.weekdays or 1 << rule.start.weekday()
+        week0 = rule.start - timedelta(days=rule.start.weekday())
+        day, one = first, timedelta(days=1)
+        while day <= last:
+            if mask >> day.weekday() & 1 and (day - week0).days // 7 % n == 0:
+                yield day
+            day += one
+
+    elif rule.freq == "monthly":
+        # The start's day of the month, or the month's last day if shorter.
+        for y, m in months(first, last):
+            if ((y - rule.start.year) * 12 + m - rule.start.month) % n:
+                continue
+            day = min(date(y, m, 1) + timedelta(days=rule.start.day - 1), _month_end(y, m))
+            if first <= day <= last:
+                yield day
+
+
+def occurrence(rule: Rule, day: date) -> Task:
+    return Task(
+        occurrence_id(rule.id, day), rule.title, rule.description, day,
+        "Not done", 0, None, OCCURRENCE_ORDER,
+    )
+
+
+def expand(
+    rules: Iterable[Rule], first: date, last: date, skip: Set[Tuple[str, int]]
+) -> List[Task]:
+    """
+    Occurrences of `rules` on days first..last, in list order (day, then
+    id), leaving out the (day, rule id) pairs in `skip`.
+    """
+    tasks = [
+        occurrence(rule, day)
+        for rule in rules
+        for day in rule_dates(rule, first, last)
+        if (day.isoformat(), rule.id) not in skip
+    ]
+    tasks.sort(key=lambda t: (t.task_day, t.id))
+    return tasks
+
+
+class OccurrenceCache:
+    """
+    The rules, and what they expand to per calendar month, in front of
+    Database. An LRU of months like TaskCache; maxsize 0 keeps nothing,
+    not even the rules (readonly connections never see invalidations).
+    """
+
+    def __init__(self, maxsize: int = 24):
+        self.maxsize = maxsize
+        self.rules: Optional[Dict[int, Rule]] = None
+        self._months: "OrderedDict[Month, List[Task]]" = OrderedDict()
+
+    def set_rules(self, rules: Dict[int, Rule]):
+        if self.maxsize > 0:
+            self.rules = rules
+
+    def get(self, month: Month) -> Optional[List[Task]]:
+        tasks = self._months.get(month)
+        if tasks is not None:
+            self._months.move_to_end(month)
+        return tasks
+
+    def put(self, month: Month, tasks: List[Task]):
+        if self.maxsize <= 0:
+            return
+        self._months[month] = tasks
+        self._months.move_to_end(month)
+        while len(self._months) > self.maxsize:
+            self._months.popitem(last=False)
+
+    def invalidate_day(self, day: str):
+        """An occurrence on `day` (YYYY-MM-DD) was stored or deleted."""
+        self._months.pop((int(day[:4]), int(day[5:7])), None)
+
+    def clear(self):
+        self.rules = None
+        self._months.clear()
@@ -0,0 +1,325 @@
+"""
+Time and completion reports over a date range.
+
+SQLite reduces the tasks in the range to per-day counts (GROUP BY
+task_date over the covering index) and to a count per distinct tracked
+time for the percentiles, so no per-task row reaches Python. Everything
+after that (weeks, months, aging) works on those per-day totals, summed
+into periods with NumPy when it is installed, otherwise with a plain
+loop. Both backends give identical results.
+
+    python reports.py --from 2025-01-01 --to 2025-12-31 --period month
+    python reports.py --json
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+from array import array
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database import Database
+from time_utils import format_duration, get_now
+
+try:
+    import numpy as np
+except ImportError:  # optional; the array backend gives the same numbers
+    np = None
+
+PERIODS = ("day", "week", "month")
+
+# Overdue age buckets, in days late: 1-7, 8-30, 31-90, 91+.
+AGING_EDGES = (7, 30, 90)
+AGING_LABELS = ("1-7 days", "8-30 days", "31-90 days", "over 90 days")
+
+PERCENTILES = (50, 75, 90, 99)
+
+
+@dataclass
+class PeriodRow:
+    label: str
+    seconds: int
+    tasks: int
+    done: int
+
+    @property
+    def completion(self) -> float:
+        return self.done / self.tasks if self.tasks else 0.0
+
+
+@dataclass
+class Report:
+    start: date
+    end: date
+    today: date
+    backend: str
+    tasks: int = 0
+    done: int = 0
+    seconds: int = 0
+    periods: Dict[str, List[PeriodRow]] = field(default_factory=dict)
+    overdue: List[Tuple[str, int]] = field(default_factory=list)
+    tracked_tasks: int = 0
+    time_percentiles: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def completion(self) -> float:
+        return self.done / self.tasks if self.tasks else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        for key in ("start", "end", "today"):
+            data[key] = data[key].isoformat()
+        data["completion"] = round(self.completion, 4)
+        for rows in data["periods"].values():
+            for row in rows:
+                row["completion"] = round(row["done"] / row["tasks"], 4) if row["tasks"] else 0.0
+        return data
+
+
+# ------------------------------------------------------------
+# Columns
+# ------------------------------------------------------------
+
+@dataclass
+class Columns:
+    """Per-day totals of start..end, indexed by day offset."""
+
+    days: int                # length of the range
+    tasks: Sequence[int]     # tasks dated that day
+    done: Sequence[int]      # ... of which done
+    worked: Sequence[int]    # seconds worked that day (daily_time)
+    tracked: int             # tasks in the range with any total_seconds
+
+
+def load_columns(db: Database, start: date, end: date) -> Columns:
+    """
+    One row per day with tasks: the (task_date, status, total_seconds)
+    index is walked in order and grouped by SQLite, so no per-task row
+    reaches Python.
+    """
+    days = (end - start).days + 1
+    tasks = array("q", bytes(8 * days))
+    done = array("q", bytes(8 * days))
+    tracked = 0
+    cur = db.conn.execute(
+        """
+        SELECT CAST(julianday(task_date) - julianday(:start) AS INTEGER),
+               COUNT(*), SUM(status = 'Done'), SUM(total_seconds > 0)
+        FROM tasks WHERE task_date BETWEEN :start AND :end
+        GROUP BY task_date
+        """,
+        {"start": start.isoformat(), "end": end.isoformat()},
+    )
+    for day, n, n_done, n_tracked in cur.fetchall():
+        tasks[day] = n
+        done[day] = n_done
+        tracked += n_tracked
+
+    worked = array("q", bytes(8 * days))
+    for day, secs in db.time_by_day(start, end):
+        worked[(day - start).days] = secs
+    return Columns(days=days, tasks=tasks, done=done, worked=worked, tracked=tracked)
+
+
+def time_percentiles(db: Database, start: date, end: date, tracked: int) -> Dict[str, int]:
+    """
+    Nearest-rank percentiles of total_seconds over the `tracked` tasks
+    with time in start..end, from a count per distinct value.
+    """
+    if not tracked:
+        return {}
+    # Nearest rank: a real task's value.
+    ranks = sorted((max(1, -(-q * tracked // 100)), q) for q in PERCENTILES)
+    cur = db.conn.execute(
+        """
+        SELECT total_seconds, COUNT(*) FROM tasks
+        WHERE task_date BETWEEN ? AND ? AND total_seconds > 0
+        GROUP BY total_seconds
+        ORDER BY total_seconds
+        """,
+        (start.isoformat(), end.isoformat()),
+    )
+    out: Dict[str, int] = {}
+    seen = 0
+    i = 0
+    for secs, n in cur:
+        seen += n
+        while i < len(ranks) and ranks[i][0] <= seen:
+            out[f"p{ranks[i][1]}"] = secs
+            i += 1
+        if i == len(ranks):
+            break
+    return out
+
+
+# ------------------------------------------------------------
+# Backends: summing per-day totals into periods
+# ------------------------------------------------------------
+
+class _NumpyOps:
+    name = "numpy"
+
+    def bincount(self, idx, n: int, weights) -> List[int]:
+        return np.bincount(idx, weights=weights, minlength=n).astype(np.int64).tolist()
+
+
+class _ArrayOps:
+    name = "array"
+
+    def bincount(self, idx, n: int, weights) -> List[int]:
+        out = [0] * n
+        for i, w in zip(idx, weights):
+            out[i] += w
+        return out
+
+
+def _ops(backend: Optional[str]):
+    if backend is None:
+        backend = "numpy" if np is not None else "array"
+    if backend == "numpy":
+        if np is None:
+            raise ValueError("the numpy backend needs NumPy installed")
+        return _NumpyOps()
+    if backend == "array":
+        return _ArrayOps()
+    raise ValueError(f"unknown backend {backend!r}")
+
+
+# ------------------------------------------------------------
+# Report
+# ------------------------------------------------------------
+
+def _period_index(start: date, days: int, period: str) -> Tuple[List[int], List[str]]:
+    """Period number of each day offset, and the label of each period."""
+    index: List[int] = []
+    labels: List[str] = []
+    last = None
+    for i in range(days):
+        d = start + timedelta(days=i)
+        if period == "day":
+            key = d.isoformat()
+        elif period == "week":
+            monday = d - timedelta(days=d.weekday())
+            key = f"week of {monday.isoformat()}"
+        else:
+            key = d.strftime("%Y-%m")
+        if key != last:
+            labels.append(key)
+            last = key
+        index.append(len(labels) - 1)
+    return index, labels
+
+
+def build_report(
+    db: Database,
+    start: date,
+    end: date,
+    today: Optional[date] = None,
+    backend: Optional[str] = None,
+) -> Report:
+    """
+    Figures for tasks dated start..end (inclusive). Tracked time per period
+    is time actually worked on those days (time_sessions rollup); the
+    percentiles are over the total_seconds of tasks with any time at all.
+    """
+    if end < start:
+        raise ValueError("end is before start")
+    today = today or get_now().date()
+    ops = _ops(backend)
+    cols = load_columns(db, start, end)
+
+    report = Report(start=start, end=end, today=today, backend=ops.name)
+
+    per_day_tasks, per_day_done = cols.tasks.tolist(), cols.done.tolist()
+    per_day_worked = cols.worked.tolist()
+    report.tasks = sum(per_day_tasks)
+    report.done = sum(per_day_done)
+    report.seconds = sum(per_day_worked)
+
+    for period in PERIODS:
+        index, labels = _period_index(start, cols.days, period)
+        seconds = ops.bincount(index, len(labels), per_day_worked)
+        tasks = ops.bincount(index, len(labels), per_day_tasks)
+        done = ops.bincount(index, len(labels), per_day_done)
+        report.periods[period] = [
+            PeriodRow(*row) for row in zip(labels, seconds, tasks, done)
+        ]
+
+    # Overdue: open tasks on the days before today, by how late they are.
+    aging = [0] * len(AGING_LABELS)
+    for d in range(min((today - start).days, cols.days)):
+        late = per_day_tasks[d] - per_day_done[d]
+        if late:
+            aging[bisect.bisect_left(AGING_EDGES, (today - start).days - d)] += late
+    report.overdue = list(zip(AGING_LABELS, aging))
+
+    report.tracked_tasks = cols.tracked
+    report.time_percentiles = time_percentiles(db, start, end, cols.tracked)
+    return report
+
+
+def format_report(report: Report, period: str = "week") -> str:
+    lines = [
+        f"{report.start.isoformat()} - {report.end.isoformat()}",
+        f"Tasks: {report.tasks}   done: {report.done} ({report.completion:.0%})",
+        f"Time tracked: {format_duration(report.seconds)}",
+        "",
+        f"{'Per ' + period:<24}{'time':>12}{'tasks':>8}{'done':>8}",
+    ]
+    for row in report.periods[period]:
+        if row.tasks or row.seconds:
+            lines.append(
+                f"{row.label:<24}{format_duration(row.seconds):>12}"
+                f"{row.tasks:>8}{row.completion:>8.0%}"
+            )
+    lines += ["", "Overdue (not done, past their day):"]
+    lines += [f"  {label:<16}{count:>8}" for label, count in report.overdue]
+    lines += ["", f"Time per task ({report.tracked_tasks} tasks with time):"]
+    lines += [
+        f"  {name:<16}{format_duration(secs):>12}"
+        for name, secs in report.time_percentiles.items()
+    ]
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    today = get_now().date()
+    parser = argparse.ArgumentParser(description="Time and completion report.")
+    parser.add_argument(
+        "--db",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks.db"),
+    )
+    parser.add_argument("--from", dest="start", type=date.fromisoformat,
+                        default=today - timedelta(days=364))
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=today)
+    parser.add_argument("--today", type=date.fromisoformat, default=today)
+    parser.add_argument("--period", choices=PERIODS, default="week")
+    parser.add_argument("--backend", choices=("numpy", "array"))
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    try:
+        report = build_report(db, args.start, args.end, args.today, args.backend)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        db.close()
+
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report, args.period))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,574 @@
+"""
+Local HTTP/JSON API over the task database, for editor plugins, dashboards
+and other tools that work beside the GUI.
+
+    python server.py --port 8765 --readers 4
+
+Writes go through one connection on one thread, so they are serialized
+the same way the GUI's DB worker serializes them; reads are spread over a
+small pool of read-only connections (WAL lets them run beside the writer).
+Lists that can be long (global lists, date ranges) are fetched a page at
+a time and streamed with chunked transfer encoding, so the first rows go
+out before the last are read and memory stays flat.
+
+    GET    /tasks?date=YYYY-MM-DD          tasks of a day
+    GET    /tasks?from=...&to=...          tasks of a range (streamed)
+    GET    /tasks/<id>
+    POST   /tasks                          {"title", "description", "date"}
+    PATCH  /tasks/<id>                     {"title", "description", "status"}
+    DELETE /tasks/<id>
+    POST   /tasks/<id>/timer/start | stop
+    POST   /tasks/<id>/move                {"prev": id|null, "next": id|null}
+    PUT    /days/<date>/order              {"ids": [...]}
+    GET    /counts?from=...&to=...         per-day open/done/seconds
+    GET    /lists/todo|overdue|done        global lists (streamed; ?today=)
+    GET    /search?q=...&limit=50
+    GET    /report?from=...&to=...         same as reports.py --json
+
+Records of the global lists and search have no "description" key (the
+lists are read without it); GET /tasks/<id> has it.
+
+Errors answer {"error": ...} with a 4xx/5xx status. Binds to localhost
+only; there is no authentication.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from cli import default_db_path, task_json
+from database import (
+    DEFAULT_PROFILE, PAGE_SIZE, PROFILES, ConnectionProfile, Database, page_cursor,
+    profile_named,
+)
+from task_io import STATUSES
+from time_utils import get_now
+
+MAX_BODY = 1024 * 1024
+RANGE_DAYS = 31  # days per page of a streamed date range
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ------------------------------------------------------------
+# Connections
+# ------------------------------------------------------------
+
+class _Connection:
+    """One Database, opened and used on one thread of its own."""
+
+    def __init__(self, factory: Callable[[], Database], name: str):
+        self._factory = factory
+        self._db: Optional[Database] = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=name)
+
+    def _call(self, fn):
+        if self._db is None:
+            self._db = self._factory()
+        return fn(self._db)
+
+    async def run(self, fn: Callable[[Database], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, fn)
+
+    async def close(self):
+        if self._db is not None:
+            await self.run(lambda db: db.close())
+        self._executor.shutdown()
+
+
+class _ReadPool:
+    """Read-only connections handed out one request (or page) at a time."""
+
+    def __init__(self, connections: List[_Connection]):
+        self.connections = connections
+        self._idle: "asyncio.Queue[_Connection]" = asyncio.Queue()
+        for conn in connections:
+            self._idle.put_nowait(conn)
+
+    async def run(self, fn: Callable[[Database], Any]) -> Any:
+        conn = await self._idle.get()
+        try:
+            return await conn.run(fn)
+        finally:
+            self._idle.put_nowait(conn)
+
+
+# ------------------------------------------------------------
+# Requests
+# ------------------------------------------------------------
+
+class Request:
+    def __init__(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._body = body
+
+    def json(self) -> Dict[str, Any]:
+        if not self._body:
+            return {}
+        try:
+            data = json.loads(self._body)
+        except ValueError:
+            raise HttpError(400, "body is not valid JSON") from None
+        if not isinstance(data, dict):
+            raise HttpError(400, "body must be a JSON object")
+        return data
+
+    def day(self, name: str, default: Optional[date] = None) -> date:
+        value = self.query.get(name)
+        if value is None:
+            if default is None:
+                raise HttpError(400, f"missing ?{name}=YYYY-MM-DD")
+            return default
+        return _parse_day(value, name)
+
+
+def _parse_day(value, name: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{name}: expected YYYY-MM-DD, got {value!r}") from None
+
+
+def _optional_id(data: Dict[str, Any], name: str) -> Optional[int]:
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError
+        return int(value)
+    except ValueError:
+        raise HttpError(400, f"{name}: expected a task id or null, got {value!r}") from None
+
+
+def _task_or_404(db: Database, task_id: int):
+    task = db.get_task(task_id)
+    if task is None:
+        raise HttpError(404, f"no task with id {task_id}")
+    return task
+
+
+# A handler returns (status, JSON-able body) or an async iterator of
+# JSON-able items, which is sent as a chunked JSON array.
+Result = Any
+Handler = Callable[..., Any]
+
+
+class ApiServer:
+    def __init__(
+        self,
+        path: str,
+        profile: ConnectionProfile = PROFILES[DEFAULT_PROFILE],
+        readers: int = 4,
+    ):
+        self.path = path
+        self.profile = profile
+        # The API's writes and the GUI's land on different connections, so
+        # neither may cache tasks: the other side would never invalidate it.
+        self.writer = _Connection(
+            lambda: Database(path, cache_size=0, profile=profile), "api-writer"
+        )
+        self.readers: Optional[_ReadPool] = None
+        self._n_readers = readers if profile.journal_mode == "wal" else 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes: List[Tuple[str, "re.Pattern", Handler]] = []
+        self._add_routes()
+
+    # --------------------------------------------------------
+    # Database access
+    # --------------------------------------------------------
+
+    async def read(self, fn: Callable[[Database], Any]) -> Any:
+        if self.readers is None:
+            return await self.writer.run(fn)
+        return await self.readers.run(fn)
+
+    async def write(self, fn: Callable[[Database], Any]) -> Any:
+        """fn(db) on the writer, inside one transaction."""
+        def job(db: Database):
+            with db.transaction():
+                return fn(db)
+
+        return await self.writer.run(job)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        # The writer creates/migrates the file before any reader opens it.
+        await self.writer.run(lambda db: None)
+        if self._n_readers:
+            path, profile = self.path, self.profile
+            self.readers = _ReadPool([
+                _Connection(
+                    lambda: Database(path, profile=profile, readonly=True),
+                    f"api-reader-{i}",
+                )
+                for i in range(self._n_readers)
+            ])
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.readers is not None:
+            for conn in self.readers.connections:
+                await conn.close()
+        await self.writer.close()
+
+    # --------------------------------------------------------
+    # HTTP
+    # --------------------------------------------------------
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request, keep_alive = await self._read_request(reader)
+                except HttpError as exc:
+                    self._send(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                await self._respond(request, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.strip():
+            return None, False
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            return None, False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HttpError(400, "bad Content-Length") from None
+        if length > MAX_BODY:
+            raise HttpError(413, f"request body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return Request(method.upper(), target, body), keep_alive
+
+    async def _respond(self, request: Request, writer: asyncio.StreamWriter, keep_alive: bool):
+        try:
+            result = await self._dispatch(request)
+        except HttpError as exc:
+            result = (exc.status, {"error": str(exc)})
+        except Exception as exc:
+            traceback.print_exc(file=sys.stderr)
+            result = (500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        if isinstance(result, tuple):
+            self._send(writer, *result, keep_alive=keep_alive)
+            await writer.drain()
+            return
+
+        writer.write(_head(200, "Transfer-Encoding: chunked", keep_alive))
+        sep = "["
+        try:
+            async for items in result:
+                if not items:
+                    continue
+                text = sep + ",".join(json.dumps(i, ensure_ascii=False) for i in items)
+                sep = ","
+                _write_chunk(writer, text.encode())
+                await writer.drain()
+        except Exception:
+            # Headers are out already: cut the stream short, so the client
+            # sees a broken body rather than a valid partial list.
+            traceback.print_exc(file=sys.stderr)
+            writer.close()
+            raise ConnectionError("stream aborted") from None
+        _write_chunk(writer, b"[]" if sep == "[" else b"]")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, status: int, body, keep_alive: bool):
+        data = json.dumps(body, ensure_ascii=False).encode()
+        writer.write(_head(status, f"Content-Length: {len(data)}", keep_alive) + data)
+
+    async def _dispatch(self, request: Request) -> Result:
+        allowed = False
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed = True
+                continue
+            return await handler(request, *match.groups())
+        if allowed:
+            raise HttpError(405, f"{request.method} not allowed on {request.path}")
+        raise HttpError(404, f"no route for {request.path}")
+
+    def _add_routes(self):
+        task = r"/tasks/(-?\d+)"  # negative: a repeat not stored yet
+        for method, path, handler in (
+            ("GET", r"/tasks", self.list_tasks),
+            ("POST", r"/tasks", self.add_task),
+            ("GET", task, self.get_task),
+            ("PATCH", task, self.update_task),
+            ("DELETE", task, self.delete_task),
+            ("POST", task + r"/timer/(start|stop)", self.timer),
+            ("POST", task + r"/move", self.move_task),
+            ("PUT", r"/days/([0-9-]+)/order", self.reorder_day),
+            ("GET", r"/counts", self.day_counts),
+            ("GET", r"/lists/(todo|overdue|done)", self.global_list),
+            ("GET", r"/search", self.search),
+            ("GET", r"/report", self.report),
+        ):
+            self._routes.append((method, re.compile(path), handler))
+
+    # --------------------------------------------------------
+    # Handlers
+    # --------------------------------------------------------
+
+    async def list_tasks(self, request: Request) -> Result:
+        if "from" in request.query or "to" in request.query:
+            start, end = request.day("from"), request.day("to")
+            if start > end:
+                raise HttpError(400, "from is after to")
+            return self._stream_range(start, end)
+        day = request.day("date", get_now().date())
+        tasks = await self.read(lambda db: db.get_tasks_by_date(day))
+        return 200, [task_json(t) for t in tasks]
+
+    async def _stream_range(self, start: date, end: date) -> AsyncIterator[list]:
+        while start <= end:
+            stop = min(end, start + timedelta(days=RANGE_DAYS - 1))
+            tasks = await self.read(lambda db, a=start, b=stop: db.get_tasks_between(a, b))
+            yield [task_json(t) for t in tasks]
+            start = stop + timedelta(days=1)
+
+    async def get_task(self, request: Request, task_id: str) -> Result:
+        task = await self.read(lambda db: _task_or_404(db, int(task_id)))
+        return 200, task_json(task)
+
+    async def add_task(self, request: Request) -> Result:
+        data = request.json()
+        title = str(data.get("title") or "").strip()
+        if not title:
+            raise HttpError(400, "title is required")
+        desc = str(data.get("description") or "")
+        day = _parse_day(data["date"], "date") if data.get("date") else get_now().date()
+
+        def add(db: Database):
+            return db.get_task(db.add_task(title, desc, day))
+
+        return 201, task_json(await self.write(add))
+
+    async def update_task(self, request: Request, task_id: str) -> Result:
+        data, task_id = request.json(), int(task_id)
+        status = data.get("status")
+        if status is not None and status not in STATUSES:
+            raise HttpError(400, f"status must be one of {', '.join(STATUSES)}")
+
+        def update(db: Database):
+            task = _task_or_404(db, task_id)
+            if "title" in data or "description" in data:
+                db.update_task_title_desc(
+                    task_id,
+                    str(data.get("title", task.title)),
+                    str(data.get("description", task.description) or ""),
+                )
+            if status is not None and status != task.status:
+                db.set_task_status(task_id, status)
+            return db.get_task(task_id)
+
+        return 200, task_json(await self.write(update))
+
+    async def delete_task(self, request: Request, task_id: str) -> Result:
+        def delete(db: Database):
+            _task_or_404(db, int(task_id))
+            db.delete_task(int(task_id))
+
+        await self.write(delete)
+        return 200, {"deleted": int(task_id)}
+
+    async def timer(self, request: Request, task_id: str, action: str) -> Result:
+        task_id = int(task_id)
+
+        def run(db: Database):
+            _task_or_404(db, task_id)
+            now = get_now()
+            if action == "start":
+                extra = {"started": db.start_timer(task_id, now)}
+            else:
+                extra = {"added_seconds": db.stop_timer(task_id, now)}
+            return dict(task_json(db.get_task(task_id)), **extra)
+
+        return 200, await self.write(run)
+
+    async def move_task(self, request: Request, task_id: str) -> Result:
+        data, task_id = request.json(), int(task_id)
+        prev_id, next_id = _optional_id(data, "prev"), _optional_id(data, "next")
+        if task_id in (prev_id, next_id):
+            raise HttpError(400, "prev/next cannot be the task itself")
+        if prev_id is not None and prev_id == next_id:
+            raise HttpError(400, "prev and next are the same task")
+
+        def move(db: Database):
+            task = _task_or_404(db, task_id)
+            for other in (prev_id, next_id):
+                if other is not None and _task_or_404(db, other).task_day != task.task_day:
+                    raise HttpError(400, "prev/next must be tasks of the same day")
+            try:
+                if db.move_task(task_id, prev_id, next_id):
+                    db.rebalance_day(task.task_date)
+            except ValueError as exc:  # prev sorts after next
+                raise HttpError(400, str(exc)) from None
+            return db.get_task(task_id)
+
+        return 200, task_json(await self.write(move))
+
+    async def reorder_day(self, request: Request, day: str) -> Result:
+        day = _parse_day(day, "day")
+        ids = request.json().get("ids")
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            raise HttpError(400, "ids must be a list of task ids")
+        changed = await self.write(lambda db: db.reorder_tasks(day, ids))
+        return 200, {"changed": changed}
+
+    async def day_counts(self, request: Request) -> Result:
+        start, end = request.day("from"), request.day("to")
+        counts = await self.read(lambda db: db.get_day_counts(start, end))
+        return 200, {d.isoformat(): c._asdict() for d, c in counts.items()}
+
+    async def global_list(self, request: Request, name: str) -> Result:
+        today = request.day("today", get_now().date())
+        if name == "todo":
+            page = lambda db, after: db.get_upcoming_todos_page(today, after=after)
+        elif name == "overdue":
+            page = lambda db, after: db.get_overdue_tasks_page(today, after=after)
+        else:
+            page = lambda db, after: db.get_completed_tasks_page(after=after)
+        return self._stream_pages(page)
+
+    async def _stream_pages(self, page) -> AsyncIterator[list]:
+        # Keyset pages: each one starts after the last row sent, so a pool
+        # connection is held for one page at a time, not the whole list.
+        after = None
+        while True:
+            tasks = await self.read(lambda db, c=after: page(db, c))
+            yield [task_json(t, description=False) for t in tasks]
+            if len(tasks) < PAGE_SIZE:
+                return
+            after = page_cursor(tasks[-1])
+
+    async def search(self, request: Request) -> Result:
+        text = request.query.get("q", "")
+        try:
+            limit = int(request.query.get("limit", 50))
+        except ValueError:
+            raise HttpError(400, "limit must be a number") from None
+        tasks = await self.read(lambda db: db.search(text, limit))
+        return 200, [task_json(t, description=False) for t in tasks]
+
+    async def report(self, request: Request) -> Result:
+        from reports import build_report
+
+        today = get_now().date()
+        start = request.day("from", today - timedelta(days=364))
+        end = request.day("to", today)
+        day = request.day("today", today)
+
+        def run(db: Database):
+            try:
+                return build_report(db, start, end, day).to_dict()
+            except ValueError as exc:
+                raise HttpError(400, str(exc)) from None
+
+        return 200, await self.read(run)
+
+
+def _head(status: int, length: str, keep_alive: bool) -> bytes:
+    return (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"{length}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode()
+
+
+def _write_chunk(writer: asyncio.StreamWriter, data: bytes):
+    writer.write(b"%X\r\n%s\r\n" % (len(data), data))
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+
+async def serve(args, profile: ConnectionProfile) -> None:
+    api = ApiServer(args.db or default_db_path(), profile, args.readers)
+    server = await api.start(args.host, args.port)
+    port = server.sockets[0].getsockname()[1]
+    print(f"serving {api.path} on http://{args.host}:{port}", file=sys.stderr, flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await api.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API for the planner.")
+    parser.add_argument("--db", default=None, help="database file (default: PLANNER_DB or ./tasks.db)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--readers", type=int, default=4, help="read-only connections")
+    args = parser.parse_args(argv)
+    try:
+        profile = profile_named(os.environ.get("PLANNER_DB_PROFILE"))
+    except ValueError as exc:
+        parser.error(str(exc))
+    try:
+        asyncio.run(serve(args, profile))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from models import Task
+
+Key = Tuple[Hashable, ...]
+
+DAY = "day"
+TODO = "todo"          # key[1] is the 'today' the list was computed for
+OVERDUE = "overdue"    # key[1] is the 'today' the list was computed for
+DONE = "done"
+
+
+class TaskCache:
+    """
+    Bounded LRU of query results (lists of Task) in front of Database.
+
+    Keys start with a kind: (DAY, day), (TODO, today, ...), (OVERDUE,
+    today, ...) or (DONE, ...). Every cached task id is indexed back to
+    the keys holding it, so an edit to one task drops only those entries.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._data: "OrderedDict[Key, List[Task]]" = OrderedDict()
+        self._keys_by_task: Dict[int, Set[Key]] = defaultdict(set)
+
+    # ------------------------------------------------------------------
+    def get(self, key: Key) -> Optional[List[Task]]:
+        tasks = self._data.get(key)
+        if tasks is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return list(tasks)
+
+    def put(self, key: Key, tasks: List[Task]):
+        if self.maxsize <= 0:
+            return
+        self.invalidate(key)
+        self._data[key] = list(tasks)
+        for task in tasks:
+            self._keys_by_task[task.id].add(key)
+        while len(self._data) > self.maxsize:
+            self.invalidate(next(iter(self._data)))
+
+    # ------------------------------------------------------------------
+    def invalidate(self, key: Key):
+        tasks = self._data.pop(key, None)
+        if tasks is None:
+            return
+        for task in tasks:
+            keys = self._keys_by_task.get(task.id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_task[task.id]
+
+    def invalidate_task(self, task_id: int):
+        """Entries showing this task (its content changed or it is gone)."""
+        for key in list(self._keys_by_task.get(task_id, ())):
+            self.invalidate(key)
+
+    def invalidate_membership(self, day: str, status: str):
+        """
+        Entries a task with this date and status belongs in (it was added,
+        re-ordered, or its status changed): its day, and the global lists
+        whose filter it passes.
+        """
+        self.invalidate((DAY, day))
+        for key in list(self._data):
+            kind = key[0]
+            if status == "Done":
+                hit = kind == DONE
+            elif kind == TODO:
+                hit = day >= key[1]
+            elif kind == OVERDUE:
+                hit = day < key[1]
+            else:
+                hit = False
+            if hit:
+                self.invalidate(key)
+
+    def clear(self):
+        self._data.clear()
+        self._keys_by_task.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,324 @@
+"""
+Bulk import/export of tasks as CSV or JSON Lines.
+
+Both directions stream: export iterates one cursor and writes rows as
+they come, import reads records lazily and stores them in batches of
+`BATCH` rows per transaction, so memory stays flat however large the
+file is.
+
+    python task_io.py export tasks.csv
+    python task_io.py import other_tracker.jsonl --db tasks.db
+
+"-" reads stdin / writes stdout (give --format then).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database import Database
+from migrations import ORDER_GAP, backfill_time_sessions
+
+FIELDS = (
+    "id",
+    "title",
+    "description",
+    "task_date",
+    "status",
+    "total_seconds",
+    "active_timer_start",
+    "sort_order",
+    "notes",
+)
+STATUSES = ("Not done", "Done")
+BATCH = 5_000
+
+# Day names per lookup: stays under SQLite's host-parameter limit.
+_IN_CHUNK = 500
+
+Record = Dict[str, object]
+Row = Tuple[int, str, Optional[str], str, str, int, Optional[str], int]
+
+
+# ------------------------------------------------------------
+# Readers / writers
+# ------------------------------------------------------------
+
+def read_csv(f: IO[str]) -> Iterator[Record]:
+    # Notes can be far longer than csv's default 128 KiB field limit.
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    yield from csv.DictReader(f)
+
+
+def read_jsonl(f: IO[str]) -> Iterator[Record]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_no}: {exc}") from None
+
+
+def write_csv(records: Iterable[Record], f: IO[str]) -> int:
+    writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for count, record in enumerate(records, 1):
+        writer.writerow(record)
+    return count
+
+
+def write_jsonl(records: Iterable[Record], f: IO[str]) -> int:
+    count = 0
+    for count, record in enumerate(records, 1):
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+    return count
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+
+def format_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"cannot tell the format of {path!r}; pass --format")
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+
+def iter_tasks(db: Database) -> Iterator[Record]:
+    """
+    Every task (with its note) in day order. The cursor is consumed row by
+    row, so only SQLite's page cache holds data, not a result list.
+    """
+    cur = db.conn.execute(
+        """
+        SELECT t.id, t.title, t.description, t.task_date, t.status,
+               t.total_seconds, t.active_timer_start, t.sort_order,
+               n.body
+        FROM tasks t LEFT JOIN notes n ON n.task_id = t.id
+        ORDER BY t.task_date, t.sort_order, t.id
+        """
+    )
+    for row in cur:
+        yield dict(zip(FIELDS, tuple(row)))
+
+
+def export_tasks(db: Database, f: IO[str], fmt: str) -> int:
+    """Write every task to `f`; returns the number of tasks written."""
+    return WRITERS[fmt](iter_tasks(db), f)
+
+
+# ------------------------------------------------------------
+# Import
+# ------------------------------------------------------------
+
+def _clean(record: Record, n: int) -> Tuple[str, Optional[str], str, str, int, Optional[str], str]:
+    """Validate one record; (title, desc, day, status, seconds, timer, note)."""
+    title = (record.get("title") or "").strip()
+    if not title:
+        raise ValueError(f"record {n}: title is required")
+
+    day = (record.get("task_date") or "").strip()
+    try:
+        day = date.fromisoformat(day).isoformat()
+    except ValueError:
+        raise ValueError(f"record {n}: bad task_date {day!r}") from None
+
+    status = record.get("status") or "Not done"
+    if status not in STATUSES:
+        raise ValueError(f"record {n}: bad status {status!r}")
+
+    try:
+        seconds = int(record.get("total_seconds") or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"record {n}: bad total_seconds") from None
+
+    return (
+        title,
+        record.get("description") or "",
+        day,
+        status,
+        seconds,
+        record.get("active_timer_start") or None,
+        record.get("notes") or "",
+    )
+
+
+def _last_orders(db: Database, days: List[str]) -> Dict[str, int]:
+    """Current MAX(sort_order) of each day, one grouped query per chunk."""
+    found: Dict[str, int] = {}
+    for i in range(0, len(days), _IN_CHUNK):
+        chunk = days[i : i + _IN_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        found.update(
+            db.conn.execute(
+                f"SELECT task_date, MAX(sort_order) FROM tasks "
+                f"WHERE task_date IN ({marks}) GROUP BY task_date",
+                chunk,
+            ).fetchall()
+        )
+    return found
+
+
+@contextmanager
+def _triggers_off(db: Database, names: Tuple[str, ...]):
+    """
+    Drop the given triggers for the length of the block and put them back.
+    Run inside a transaction, no other connection ever sees them missing.
+    """
+    marks = ",".join("?" * len(names))
+    saved = db.conn.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type='trigger' AND name IN ({marks})",
+        names,
+    ).fetchall()
+    for name, _ in saved:
+        db.conn.execute(f"DROP TRIGGER {name}")
+    try:
+        yield
+    finally:
+        for _, sql in saved:
+            db.conn.execute(sql)
+
+
+def import_tasks(db: Database, records: Iterable[Record], batch: int = BATCH) -> int:
+    """
+    Append records as new tasks; returns how many were stored.
+
+    Ids in the input are ignored. Within a day, imported tasks go after the
+    existing ones in input order, one ORDER_GAP apart. Each batch is one
+    transaction, so a bad record stops the import after the last complete
+    batch.
+    """
+    next_order: Dict[str, int] = {}
+    records = iter(records)
+    done = 0
+
+    while True:
+        chunk = [_clean(r, done + i) for i, r in enumerate(islice(records, batch), 1)]
+        if not chunk:
+            break
+
+        # savepoint() opens the transaction up front: the trigger DDL below
+        # must not run (and commit) on its own.
+        with db.savepoint("import_batch"):
+            new_days = sorted({c[2] for c in chunk} - next_order.keys())
+            last = _last_orders(db, new_days)
+            for day in new_days:
+                next_order[day] = last.get(day, -ORDER_GAP) + ORDER_GAP
+
+            # Ids are handed out here so notes can refer to them without a
+            # round trip per row.
+            next_id = db.conn.execute(
+                "SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence "
+                "WHERE name='tasks'), 0), COALESCE(MAX(id), 0)) + 1 FROM tasks"
+            ).fetchone()[0]
+
+            rows: List[Row] = []
+            notes: List[Tuple[int, str]] = []
+            for offset, (title, desc, day, status, seconds, timer, note) in enumerate(chunk):
+                task_id = next_id + offset
+                rows.append(
+                    (task_id, title, desc, day, status, seconds, timer, next_order[day])
+                )
+                next_order[day] += ORDER_GAP
+                if note:
+                    notes.append((task_id, note))
+
+            # The search-index triggers cost more than the inserts when fired
+            # row by row; the batch is indexed with one INSERT ... SELECT.
+            # Tracked time arrives as total_seconds and becomes sessions the
+            # same way (their trigger would count it a second time).
+            last_id = next_id + len(rows) - 1
+            triggers = ("tasks_fts_ai", "notes_fts_ai", "time_sessions_ai")
+            with _triggers_off(db, triggers):
+                db.conn.executemany(
+                    """
+                    INSERT INTO tasks (id, title, description, task_date, status,
+                                       total_seconds, active_timer_start, sort_order)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                db.conn.executemany(
+                    "INSERT INTO notes (task_id, body) VALUES (?, ?)", notes
+                )
+                db.conn.execute(
+                    """
+                    INSERT INTO tasks_fts (rowid, title, description, notes)
+                    SELECT t.id, t.title, COALESCE(t.description, ''),
+                           COALESCE(n.body, '')
+                    FROM tasks t LEFT JOIN notes n ON n.task_id = t.id
+                    WHERE t.id BETWEEN ? AND ?
+                    """,
+                    (next_id, last_id),
+                )
+                backfill_time_sessions(db.conn, next_id, last_id)
+        done += len(chunk)
+
+    # Far too many entries change to invalidate them one by one.
+    db.cache.clear()
+    return done
+
+
+# ------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import or export planner tasks.")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("file", help='CSV/JSONL file, or "-" for stdin/stdout')
+    parser.add_argument(
+        "--db",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks.db"),
+    )
+    parser.add_argument("--format", choices=sorted(READERS))
+    parser.add_argument("--batch", type=int, default=BATCH)
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or format_for(args.file)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    db = Database(args.db)
+    try:
+        if args.action == "export":
+            if args.file == "-":
+                count = export_tasks(db, sys.stdout, fmt)
+            else:
+                with open(args.file, "w", encoding="utf-8", newline="") as f:
+                    count = export_tasks(db, f, fmt)
+            print(f"Exported {count} tasks.", file=sys.stderr)
+        else:
+            if args.file == "-":
+                count = import_tasks(db, READERS[fmt](sys.stdin), args.batch)
+            else:
+                with open(args.file, "r", encoding="utf-8", newline="") as f:
+                    count = import_tasks(db, READERS[fmt](f), args.batch)
+            print(f"Imported {count} tasks.", file=sys.stderr)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""cli.py error reporting: every failure is one JSON error, exit status 1."""
+import io
+import json
+import sqlite3
+
+import cli
+from database import Database
+
+
+def _run(capsys, *argv):
+    status = cli.main(list(argv))
+    return status, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_unknown_profile(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("PLANNER_DB_PROFILE", "bogus")
+    status, out = _run(capsys, "--db", str(tmp_path / "t.db"), "list")
+    assert status == 1
+    assert "bogus" in out[0]["error"]
+
+
+def test_unopenable_database(tmp_path, capsys):
+    status, out = _run(capsys, "--db", str(tmp_path / "missing" / "t.db"), "list")
+    assert status == 1
+    assert out[0]["error"].startswith("database:")
+
+
+def test_database_error(tmp_path, capsys, monkeypatch):
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(Database, "add_task", locked)
+    status, out = _run(capsys, "--db", str(tmp_path / "t.db"), "add", "x")
+    assert status == 1
+    assert out == [{"error": "database: database is locked"}]
+
+
+def test_batch_goes_on_after_a_database_error(tmp_path, capsys, monkeypatch):
+    real = Database.set_task_status
+
+    def locked(*args, **kwargs):
+        real(*args, **kwargs)
+        raise sqlite3.OperationalError("database is locked")
+
+    db_path = str(tmp_path / "t.db")
+    _run(capsys, "--db", db_path, "add", "x", "--date", "2025-06-02")
+    monkeypatch.setattr(Database, "set_task_status", locked)
+    monkeypatch.setattr("sys.stdin", io.StringIO("done 1\nlist --date 2025-06-02\n"))
+    status, out = _run(capsys, "--db", db_path, "batch")
+
+    assert status == 1
+    assert out[0] == {"error": "database: database is locked"}
+    # The failed command was rolled back; the next one still ran.
+    assert [t["status"] for t in out[1]] == ["Not done"]
@@ -0,0 +1,78 @@
+"""The UI's DB worker next to another connection writing the same file."""
+import queue
+import threading
+from datetime import date
+
+from app.db_worker import _Worker
+from database import PROFILES, Database
+
+DAY = date(2025, 6, 2)
+WAL = PROFILES["wal"]
+
+
+def _run(path: str, jobs):
+    """Run `jobs` (fn, writes) as one worker batch; their outcomes in order."""
+    results: "queue.Queue" = queue.Queue()
+    go = threading.Event()
+    worker = _Worker("test-db-worker", lambda: Database(path, profile=WAL), results, wait_for=go)
+    for fn, writes in jobs:
+        worker.jobs.put((fn, None, None, writes))
+    go.set()  # all queued before the worker starts: one batch
+    try:
+        return [results.get(timeout=20) for _ in jobs]
+    finally:
+        worker.stop()
+
+
+def test_batch_that_reads_first_survives_a_commit_by_another_connection(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    Database(path, profile=WAL).close()
+    other = {"done": threading.Event(), "error": None}
+
+    def other_writer():
+        # cli.py / server.py / another window: its own connection.
+        db = Database(path, cache_size=0, profile=WAL)
+        try:
+            db.add_task("from cli", "", DAY)
+        except Exception as exc:
+            other["error"] = exc
+        finally:
+            db.close()
+            other["done"].set()
+
+    def read_then_let_the_other_write(db):
+        tasks = db.get_tasks_by_date(DAY)
+        threading.Thread(target=other_writer).start()
+        # Holding the write lock, the other connection waits for our commit.
+        other["done"].wait(0.5)
+        return len(tasks)
+
+    outcomes = _run(path, [
+        (read_then_let_the_other_write, True),
+        (lambda db: db.add_task("from app", "", DAY), True),
+    ])
+
+    assert [exc for _, _, exc, _ in outcomes] == [None, None]
+    assert other["done"].wait(20) and other["error"] is None
+    db = Database(path, cache_size=0, profile=WAL)
+    try:
+        assert sorted(t.title for t in db.get_tasks_by_date(DAY)) == ["from app", "from cli"]
+    finally:
+        db.close()
+
+
+def test_read_only_batch_takes_no_write_lock(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    Database(path, profile=WAL).close()
+
+    def read_while_another_writes(db):
+        db.get_tasks_by_date(DAY)
+        other = Database(path, cache_size=0, profile=WAL)
+        other.conn.execute("PRAGMA busy_timeout = 0")
+        try:
+            return other.add_task("from cli", "", DAY)  # no waiting needed
+        finally:
+            other.close()
+
+    (_, result, exc, _), = _run(path, [(read_while_another_writes, False)])
+    assert exc is None and result
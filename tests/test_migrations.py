@@ -0,0 +1,125 @@
+"""migrations.py run over a database written by the first release."""
+import os
+import sqlite3
+from datetime import date
+
+from database import Database
+from migrations import MIGRATIONS, SCHEMA_VERSION, get_version, migrate
+
+# The tasks table as the first release created it: no sort_order yet,
+# statuses still in Turkish, notes in notes/task_<id>.txt.
+BASELINE_SCHEMA = """
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        task_date TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'Yapılmadı',
+        total_seconds INTEGER DEFAULT 0,
+        active_timer_start TEXT
+    )
+"""
+BASELINE_ROWS = [
+    # title, description, task_date, status, total_seconds, active_timer_start
+    ("Write report", "quarterly numbers", "2024-03-04", "Yapıldı", 5400, None),
+    ("Call bank", None, "2024-03-04", "Yapılmadı", 0, None),
+    ("Gym", "", "2024-03-05", "Yapılmadı", 90000, "2024-03-05T08:00:00"),
+    ("Read paper", "on indexing", "2024-03-04", "Done", 600, None),
+]
+
+
+def _baseline_db(tmp_path) -> str:
+    path = str(tmp_path / "tasks.db")
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO tasks (title, description, task_date, status, total_seconds, "
+        "active_timer_start) VALUES (?, ?, ?, ?, ?, ?)",
+        BASELINE_ROWS,
+    )
+    conn.commit()
+    conn.close()
+
+    os.mkdir(tmp_path / "notes")
+    (tmp_path / "notes" / "task_1.txt").write_text("ask finance for the Q1 sheet", encoding="utf-8")
+    (tmp_path / "notes" / "task_99.txt").write_text("task is gone", encoding="utf-8")
+    return path
+
+
+def _pairs(db: Database, sql: str):
+    return {row[0]: row[1] for row in db.conn.execute(sql)}
+
+
+def test_baseline_database_is_migrated(tmp_path):
+    db = Database(_baseline_db(tmp_path))
+    try:
+        assert get_version(db.conn) == SCHEMA_VERSION == len(MIGRATIONS)
+
+        # Statuses in English; each day ordered as the tasks were added.
+        day = db.get_tasks_by_date(date(2024, 3, 4))
+        assert [(t.id, t.status) for t in day] == [(1, "Done"), (2, "Not done"), (4, "Done")]
+        orders = [t.sort_order for t in day]
+        assert orders == sorted(set(orders))
+
+        assert _pairs(db, "SELECT id, total_seconds FROM tasks") == {
+            1: 5400, 2: 0, 3: 90000, 4: 600,
+        }
+        assert _pairs(db, "SELECT id, active_timer_start FROM tasks WHERE id = 3") == {
+            3: "2024-03-05T08:00:00",
+        }
+
+        # Notes of existing tasks are imported and searchable; files stay.
+        assert db.get_note(1) == "ask finance for the Q1 sheet"
+        assert db.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 1
+        assert [t.id for t in db.search("finance")] == [1]
+        assert [t.id for t in db.search("indexing")] == [4]
+        assert (tmp_path / "notes" / "task_1.txt").exists()
+
+        # Tracked time became sessions: the 25 h of task 3 are split into
+        # whole days, and its running timer is an open session.
+        assert _pairs(db, "SELECT task_id, SUM(seconds) FROM daily_time GROUP BY task_id") == {
+            1: 5400, 3: 90000, 4: 600,
+        }
+        assert [tuple(r) for r in db.conn.execute(
+            "SELECT day, seconds FROM daily_time WHERE task_id = 3 ORDER BY day"
+        )] == [("2024-03-05", 86400), ("2024-03-06", 3600)]
+        assert ("2024-03-05T08:00:00", None) in db.get_sessions(3)
+        indexes = {row[0] for row in db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+        )}
+        assert {"idx_tasks_day_order", "idx_tasks_status_day"} <= indexes
+    finally:
+        db.close()
+
+
+def test_migrate_runs_each_step_once(tmp_path):
+    conn = sqlite3.connect(_baseline_db(tmp_path))
+    try:
+        assert migrate(conn, target=1) == 1
+        assert get_version(conn) == 1
+        assert migrate(conn) == SCHEMA_VERSION - 1
+        assert migrate(conn) == 0
+        assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == len(BASELINE_ROWS)
+    finally:
+        conn.close()
+
+
+def test_failed_step_is_rolled_back(tmp_path):
+    conn = sqlite3.connect(_baseline_db(tmp_path))
+    try:
+        migrate(conn, target=1)
+        # Step 2 creates idx_tasks_day_order, then fails on this name.
+        conn.execute("CREATE TABLE idx_tasks_status_day (x)")
+        conn.commit()
+        try:
+            migrate(conn)
+        except sqlite3.Error:
+            pass
+        else:
+            raise AssertionError("step 2 should have failed")
+        assert get_version(conn) == 1
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_tasks_day_order'"
+        ).fetchone()[0] == 0
+    finally:
+        conn.close()
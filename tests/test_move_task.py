@@ -0,0 +1,48 @@
+"""Database.move_task: one row written, bad neighbours refused."""
+from datetime import date
+
+import pytest
+
+from database import Database
+from migrations import ORDER_GAP
+
+DAY = date(2025, 6, 2)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "tasks.db"))
+    yield db
+    db.close()
+
+
+def _order(db: Database):
+    return [t.id for t in db.get_tasks_by_date(DAY)]
+
+
+def test_move_between_neighbours(db):
+    a, b, c = (db.add_task(t, "", DAY) for t in "abc")
+    assert not db.move_task(c, a, b)
+    assert _order(db) == [a, c, b]
+    assert db.get_task(c).sort_order == ORDER_GAP // 2
+    db.move_task(a, None, c)
+    db.move_task(b, None, a)
+    assert _order(db) == [b, a, c]
+
+
+def test_full_slot_rebalances_the_day(db):
+    a, b, c = (db.add_task(t, "", DAY) for t in "abc")
+    db.set_task_order(b, 1)  # no room between a (0) and b
+    db.move_task(c, a, b)
+    assert _order(db) == [a, c, b]
+    orders = [t.sort_order for t in db.get_tasks_by_date(DAY)]
+    assert orders[1] - orders[0] >= 2 and orders[2] - orders[1] >= 2
+
+
+@pytest.mark.parametrize("prev, nxt", [("b", "a"), ("a", "a"), ("c", "b"), ("a", "c")])
+def test_bad_neighbours_are_refused(db, prev, nxt):
+    ids = dict(zip("abc", (db.add_task(t, "", DAY) for t in "abc")))
+    before = [(t.id, t.sort_order) for t in db.get_tasks_by_date(DAY)]
+    with pytest.raises(ValueError):
+        db.move_task(ids["c"], ids[prev], ids[nxt])
+    assert [(t.id, t.sort_order) for t in db.get_tasks_by_date(DAY)] == before
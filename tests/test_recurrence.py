@@ -0,0 +1,96 @@
+"""Repeating tasks: rule expansion, exceptions and materialization."""
+from datetime import date, datetime
+
+import pytest
+
+from database import Database
+from recurrence import (
+    Rule, is_occurrence, occurrence_id, rule_dates, split_occurrence_id, weekday_mask,
+)
+
+MON = date(2025, 6, 2)
+
+
+def _days(rule: Rule, first: date, last: date):
+    return [d.isoformat() for d in rule_dates(rule, first, last)]
+
+
+def test_rule_dates():
+    every_other_week = Rule(1, "Gym", None, "weekly", 2, weekday_mask(["mon", "thu"]),
+                            MON, date(2025, 6, 30))
+    assert _days(every_other_week, date(2025, 5, 1), date(2025, 7, 31)) == [
+        "2025-06-02", "2025-06-05", "2025-06-16", "2025-06-19", "2025-06-30",
+    ]
+    # Only the requested range is expanded.
+    assert _days(every_other_week, date(2025, 6, 6), date(2025, 6, 18)) == ["2025-06-16"]
+
+    month_end = Rule(2, "Rent", None, "monthly", 1, 0, date(2025, 1, 31), None)
+    assert _days(month_end, date(2025, 1, 1), date(2025, 4, 30)) == [
+        "2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30",
+    ]
+    every_3_days = Rule(3, "Water", None, "daily", 3, 0, MON, None)
+    assert _days(every_3_days, date(2025, 6, 7), date(2025, 6, 14)) == [
+        "2025-06-08", "2025-06-11", "2025-06-14",
+    ]
+
+    task_id = occurrence_id(7, MON)
+    assert is_occurrence(task_id) and split_occurrence_id(task_id) == (7, MON)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "tasks.db"))
+    yield db
+    db.close()
+
+
+def _week(db: Database, first: date, last: date):
+    return [(t.task_day, t.title, t.status, is_occurrence(t.id))
+            for t in db.get_tasks_between(first, last)]
+
+
+def test_weekly_rule_with_exceptions(db):
+    rule = db.add_recurrence("Stand-up", "", "weekly", MON,
+                             weekdays=weekday_mask(["mon", "wed", "fri"]))
+    db.add_task("Review", "", date(2025, 6, 4))
+    week = (MON, date(2025, 6, 8))
+
+    assert _week(db, *week) == [
+        ("2025-06-02", "Stand-up", "Not done", True),
+        ("2025-06-04", "Stand-up", "Not done", True),
+        ("2025-06-04", "Review", "Not done", False),
+        ("2025-06-06", "Stand-up", "Not done", True),
+    ]
+    assert db.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1
+
+    # Deleting Wednesday's occurrence leaves an exception, not a row.
+    db.delete_task(occurrence_id(rule, date(2025, 6, 4)))
+    # Marking Friday's done stores it as a real task, listed once.
+    db.set_task_status(occurrence_id(rule, date(2025, 6, 6)), "Done")
+
+    assert _week(db, *week) == [
+        ("2025-06-02", "Stand-up", "Not done", True),
+        ("2025-06-04", "Review", "Not done", False),
+        ("2025-06-06", "Stand-up", "Done", False),
+    ]
+    assert [t.task_day for t in db.get_completed_tasks()] == ["2025-06-06"]
+    # A second write to the same occurrence id reaches the stored row.
+    stored = db.materialize_occurrence(occurrence_id(rule, date(2025, 6, 6)))
+    assert db.get_task(stored).status == "Done"
+    assert db.materialize_occurrence(occurrence_id(rule, date(2025, 6, 4))) is None
+
+    # Timing an occurrence stores it too; the next week is untouched.
+    monday = occurrence_id(rule, date(2025, 6, 9))
+    assert db.start_timer(monday, datetime(2025, 6, 9, 9, 0))
+    assert db.stop_timer(db.materialize_occurrence(monday), datetime(2025, 6, 9, 9, 30)) == 1800
+    assert _week(db, date(2025, 6, 9), date(2025, 6, 13)) == [
+        ("2025-06-09", "Stand-up", "Not done", False),
+        ("2025-06-11", "Stand-up", "Not done", True),
+        ("2025-06-13", "Stand-up", "Not done", True),
+    ]
+
+    # Ending the rule keeps what it stored and drops later occurrences.
+    db.end_recurrence(rule, date(2025, 6, 10))
+    assert _week(db, date(2025, 6, 9), date(2025, 6, 13)) == [
+        ("2025-06-09", "Stand-up", "Not done", False),
+    ]
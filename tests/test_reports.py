@@ -0,0 +1,52 @@
+"""reports.build_report against the same figures counted task by task."""
+import bisect
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.datagen import TODAY, records
+from database import Database
+from reports import AGING_EDGES, PERCENTILES, build_report
+from task_io import import_tasks
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    db = Database(str(tmp_path_factory.mktemp("reports") / "tasks.db"), cache_size=0)
+    import_tasks(db, records(3000, seed=7, years=1))
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("days", [1, 30, 365])
+def test_report_matches_per_task_counts(db, days):
+    end = TODAY
+    start = end - timedelta(days=days - 1)
+    rows = db.conn.execute(
+        "SELECT task_date, status, total_seconds FROM tasks WHERE task_date BETWEEN ? AND ?",
+        (start.isoformat(), end.isoformat()),
+    ).fetchall()
+
+    report = build_report(db, start, end, TODAY, backend="array")
+
+    assert report.tasks == len(rows)
+    assert report.done == sum(status == "Done" for _, status, _ in rows)
+    months = {}
+    for day, status, _ in rows:
+        n, done = months.get(day[:7], (0, 0))
+        months[day[:7]] = (n + 1, done + (status == "Done"))
+    assert {r.label: (r.tasks, r.done) for r in report.periods["month"] if r.tasks} == months
+
+    aging = [0] * (len(AGING_EDGES) + 1)
+    for day, status, _ in rows:
+        late = (TODAY - date.fromisoformat(day)).days
+        if status != "Done" and late > 0:
+            aging[bisect.bisect_left(AGING_EDGES, late)] += 1
+    assert [n for _, n in report.overdue] == aging
+
+    tracked = sorted(secs for _, _, secs in rows if secs)
+    assert report.tracked_tasks == len(tracked)
+    assert report.time_percentiles == {
+        f"p{q}": tracked[max(0, -(-q * len(tracked) // 100) - 1)]
+        for q in PERCENTILES if tracked
+    }
@@ -0,0 +1,86 @@
+"""server.py handlers, called without a socket."""
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+from server import ApiServer, HttpError, Request, main
+
+DAY = date(2030, 1, 7)  # ahead of any real today, so it is on the To-do list
+
+
+def _call(api: ApiServer, method: str, target: str, body=None):
+    """(status, JSON body) of one request; streamed lists are collected."""
+    data = json.dumps(body).encode() if body is not None else b""
+
+    async def run():
+        try:
+            result = await api._dispatch(Request(method, target, data))
+        except HttpError as exc:
+            return exc.status, {"error": str(exc)}
+        if isinstance(result, tuple):
+            return result
+        return 200, [item async for items in result for item in items]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def api(tmp_path):
+    api = ApiServer(str(tmp_path / "tasks.db"), readers=0)
+    asyncio.run(api.writer.run(lambda db: None))
+    yield api
+    asyncio.run(api.close())
+
+
+def _add(api: ApiServer, title: str, desc: str = "") -> int:
+    status, task = _call(api, "POST", "/tasks", {"title": title, "description": desc, "date": DAY.isoformat()})
+    assert status == 201
+    return task["id"]
+
+
+def test_lists_and_search_leave_out_description(api):
+    task_id = _add(api, "Quarterly report", "numbers from finance")
+
+    status, task = _call(api, "GET", f"/tasks/{task_id}")
+    assert status == 200 and task["description"] == "numbers from finance"
+
+    status, tasks = _call(api, "GET", f"/tasks?date={DAY.isoformat()}")
+    assert [t["description"] for t in tasks] == ["numbers from finance"]
+
+    for target in ("/lists/todo?today=2030-01-01", "/search?q=quarterly"):
+        status, tasks = _call(api, "GET", target)
+        assert status == 200
+        assert [t["id"] for t in tasks] == [task_id]
+        assert "description" not in tasks[0]
+
+
+def test_move_validates_prev_and_next(api):
+    a, b, c = (_add(api, title) for title in ("a", "b", "c"))
+
+    for bad in ("x", 1.5, True, [a]):
+        status, body = _call(api, "POST", f"/tasks/{c}/move", {"prev": bad})
+        assert status == 400, bad
+        assert "prev" in body["error"]
+
+    for prev_id, next_id in ((b, a), (a, a), (c, None), (None, c)):
+        status, body = _call(api, "POST", f"/tasks/{c}/move", {"prev": prev_id, "next": next_id})
+        assert status == 400, (prev_id, next_id)
+        assert "error" in body
+    _, tasks = _call(api, "GET", f"/tasks?date={DAY.isoformat()}")
+    assert [t["id"] for t in tasks] == [a, b, c]
+
+    # Ids given as strings are accepted and passed on as ints.
+    status, _ = _call(api, "POST", f"/tasks/{c}/move", {"prev": str(a), "next": str(b)})
+    assert status == 200
+    _, tasks = _call(api, "GET", f"/tasks?date={DAY.isoformat()}")
+    assert [t["id"] for t in tasks] == [a, c, b]
+
+
+def test_unknown_profile_is_a_usage_error(monkeypatch, capsys):
+    monkeypatch.setenv("PLANNER_DB_PROFILE", "bogus")
+    with pytest.raises(SystemExit) as exc:
+        main(["--port", "0"])
+    assert exc.value.code == 2
+    assert "unknown profile 'bogus'" in capsys.readouterr().err
@@ -0,0 +1,110 @@
+"""Database's TaskCache: after any write, cached reads equal fresh queries."""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database import Database, page_cursor
+
+TODAY = date(2025, 6, 1)
+DAYS = [TODAY + timedelta(days=d) for d in range(-3, 4)]
+
+
+def _rows(tasks):
+    return [
+        (t.id, t.title, t.task_date, t.status, t.total_seconds,
+         t.active_timer_start, t.sort_order)
+        for t in tasks
+    ]
+
+
+def _reads(db: Database):
+    """Every cached read, keyed by name."""
+    out = {f"day {d}": db.get_tasks_by_date(d) for d in DAYS}
+    out["todo"] = db.get_upcoming_todos(TODAY)
+    out["overdue"] = db.get_overdue_tasks(TODAY)
+    out["done"] = db.get_completed_tasks()
+    for name, page in (
+        ("todo", lambda **kw: db.get_upcoming_todos_page(TODAY, **kw)),
+        ("overdue", lambda **kw: db.get_overdue_tasks_page(TODAY, **kw)),
+        ("done", lambda **kw: db.get_completed_tasks_page(**kw)),
+    ):
+        first = page(limit=3)
+        out[f"{name} page 1"] = first
+        if first:
+            out[f"{name} page 2"] = page(after=page_cursor(first[-1]), limit=3)
+    return {k: _rows(v) for k, v in out.items()}
+
+
+@pytest.fixture
+def dbs(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    cached = Database(path, cache_size=128)
+    fresh = Database(path, cache_size=0)
+    yield cached, fresh
+    cached.close()
+    fresh.close()
+
+
+def _ids(db: Database):
+    return [row[0] for row in db.conn.execute("SELECT id FROM tasks ORDER BY id")]
+
+
+def _random_write(db: Database, rnd: random.Random, now: datetime):
+    ids = _ids(db)
+    op = rnd.choice(
+        ["add", "add", "status", "edit", "delete", "move", "reorder", "timer"]
+        if ids else ["add"]
+    )
+    task_id = rnd.choice(ids) if ids else None
+    if op == "add":
+        db.add_task(f"task {rnd.random():.4f}", "", rnd.choice(DAYS))
+    elif op == "status":
+        db.set_task_status(task_id, rnd.choice(["Done", "Not done"]))
+    elif op == "edit":
+        db.update_task_title_desc(task_id, f"edited {rnd.random():.4f}", "d")
+    elif op == "delete":
+        db.delete_task(task_id)
+    elif op == "move":
+        day = db.get_task(task_id).task_date
+        others = [t.id for t in db.get_tasks_by_date(day) if t.id != task_id]
+        slot = rnd.randint(0, len(others))
+        prev_id = others[slot - 1] if slot else None
+        next_id = others[slot] if slot < len(others) else None
+        if db.move_task(task_id, prev_id, next_id):
+            db.rebalance_day(day)
+    elif op == "reorder":
+        day = rnd.choice(DAYS)
+        order = [t.id for t in db.get_tasks_by_date(day)]
+        rnd.shuffle(order)
+        db.reorder_tasks(day, order)
+    else:
+        if not db.start_timer(task_id, now):
+            db.stop_timer(task_id, now)
+
+
+def test_cached_reads_match_fresh_queries(dbs):
+    cached, fresh = dbs
+    rnd = random.Random(4)
+    now = datetime.combine(TODAY, datetime.min.time())
+    for step in range(400):
+        now += timedelta(minutes=rnd.randint(1, 90))
+        _random_write(cached, rnd, now)
+        if step % 5 == 0:
+            assert _reads(cached) == _reads(fresh), f"step {step}"
+    assert cached.cache.hits > 0
+
+
+def test_write_drops_only_entries_holding_the_task(dbs):
+    cached, _ = dbs
+    a = cached.add_task("a", "", DAYS[0])
+    cached.add_task("b", "", DAYS[1])
+    cached.get_tasks_by_date(DAYS[0])
+    cached.get_tasks_by_date(DAYS[1])
+
+    cached.update_task_title_desc(a, "a2", "")
+    hits = cached.cache.hits
+    assert [t.title for t in cached.get_tasks_by_date(DAYS[1])] == ["b"]
+    assert cached.cache.hits == hits + 1  # day 1 was kept
+    assert [t.title for t in cached.get_tasks_by_date(DAYS[0])] == ["a2"]
+    assert cached.cache.hits == hits + 1  # day 0 was read again
@@ -0,0 +1,98 @@
+"""Timer sessions and the daily_time rollup its triggers maintain."""
+from datetime import date, datetime
+
+import pytest
+
+from database import Database
+
+DAY = date(2025, 3, 30)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "tasks.db"), cache_size=0)
+    yield db
+    db.close()
+
+
+def _daily(db: Database):
+    return [tuple(r) for r in db.conn.execute(
+        "SELECT day, task_id, seconds FROM daily_time ORDER BY day, task_id"
+    )]
+
+
+def test_session_across_midnight_is_split_per_day(db):
+    task = db.add_task("Deploy", "", DAY)
+    assert db.start_timer(task, datetime(2025, 3, 30, 22, 30))
+    assert not db.start_timer(task, datetime(2025, 3, 30, 23, 0))  # already running
+    assert db.get_task(task).active_timer_start == "2025-03-30T22:30:00"
+
+    # 22:30 on the 30th to 01:15 on the 1st: two midnights in between.
+    added = db.stop_timer(task, datetime(2025, 4, 1, 1, 15, 40, 999))
+    assert added == 26 * 3600 + 45 * 60 + 40
+
+    assert db.get_sessions(task) == [
+        ("2025-03-30T22:30:00", "2025-03-31T00:00:00"),
+        ("2025-03-31T00:00:00", "2025-04-01T00:00:00"),
+        ("2025-04-01T00:00:00", "2025-04-01T01:15:40"),
+    ]
+    assert _daily(db) == [
+        ("2025-03-30", task, 5400),
+        ("2025-03-31", task, 86400),
+        ("2025-04-01", task, 4540),
+    ]
+    t = db.get_task(task)
+    assert t.total_seconds == added and t.active_timer_start is None
+    assert db.time_total(date(2025, 3, 31), date(2025, 4, 1)) == 86400 + 4540
+    assert db.time_by_day(DAY, DAY) == [(DAY, 5400)]
+    assert db.stop_timer(task, datetime(2025, 4, 1, 2, 0)) == 0  # not running
+
+
+def test_rollup_follows_session_edits_and_deletes(db):
+    a = db.add_task("a", "", DAY)
+    b = db.add_task("b", "", DAY)
+    for task, start, stop in ((a, 9, 10), (b, 9, 11), (a, 14, 15)):
+        db.start_timer(task, datetime(2025, 3, 30, start))
+        db.stop_timer(task, datetime(2025, 3, 30, stop))
+    assert _daily(db) == [("2025-03-30", a, 7200), ("2025-03-30", b, 7200)]
+    assert db.time_by_task(DAY, DAY) == [(a, "a", 7200), (b, "b", 7200)]
+
+    # Moving a session to another day moves its seconds in the rollup.
+    db.conn.execute(
+        "UPDATE time_sessions SET started_at='2025-03-29T14:00:00', "
+        "ended_at='2025-03-29T14:30:00' WHERE task_id=? AND started_at LIKE '%T14:%'",
+        (a,),
+    )
+    db.conn.commit()
+    assert _daily(db) == [
+        ("2025-03-29", a, 1800),
+        ("2025-03-30", a, 3600),
+        ("2025-03-30", b, 7200),
+    ]
+    assert db.get_task(a).total_seconds == 5400
+
+    # Deleting a task takes its sessions and rollup rows with it.
+    db.delete_task(b)
+    assert db.get_sessions(b) == []
+    assert _daily(db) == [("2025-03-29", a, 1800), ("2025-03-30", a, 3600)]
+
+
+def test_older_timer_api_goes_through_sessions(db):
+    task = db.add_task("Legacy", "", DAY)
+    # The old stop: add the elapsed time, then clear the start.
+    db.set_task_timer_start(task, "2025-03-30T09:00:00")
+    db.update_task_total_seconds(task, 25 * 3600)
+    db.set_task_timer_start(task, None)
+
+    assert db.get_sessions(task) == [
+        ("2025-03-30T00:00:00", "2025-03-31T00:00:00"),
+        ("2025-03-31T00:00:00", "2025-03-31T01:00:00"),
+    ]
+    assert _daily(db) == [("2025-03-30", task, 86400), ("2025-03-31", task, 3600)]
+    t = db.get_task(task)
+    assert t.total_seconds == 25 * 3600 and t.active_timer_start is None
+
+    db.update_task_total_seconds(task, 25 * 3600)  # unchanged: nothing added
+    with pytest.raises(ValueError):
+        db.update_task_total_seconds(task, 60)
+    assert db.get_task(task).total_seconds == 25 * 3600